@@ -15,10 +15,12 @@ from config.settings import Config
 
 # Import database initialization
 from models.database import init_db
+from migrations import upgrade_app, register_migration_commands
 
 # Import route registrations
 from routes.auth_routes import register_auth_routes
 from routes.error_handlers import register_error_handlers
+from routes.event_routes import register_event_routes
 from portals import (
     register_farmer_routes,
     register_buyer_routes,
@@ -29,7 +31,17 @@ from portals import (
 
 # Import utilities
 from utils.auth import create_admin_user
+from utils.passwords import password_hasher
+from utils.rate_limit import rate_limiter
+from utils.revocation import revocation_list
 from services.ml_models import load_models
+from services.history_writer import history_writer
+from services.recommendation_history import register_history_commands
+from services.platform_counters import sync_counters, register_counter_commands
+from services.analytics_rollups import analytics_refresher, register_analytics_commands
+from services.inventory_holds import hold_sweeper, register_hold_commands
+from services.order_events import order_events
+from services.labor_matching import register_labor_matching_commands
 
 
 def create_app():
@@ -54,7 +66,15 @@ def create_app():
     os.makedirs(os.path.join(os.path.dirname(__file__), 'saved_models'), exist_ok=True)
 
     # Initialize database
+    password_hasher.init_app(app)
     init_db(app)
+    upgrade_app(app)
+    history_writer.init_app(app)
+    hold_sweeper.init_app(app)
+    analytics_refresher.init_app(app)
+    order_events.init_app(app)
+    rate_limiter.init_app(app)
+    revocation_list.init_app(app)
 
     # Perform one-time initialization that must also run under gunicorn
     from models.database import db
@@ -69,6 +89,9 @@ def create_app():
         except Exception as e:
             print(f"Admin creation note: {e}")
 
+        # Seed/reconcile admin dashboard counters
+        sync_counters()
+
         # Load ML models
         load_models()
 
@@ -79,7 +102,14 @@ def create_app():
     register_vendor_routes(app)
     register_labor_routes(app)
     register_admin_routes(app)
+    register_event_routes(app)
     register_error_handlers(app)
+    register_migration_commands(app)
+    register_history_commands(app)
+    register_counter_commands(app)
+    register_analytics_commands(app)
+    register_hold_commands(app)
+    register_labor_matching_commands(app)
 
     return app
 
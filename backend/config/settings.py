@@ -10,12 +10,89 @@ class Config:
     basedir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', f'sqlite:///{os.path.join(basedir, "smart_farming.db")}')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = 'uploads'
     
+    # Connection pool (non-SQLite databases, including the read replica)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 20))
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', 1800))  # seconds
+    REPLICA_RETRY_SECONDS = int(os.environ.get('REPLICA_RETRY_SECONDS', 30))
+    
+    # SQLite production tuning (WAL + per-connection pragmas)
+    SQLITE_TUNING = os.environ.get('SQLITE_TUNING', 'true').lower() == 'true'
+    SQLITE_POOL_SIZE = int(os.environ.get('SQLITE_POOL_SIZE', 10))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -20000))  # negative = KiB
+
+    # Schema migrations (backend/migrations); gunicorn applies them once in the master
+    MIGRATE_ON_START = os.environ.get('MIGRATE_ON_START', 'true').lower() == 'true'
+    MIGRATION_LOCK_FILE = os.environ.get('MIGRATION_LOCK_FILE')  # default: next to the SQLite file
+    
     # Weather API Configuration
     WEATHER_API_KEY = os.environ.get('WEATHER_API_KEY', 'your-api-key')
     WEATHER_API_URL = 'https://api.openweathermap.org/data/2.5/weather'
-    
+    WEATHER_CACHE_TTL = int(os.environ.get('WEATHER_CACHE_TTL', 600))  # seconds
+    WEATHER_CACHE_SIZE = int(os.environ.get('WEATHER_CACHE_SIZE', 1024))  # locations
+    DEFAULT_RAINFALL_MM = float(os.environ.get('DEFAULT_RAINFALL_MM', 100.0))  # seasonal, for crop recommendations
+
+    # Recommendation history write-behind buffer
+    HISTORY_FLUSH_INTERVAL = float(os.environ.get('HISTORY_FLUSH_INTERVAL', 2.0))  # seconds
+    HISTORY_BATCH_SIZE = int(os.environ.get('HISTORY_BATCH_SIZE', 100))
+    HISTORY_QUEUE_MAX = int(os.environ.get('HISTORY_QUEUE_MAX', 1000))
+    HISTORY_RETENTION_DAYS = int(os.environ.get('HISTORY_RETENTION_DAYS', 90))
+
+    # Admin analytics rollups
+    ANALYTICS_REFRESH_SECONDS = int(os.environ.get('ANALYTICS_REFRESH_SECONDS', 300))
+    ANALYTICS_SETTLE_SECONDS = int(os.environ.get('ANALYTICS_SETTLE_SECONDS', 60))  # wait for late commits
+
+    # Bulk CSV/NDJSON imports
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 1000))
+    IMPORT_MAX_ERRORS = int(os.environ.get('IMPORT_MAX_ERRORS', 100))
+
+    # Checkout inventory holds
+    HOLD_TTL_SECONDS = int(os.environ.get('HOLD_TTL_SECONDS', 600))
+    HOLD_SWEEP_INTERVAL = int(os.environ.get('HOLD_SWEEP_INTERVAL', 60))  # seconds
+
+    # Order status event stream (SSE)
+    # memory or database; memory only reaches clients of the publishing worker
+    ORDER_EVENTS_BACKEND = os.environ.get(
+        'ORDER_EVENTS_BACKEND',
+        'database' if int(os.environ.get('WEB_CONCURRENCY', 1)) > 1 else 'memory'
+    )
+    # Off on sync gunicorn workers, where an open stream would hold the worker's only thread
+    ORDER_EVENTS_STREAMING = os.environ.get('ORDER_EVENTS_STREAMING', 'true').lower() == 'true'
+    ORDER_EVENTS_TOKEN_SECONDS = int(os.environ.get('ORDER_EVENTS_TOKEN_SECONDS', 300))  # stream token lifetime
+    ORDER_EVENTS_POLL_INTERVAL = float(os.environ.get('ORDER_EVENTS_POLL_INTERVAL', 1.0))  # seconds
+    ORDER_EVENTS_STREAM_SECONDS = int(os.environ.get('ORDER_EVENTS_STREAM_SECONDS', 30))
+    ORDER_EVENTS_RETENTION_HOURS = int(os.environ.get('ORDER_EVENTS_RETENTION_HOURS', 24))
+
+    # Password hashing (werkzeug method string, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000')
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt')
+    PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 32))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 30))  # seconds
+
+    # Rate limiting (token buckets per route class, "N/second|minute|hour|day")
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')  # memory or database
+    RATE_LIMIT_TRUST_PROXY = os.environ.get('RATE_LIMIT_TRUST_PROXY', 'false').lower() == 'true'
+    RATE_LIMIT_MAX_KEYS = int(os.environ.get('RATE_LIMIT_MAX_KEYS', 100000))
+    RATE_LIMITS = {
+        'login': os.environ.get('RATE_LIMIT_LOGIN', '10/minute'),
+        'search': os.environ.get('RATE_LIMIT_SEARCH', '60/minute'),
+        'recommendation': os.environ.get('RATE_LIMIT_RECOMMENDATION', '20/minute'),
+    }
+
+    # Token revocation (logout)
+    REVOCATION_REFRESH_SECONDS = float(os.environ.get('REVOCATION_REFRESH_SECONDS', 5))
+    REVOCATION_BLOOM_CAPACITY = int(os.environ.get('REVOCATION_BLOOM_CAPACITY', 10000))
+    REVOCATION_BLOOM_ERROR_RATE = float(os.environ.get('REVOCATION_BLOOM_ERROR_RATE', 0.001))
+    REVOCATION_RESCAN_ROWS = int(os.environ.get('REVOCATION_RESCAN_ROWS', 1000))  # ids re-read for late commits
+
     # Allowed file extensions
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'bmp', 'webp'}
@@ -6,5 +6,36 @@ bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
 
 # Keep defaults conservative; allow override via env.
 workers = int(os.getenv('WEB_CONCURRENCY', '1'))
-threads = int(os.getenv('GUNICORN_THREADS', '1'))
+# Threaded workers: an open order event stream (SSE) holds one thread, not
+# the whole worker.
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
 timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+
+
+def on_starting(server):
+    """Apply schema migrations once in the master before any worker boots.
+
+    Workers (forked from the master, so sharing its Config) then only
+    check the schema version and run no DDL. The order event settings are
+    fitted to the worker model here as well.
+    """
+    import sys
+
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    if backend_dir not in sys.path:
+        sys.path.insert(0, backend_dir)
+
+    from config.settings import Config
+    from migrations import upgrade_url
+
+    if Config.MIGRATE_ON_START:
+        upgrade_url(Config.SQLALCHEMY_DATABASE_URI, Config.MIGRATION_LOCK_FILE)
+        Config.MIGRATE_ON_START = False
+
+    # In-memory events only reach clients of the worker that published them.
+    if server.cfg.workers > 1 and 'ORDER_EVENTS_BACKEND' not in os.environ:
+        Config.ORDER_EVENTS_BACKEND = 'database'
+    # A single-threaded sync worker would be blocked by one open stream.
+    if server.cfg.worker_class_str not in ('gevent', 'eventlet') and server.cfg.threads <= 1:
+        Config.ORDER_EVENTS_STREAMING = False
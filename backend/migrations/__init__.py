@@ -0,0 +1,281 @@
+"""
+Versioned schema migrations
+
+Migrations live in ``migrations/versions`` as ``NNNN_name.py`` modules with
+an ``upgrade(op)`` function. They are applied in order, each exactly once,
+and recorded in the ``schema_version`` table. Applying takes an exclusive
+lock first (a PostgreSQL advisory lock, or a lock file next to a SQLite
+database), so when several processes start together one migrates and the
+others wait, then find nothing left to do. On a current database the check
+is a single SELECT and no DDL runs.
+
+Migrations run in one transaction unless the module sets
+``transactional = False``; those run in autocommit mode, where
+``op.create_index`` builds PostgreSQL indexes ``CONCURRENTLY`` without
+blocking writes. SQLite commits DDL as it goes, so every migration must be
+safe to re-run: the ``op`` helpers skip tables, columns and indexes that
+already exist.
+
+Migrations never import the application's models or services: each one
+declares the tables it creates as they were at that version, so replaying
+the history on an empty database gives the same schema as upgrading an old
+one.
+"""
+
+import importlib
+import os
+import pkgutil
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    func,
+    inspect,
+    select,
+    text,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# Arbitrary application-wide key for pg_advisory_lock
+ADVISORY_LOCK_KEY = 7310641
+
+schema_version = Table(
+    'schema_version', MetaData(),
+    Column('version', Integer, primary_key=True),
+    Column('name', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+Migration = namedtuple('Migration', 'version name module')
+
+
+class Operations:
+    """Schema helpers handed to each migration's ``upgrade(op)``"""
+
+    def __init__(self, connection, online=False):
+        self.connection = connection
+        self.online = online
+        self.dialect = connection.dialect.name
+
+    def execute(self, sql, params=None):
+        return self.connection.execute(text(sql), params or {})
+
+    def has_table(self, table):
+        return inspect(self.connection).has_table(table)
+
+    def columns(self, table):
+        return {column['name'] for column in inspect(self.connection).get_columns(table)}
+
+    def indexes(self, table):
+        return {index['name'] for index in inspect(self.connection).get_indexes(table)}
+
+    def create_tables(self, *tables):
+        """Create the given tables (with their indexes) that do not exist yet."""
+        tables[0].metadata.create_all(self.connection, tables=list(tables), checkfirst=True)
+
+    def add_column(self, table, name, ddl):
+        """Add column ``name`` (``ddl`` is its type and constraints) if missing."""
+        if name in self.columns(table):
+            return False
+        self.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+        return True
+
+    def create_index(self, name, table, columns, unique=False, where=None):
+        """Create an index if missing, concurrently on PostgreSQL outside a transaction."""
+        if name in self.indexes(table):
+            return False
+        concurrently = 'CONCURRENTLY ' if self.online and self.dialect == 'postgresql' else ''
+        sql = (
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {concurrently}IF NOT EXISTS "
+            f"{name} ON {table} ({', '.join(columns)})"
+        )
+        if where:
+            sql += f" WHERE {where}"
+        self.execute(sql)
+        return True
+
+
+    def drop_index(self, name, table):
+        """Drop an index if it exists."""
+        if name not in self.indexes(table):
+            return False
+        self.execute(f"DROP INDEX {name}")
+        return True
+
+
+def referenced_tables(metadata, *names):
+    """Declare existing tables by primary key only, as foreign key targets."""
+    for name in names:
+        Table(name, metadata, Column('id', Integer, primary_key=True))
+
+
+def discover():
+    """All migrations in ``migrations/versions``, ordered by version."""
+    from migrations import versions
+
+    migrations = []
+    for info in pkgutil.iter_modules(versions.__path__):
+        prefix, _, name = info.name.partition('_')
+        if not prefix.isdigit():
+            continue
+        module = importlib.import_module(f'{versions.__name__}.{info.name}')
+        migrations.append(Migration(int(prefix), name, module))
+    migrations.sort(key=lambda migration: migration.version)
+
+    versions_seen = [migration.version for migration in migrations]
+    if len(set(versions_seen)) != len(versions_seen):
+        raise RuntimeError('Duplicate migration version numbers in migrations/versions')
+    return migrations
+
+
+def current_version(connection):
+    """Highest applied version, 0 for a database without ``schema_version``."""
+    if not inspect(connection).has_table(schema_version.name):
+        return 0
+    return connection.execute(select(func.max(schema_version.c.version))).scalar() or 0
+
+
+def pending(engine, migrations=None):
+    """Migrations not yet applied to ``engine``'s database."""
+    migrations = discover() if migrations is None else migrations
+    with engine.connect() as connection:
+        version = current_version(connection)
+    return [migration for migration in migrations if migration.version > version]
+
+
+def _lock_path(engine, lock_path=None):
+    if lock_path:
+        return lock_path
+    database = engine.url.database
+    if engine.dialect.name == 'sqlite' and database and database != ':memory:':
+        return f'{database}.migrate.lock'
+    return os.path.join(tempfile.gettempdir(), 'smart_farming_migrate.lock')
+
+
+@contextmanager
+def migration_lock(engine, lock_path=None):
+    """Hold the exclusive migration lock for the database behind ``engine``."""
+    if engine.dialect.name == 'postgresql':
+        with engine.connect() as connection:
+            connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': ADVISORY_LOCK_KEY})
+            try:
+                yield
+            finally:
+                connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': ADVISORY_LOCK_KEY})
+        return
+
+    with open(_lock_path(engine, lock_path), 'a+') as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK gives up after ~10 seconds; keep waiting
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _record(connection, migration):
+    connection.execute(schema_version.insert().values(
+        version=migration.version,
+        name=migration.name,
+        applied_at=datetime.utcnow(),
+    ))
+
+
+def _apply(engine, migration):
+    if getattr(migration.module, 'transactional', True):
+        with engine.begin() as connection:
+            migration.module.upgrade(Operations(connection))
+            _record(connection, migration)
+    else:
+        with engine.connect() as connection:
+            connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+            migration.module.upgrade(Operations(connection, online=True))
+            _record(connection, migration)
+
+
+def upgrade(engine, lock_path=None):
+    """Apply pending migrations under the migration lock; return those applied."""
+    migrations = discover()
+    if not pending(engine, migrations):
+        return []
+
+    with migration_lock(engine, lock_path):
+        with engine.begin() as connection:
+            schema_version.create(connection, checkfirst=True)
+        # Another process may have migrated while we waited for the lock.
+        todo = pending(engine, migrations)
+        for migration in todo:
+            _apply(engine, migration)
+            print(f"✓ Applied migration {migration.version:04d} {migration.name}")
+    return todo
+
+
+def upgrade_url(url, lock_path=None):
+    """Apply pending migrations to the database at ``url`` (no Flask app needed)."""
+    engine = create_engine(url)
+    try:
+        return upgrade(engine, lock_path)
+    finally:
+        engine.dispose()
+
+
+def upgrade_app(app):
+    """Bring the app's database up to date at startup, or report how far behind it is."""
+    from models.database import db
+
+    with app.app_context():
+        engine = db.engine
+        if app.config.get('MIGRATE_ON_START', True):
+            upgrade(engine, app.config.get('MIGRATION_LOCK_FILE'))
+        else:
+            behind = pending(engine)
+            if behind:
+                print(f"⚠ Database schema is {len(behind)} migration(s) behind; run `flask db-upgrade`")
+                return
+        print("✓ Database schema is up to date")
+
+
+def register_migration_commands(app):
+    """Register the ``db-upgrade`` and ``db-version`` CLI commands on ``app``."""
+    from models.database import db
+
+    @app.cli.command('db-upgrade')
+    def db_upgrade_command():
+        """Apply pending schema migrations."""
+        applied = upgrade(db.engine, app.config.get('MIGRATION_LOCK_FILE'))
+        print(f"✓ Applied {len(applied)} migration(s)")
+
+    @app.cli.command('db-version')
+    def db_version_command():
+        """Show the applied schema version and pending migrations."""
+        with db.engine.connect() as connection:
+            print(f"Schema version: {current_version(connection)}")
+        for migration in pending(db.engine):
+            print(f"  pending {migration.version:04d} {migration.name}")
@@ -0,0 +1,222 @@
+"""Initial schema
+
+The original tables, as the first release created them.
+"""
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Date,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+)
+
+
+metadata = MetaData()
+
+users = Table(
+    'users', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('email', String(120), nullable=False, unique=True, index=True),
+    Column('password_hash', String(255), nullable=False),
+    Column('full_name', String(100), nullable=False),
+    Column('phone', String(20)),
+    Column('address', Text),
+    Column('role', Enum('FARMER', 'BUYER', 'VENDOR', 'LABOR', 'ADMIN', name='userrole'), nullable=False),
+    Column('is_verified', Boolean),
+    Column('is_active', Boolean),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+)
+
+farmer_profiles = Table(
+    'farmer_profiles', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id'), nullable=False, unique=True),
+    Column('farm_name', String(200)),
+    Column('farm_size', Float),
+    Column('farm_location', String(255)),
+    Column('latitude', Float),
+    Column('longitude', Float),
+    Column('soil_type', String(50)),
+    Column('irrigation_type', String(50)),
+)
+
+vendor_profiles = Table(
+    'vendor_profiles', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id'), nullable=False, unique=True),
+    Column('business_name', String(200), nullable=False),
+    Column('business_license', String(100)),
+    Column('rating', Float),
+    Column('total_sales', Integer),
+)
+
+labor_profiles = Table(
+    'labor_profiles', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('user_id', Integer, ForeignKey('users.id'), nullable=False, unique=True),
+    Column('skills', Text),
+    Column('experience_years', Integer),
+    Column('daily_wage', Float),
+    Column('availability', Boolean),
+    Column('rating', Float),
+)
+
+crop_listings = Table(
+    'crop_listings', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('farmer_id', Integer, ForeignKey('farmer_profiles.id'), nullable=False),
+    Column('crop_name', String(100), nullable=False),
+    Column('category', String(50)),
+    Column('quantity', Float, nullable=False),
+    Column('unit', String(20)),
+    Column('price_per_unit', Float, nullable=False),
+    Column('location', String(255)),
+    Column('description', Text),
+    Column('image_url', String(500)),
+    Column('harvest_date', Date),
+    Column('is_available', Boolean),
+    Column('created_at', DateTime),
+)
+
+vendor_products = Table(
+    'vendor_products', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('vendor_id', Integer, ForeignKey('vendor_profiles.id'), nullable=False),
+    Column('product_name', String(200), nullable=False),
+    Column('category', String(50)),
+    Column('brand', String(100)),
+    Column('quantity_available', Float, nullable=False),
+    Column('unit', String(20)),
+    Column('price_per_unit', Float, nullable=False),
+    Column('description', Text),
+    Column('image_url', String(500)),
+    Column('specifications', Text),
+    Column('is_available', Boolean),
+    Column('created_at', DateTime),
+)
+
+orders = Table(
+    'orders', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('buyer_id', Integer, ForeignKey('users.id'), nullable=False),
+    Column('order_type', String(20)),
+    Column('crop_listing_id', Integer, ForeignKey('crop_listings.id')),
+    Column('vendor_product_id', Integer, ForeignKey('vendor_products.id')),
+    Column('quantity', Float, nullable=False),
+    Column('unit_price', Float, nullable=False),
+    Column('total_price', Float, nullable=False),
+    Column('status', Enum('PENDING', 'CONFIRMED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED',
+                          name='orderstatus')),
+    Column('is_contract_farming', Boolean),
+    Column('delivery_date', Date),
+    Column('delivery_address', Text),
+    Column('notes', Text),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+)
+
+payments = Table(
+    'payments', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('order_id', Integer, ForeignKey('orders.id'), nullable=False),
+    Column('amount', Float, nullable=False),
+    Column('payment_method', String(50)),
+    Column('payment_status', String(20)),
+    Column('transaction_id', String(100)),
+    Column('payment_date', DateTime),
+    Column('created_at', DateTime),
+)
+
+cost_records = Table(
+    'cost_records', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('farmer_id', Integer, ForeignKey('farmer_profiles.id'), nullable=False),
+    Column('crop_name', String(100), nullable=False),
+    Column('season', String(50)),
+    Column('year', Integer, nullable=False),
+    Column('seed_cost', Float),
+    Column('fertilizer_cost', Float),
+    Column('pesticide_cost', Float),
+    Column('labor_cost', Float),
+    Column('equipment_cost', Float),
+    Column('irrigation_cost', Float),
+    Column('other_cost', Float),
+    Column('total_cost', Float),
+    Column('revenue', Float),
+    Column('profit_loss', Float),
+    Column('notes', Text),
+    Column('created_at', DateTime),
+    Column('updated_at', DateTime),
+)
+
+labor_hiring = Table(
+    'labor_hiring', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('farmer_id', Integer, ForeignKey('farmer_profiles.id'), nullable=False),
+    Column('labor_id', Integer, ForeignKey('labor_profiles.id')),
+    Column('job_title', String(200), nullable=False),
+    Column('description', Text),
+    Column('work_type', String(50)),
+    Column('start_date', Date, nullable=False),
+    Column('end_date', Date),
+    Column('total_days', Integer),
+    Column('daily_wage', Float),
+    Column('total_wage', Float),
+    Column('location', String(200)),
+    Column('laborers_needed', Integer),
+    Column('status', String(20)),
+    Column('created_at', DateTime),
+)
+
+equipment = Table(
+    'equipment', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('owner_id', Integer, ForeignKey('farmer_profiles.id'), nullable=False),
+    Column('equipment_name', String(200), nullable=False),
+    Column('equipment_type', String(50)),
+    Column('description', Text),
+    Column('rental_price_per_day', Float),
+    Column('is_available_for_rent', Boolean),
+    Column('is_available_for_share', Boolean),
+    Column('condition', String(20)),
+    Column('image_url', String(500)),
+    Column('created_at', DateTime),
+)
+
+equipment_rentals = Table(
+    'equipment_rentals', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('equipment_id', Integer, ForeignKey('equipment.id'), nullable=False),
+    Column('renter_id', Integer, ForeignKey('farmer_profiles.id'), nullable=False),
+    Column('start_date', Date, nullable=False),
+    Column('end_date', Date, nullable=False),
+    Column('total_days', Integer, nullable=False),
+    Column('rental_rate', Float, nullable=False),
+    Column('total_cost', Float, nullable=False),
+    Column('status', String(20)),
+    Column('created_at', DateTime),
+)
+
+recommendation_history = Table(
+    'recommendation_history', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('farmer_id', Integer, ForeignKey('farmer_profiles.id'), nullable=False),
+    Column('recommendation_type', String(20)),
+    Column('input_parameters', Text, nullable=False),
+    Column('recommendation_result', Text, nullable=False),
+    Column('confidence_score', Float),
+    Column('created_at', DateTime),
+)
+
+
+def upgrade(op):
+    op.create_tables(*metadata.sorted_tables)
@@ -0,0 +1,5 @@
+"""Add crop_listings.location"""
+
+
+def upgrade(op):
+    op.add_column('crop_listings', 'location', 'VARCHAR(255)')
@@ -0,0 +1,95 @@
+"""Store recommendation history in typed columns
+
+Replaces the JSON ``input_parameters`` / ``recommendation_result`` text
+columns with numeric input columns, ``top_result`` and a compressed
+``payload``, converting rows in batches. The payload keeps the full
+input/result pair; the conversion is spelled out here rather than shared
+with the application, so later changes to the live format do not change
+what this migration does.
+"""
+
+import json
+import zlib
+
+
+BATCH_SIZE = 500
+
+# Request field -> typed column
+INPUT_COLUMNS = {
+    'N': 'n',
+    'P': 'p',
+    'K': 'k',
+    'temperature': 'temperature',
+    'humidity': 'humidity',
+    'pH': 'ph',
+    'rainfall': 'rainfall',
+}
+# Result field holding each recommendation type's top result
+RESULT_KEYS = {'crop': 'crop', 'fertilizer': 'fertilizer'}
+TYPED_COLUMNS = {
+    'n': 'FLOAT',
+    'p': 'FLOAT',
+    'k': 'FLOAT',
+    'temperature': 'FLOAT',
+    'humidity': 'FLOAT',
+    'ph': 'FLOAT',
+    'rainfall': 'FLOAT',
+    'top_result': 'VARCHAR(100)',
+}
+
+
+def _number(value):
+    try:
+        return float(value) if value is not None and not isinstance(value, bool) else None
+    except (TypeError, ValueError):
+        return None
+
+
+def convert(row_id, recommendation_type, inputs, result):
+    """Typed column values for one old JSON row."""
+    raw = json.dumps({'input': inputs, 'result': result}, separators=(',', ':'))
+    row = {
+        'id': row_id,
+        'top_result': result.get(RESULT_KEYS.get(recommendation_type, 'crop')),
+        'confidence_score': _number(result.get('confidence')),
+        'payload': zlib.compress(raw.encode('utf-8')),
+    }
+    for field, column in INPUT_COLUMNS.items():
+        row[column] = _number(inputs.get(field))
+    return row
+
+
+def upgrade(op):
+    if 'input_parameters' in op.columns('recommendation_history'):
+        payload_type = 'BYTEA' if op.dialect == 'postgresql' else 'BLOB'
+        for name, ddl in {**TYPED_COLUMNS, 'payload': payload_type}.items():
+            op.add_column('recommendation_history', name, ddl)
+
+        last_id = 0
+        while True:
+            rows = op.execute(
+                "SELECT id, recommendation_type, input_parameters, recommendation_result "
+                "FROM recommendation_history WHERE id > :last_id ORDER BY id LIMIT :limit",
+                {'last_id': last_id, 'limit': BATCH_SIZE}
+            ).fetchall()
+            if not rows:
+                break
+            updates = [
+                convert(row_id, rec_type, json.loads(inputs), json.loads(result))
+                for row_id, rec_type, inputs, result in rows
+            ]
+            columns = [*TYPED_COLUMNS, 'confidence_score', 'payload']
+            op.execute(
+                f"UPDATE recommendation_history SET "
+                f"{', '.join(f'{name} = :{name}' for name in columns)} WHERE id = :id",
+                updates
+            )
+            last_id = rows[-1][0]
+
+        op.execute("ALTER TABLE recommendation_history DROP COLUMN input_parameters")
+        op.execute("ALTER TABLE recommendation_history DROP COLUMN recommendation_result")
+
+    op.create_index(
+        'ix_recommendation_history_farmer_created', 'recommendation_history',
+        ['farmer_id', 'created_at']
+    )
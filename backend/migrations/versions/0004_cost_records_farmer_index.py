@@ -0,0 +1,7 @@
+"""Index cost_records.farmer_id"""
+
+transactional = False
+
+
+def upgrade(op):
+    op.create_index('ix_cost_records_farmer_id', 'cost_records', ['farmer_id'])
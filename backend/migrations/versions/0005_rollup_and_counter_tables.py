@@ -0,0 +1,72 @@
+"""Add recommendation rollups, platform counters and analytics rollups"""
+
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    UniqueConstraint,
+)
+
+from migrations import referenced_tables
+
+
+metadata = MetaData()
+referenced_tables(metadata, 'farmer_profiles')
+
+recommendation_daily_rollups = Table(
+    'recommendation_daily_rollups', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('farmer_id', Integer, ForeignKey('farmer_profiles.id'), nullable=False),
+    Column('day', Date, nullable=False),
+    Column('recommendation_type', String(20)),
+    Column('top_result', String(100)),
+    Column('count', Integer),
+    Column('confidence_sum', Float),
+    Column('n_sum', Float),
+    Column('p_sum', Float),
+    Column('k_sum', Float),
+    Column('temperature_sum', Float),
+    Column('humidity_sum', Float),
+    Column('ph_sum', Float),
+    Column('rainfall_sum', Float),
+    UniqueConstraint('farmer_id', 'day', 'recommendation_type', 'top_result',
+                     name='uq_recommendation_rollup_key'),
+)
+
+platform_counters = Table(
+    'platform_counters', metadata,
+    Column('name', String(50), primary_key=True),
+    Column('value', Integer, nullable=False),
+)
+
+analytics_rollups = Table(
+    'analytics_rollups', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('metric', String(50), nullable=False),
+    Column('granularity', String(10), nullable=False),
+    Column('period_start', Date, nullable=False),
+    Column('dimension', String(100), nullable=False),
+    Column('count', Integer, nullable=False),
+    Column('amount', Float, nullable=False),
+    UniqueConstraint('metric', 'granularity', 'period_start', 'dimension',
+                     name='uq_analytics_rollup_key'),
+)
+
+analytics_watermarks = Table(
+    'analytics_watermarks', metadata,
+    Column('metric', String(50), primary_key=True),
+    Column('last_id', Integer, nullable=False),
+    Column('updated_at', DateTime),
+)
+
+
+def upgrade(op):
+    op.create_tables(
+        recommendation_daily_rollups, platform_counters, analytics_rollups, analytics_watermarks
+    )
@@ -0,0 +1,54 @@
+"""Add checkout inventory holds and the order event log"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    text,
+)
+
+from migrations import referenced_tables
+
+
+metadata = MetaData()
+referenced_tables(metadata, 'users', 'orders')
+
+inventory_holds = Table(
+    'inventory_holds', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('buyer_id', Integer, ForeignKey('users.id'), nullable=False),
+    Column('item_type', String(20), nullable=False),
+    Column('item_id', Integer, nullable=False),
+    Column('quantity', Float, nullable=False),
+    Column('status', String(20), nullable=False),
+    Column('expires_at', DateTime, nullable=False),
+    Column('order_id', Integer, ForeignKey('orders.id')),
+    Column('created_at', DateTime),
+    Index(
+        'ix_inventory_holds_active', 'item_type', 'item_id', 'expires_at', 'quantity',
+        sqlite_where=text("status = 'active'"),
+        postgresql_where=text("status = 'active'"),
+    ),
+    Index('ix_inventory_holds_buyer_status', 'buyer_id', 'status'),
+)
+
+order_events = Table(
+    'order_events', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('user_id', Integer, nullable=False),
+    Column('order_id', Integer, nullable=False),
+    Column('payload', Text, nullable=False),
+    Column('created_at', DateTime, index=True),
+    Index('ix_order_events_user_id', 'user_id', 'id'),
+)
+
+
+def upgrade(op):
+    op.create_tables(inventory_holds, order_events)
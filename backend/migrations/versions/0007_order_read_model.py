@@ -0,0 +1,47 @@
+"""Denormalize product, seller and buyer names onto orders"""
+
+transactional = False
+
+NEW_COLUMNS = {
+    'product_name': 'VARCHAR(200)',
+    'seller_id': 'INTEGER REFERENCES users (id)',
+    'seller_name': 'VARCHAR(100)',
+    'buyer_name': 'VARCHAR(100)',
+    'buyer_email': 'VARCHAR(120)',
+}
+
+
+def upgrade(op):
+    for name, ddl in NEW_COLUMNS.items():
+        op.add_column('orders', name, ddl)
+
+    # Backfill names from the current listing/product, profile and user rows
+    op.execute("""
+        UPDATE orders SET
+            buyer_name = (SELECT full_name FROM users WHERE users.id = orders.buyer_id),
+            buyer_email = (SELECT email FROM users WHERE users.id = orders.buyer_id),
+            product_name = CASE
+                WHEN order_type = 'crop' THEN
+                    (SELECT crop_name FROM crop_listings WHERE crop_listings.id = orders.crop_listing_id)
+                ELSE
+                    (SELECT product_name FROM vendor_products WHERE vendor_products.id = orders.vendor_product_id)
+            END,
+            seller_id = CASE
+                WHEN order_type = 'crop' THEN
+                    (SELECT farmer_profiles.user_id FROM crop_listings
+                     JOIN farmer_profiles ON farmer_profiles.id = crop_listings.farmer_id
+                     WHERE crop_listings.id = orders.crop_listing_id)
+                ELSE
+                    (SELECT vendor_profiles.user_id FROM vendor_products
+                     JOIN vendor_profiles ON vendor_profiles.id = vendor_products.vendor_id
+                     WHERE vendor_products.id = orders.vendor_product_id)
+            END
+        WHERE seller_id IS NULL OR buyer_name IS NULL
+    """)
+    op.execute("""
+        UPDATE orders SET seller_name = (SELECT full_name FROM users WHERE users.id = orders.seller_id)
+        WHERE seller_name IS NULL AND seller_id IS NOT NULL
+    """)
+
+    op.create_index('ix_orders_buyer_created', 'orders', ['buyer_id', 'created_at'])
+    op.create_index('ix_orders_seller_created', 'orders', ['seller_id', 'created_at'])
@@ -0,0 +1,14 @@
+"""Add the indexed orders.vendor_id"""
+
+transactional = False
+
+
+def upgrade(op):
+    op.add_column('orders', 'vendor_id', 'INTEGER REFERENCES vendor_profiles (id)')
+    op.execute("""
+        UPDATE orders SET vendor_id = (
+            SELECT vendor_id FROM vendor_products WHERE vendor_products.id = orders.vendor_product_id
+        )
+        WHERE vendor_id IS NULL AND vendor_product_id IS NOT NULL
+    """)
+    op.create_index('ix_orders_vendor_created', 'orders', ['vendor_id', 'created_at'])
@@ -0,0 +1,26 @@
+"""Add shared rate limit buckets and revoked tokens"""
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table
+
+
+metadata = MetaData()
+
+rate_limit_buckets = Table(
+    'rate_limit_buckets', metadata,
+    Column('key', String(200), primary_key=True),
+    Column('tokens', Float, nullable=False),
+    Column('updated_at', Float, nullable=False),
+)
+
+revoked_tokens = Table(
+    'revoked_tokens', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('jti', String(64), nullable=False, unique=True),
+    Column('user_id', Integer, nullable=False),
+    Column('expires_at', DateTime, nullable=False, index=True),
+    Column('revoked_at', DateTime),
+)
+
+
+def upgrade(op):
+    op.create_tables(rate_limit_buckets, revoked_tokens)
@@ -0,0 +1,121 @@
+"""Add the labor skill and posting tag index tables
+
+The tables are filled from existing profiles and postings in batches. Tag
+parsing is spelled out here rather than shared with
+``services.labor_matching``, so later changes to the live parser do not
+change what this migration does; ``flask reindex-labor-tags`` rebuilds the
+tables with the current parser.
+"""
+
+import json
+import re
+
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table
+
+from migrations import referenced_tables
+
+
+BATCH_SIZE = 1000
+
+SKILL_SYNONYMS = {
+    'harvest': 'harvesting',
+    'reaping': 'harvesting',
+    'picking': 'harvesting',
+    'plant': 'planting',
+    'sowing': 'planting',
+    'seeding': 'planting',
+    'transplanting': 'planting',
+    'irrigate': 'irrigation',
+    'watering': 'irrigation',
+    'weed': 'weeding',
+    'weed control': 'weeding',
+    'spray': 'spraying',
+    'pesticide spraying': 'spraying',
+    'pest control': 'spraying',
+    'plough': 'plowing',
+    'ploughing': 'plowing',
+    'tilling': 'plowing',
+    'tillage': 'plowing',
+    'tractor': 'tractor driving',
+    'tractor operation': 'tractor driving',
+    'fertilizing': 'fertilizer application',
+    'fertiliser application': 'fertilizer application',
+    'dairy': 'livestock',
+    'cattle': 'livestock',
+}
+VOCABULARY = set(SKILL_SYNONYMS) | set(SKILL_SYNONYMS.values())
+MAX_TAG_LENGTH = 50
+
+metadata = MetaData()
+referenced_tables(metadata, 'labor_profiles', 'labor_hiring')
+
+labor_skill_tags = Table(
+    'labor_skill_tags', metadata,
+    Column('tag', String(50), primary_key=True),
+    Column('labor_id', Integer, ForeignKey('labor_profiles.id'), primary_key=True, index=True),
+)
+
+labor_posting_tags = Table(
+    'labor_posting_tags', metadata,
+    Column('tag', String(50), primary_key=True),
+    Column('posting_id', Integer, ForeignKey('labor_hiring.id'), primary_key=True, index=True),
+)
+
+
+def _tag(text):
+    tag = ' '.join(re.findall(r'[a-z0-9]+', text.lower()))[:MAX_TAG_LENGTH]
+    return SKILL_SYNONYMS.get(tag, tag)
+
+
+def _skill_tags(skills):
+    if not skills:
+        return set()
+    try:
+        parsed = json.loads(skills)
+    except ValueError:
+        parsed = None
+    items = parsed if isinstance(parsed, list) else re.split(r'[,;/|\n]+', skills)
+    return {tag for tag in (_tag(str(item)) for item in items) if tag}
+
+
+def _posting_tags(work_type, job_title):
+    tags = _skill_tags(work_type)
+    if job_title:
+        words = re.findall(r'[a-z]+', job_title.lower())
+        tags |= {SKILL_SYNONYMS.get(word, word) for word in words if word in VOCABULARY}
+    return tags
+
+
+def _fill(op, select_sql, table, owner_key, tags_of):
+    last_id = 0
+    while True:
+        rows = op.execute(select_sql, {'last_id': last_id, 'limit': BATCH_SIZE}).fetchall()
+        if not rows:
+            break
+        values = [
+            {'tag': tag, owner_key: row[0]}
+            for row in rows
+            for tag in sorted(tags_of(*row[1:]))
+        ]
+        if values:
+            op.connection.execute(table.insert(), values)
+        last_id = rows[-1][0]
+
+
+def upgrade(op):
+    op.create_tables(labor_skill_tags, labor_posting_tags)
+
+    if op.execute("SELECT 1 FROM labor_skill_tags LIMIT 1").first() is None:
+        _fill(
+            op,
+            "SELECT id, skills FROM labor_profiles "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit",
+            labor_skill_tags, 'labor_id', _skill_tags,
+        )
+    if op.execute("SELECT 1 FROM labor_posting_tags LIMIT 1").first() is None:
+        _fill(
+            op,
+            "SELECT id, work_type, job_title FROM labor_hiring "
+            "WHERE id > :last_id ORDER BY id LIMIT :limit",
+            labor_posting_tags, 'posting_id', _posting_tags,
+        )
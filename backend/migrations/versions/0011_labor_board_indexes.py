@@ -0,0 +1,16 @@
+"""Index labor_hiring for the keyset-paginated job boards"""
+
+transactional = False
+
+INDEXES = {
+    'ix_labor_hiring_status_created': ['status', 'created_at', 'id'],
+    'ix_labor_hiring_status_start': ['status', 'start_date'],
+    'ix_labor_hiring_status_wage': ['status', 'daily_wage'],
+    'ix_labor_hiring_farmer_created': ['farmer_id', 'created_at', 'id'],
+    'ix_labor_hiring_labor_created': ['labor_id', 'created_at', 'id'],
+}
+
+
+def upgrade(op):
+    for name, columns in INDEXES.items():
+        op.create_index(name, 'labor_hiring', columns)
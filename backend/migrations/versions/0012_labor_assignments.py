@@ -0,0 +1,53 @@
+"""Let labor postings take several workers
+
+Adds ``labor_assignments`` and ``labor_hiring.laborers_filled``; postings
+taken under the single-worker scheme keep their worker as an assignment.
+"""
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    MetaData,
+    Table,
+    UniqueConstraint,
+)
+
+from migrations import referenced_tables
+
+
+metadata = MetaData()
+referenced_tables(metadata, 'labor_profiles', 'labor_hiring')
+
+labor_assignments = Table(
+    'labor_assignments', metadata,
+    Column('id', Integer, primary_key=True),
+    Column('posting_id', Integer, ForeignKey('labor_hiring.id'), nullable=False),
+    Column('labor_id', Integer, ForeignKey('labor_profiles.id'), nullable=False),
+    Column('created_at', DateTime),
+    UniqueConstraint('posting_id', 'labor_id', name='uq_labor_assignments_posting_labor'),
+    Index('ix_labor_assignments_labor_created', 'labor_id', 'created_at'),
+)
+
+
+def upgrade(op):
+    op.create_tables(labor_assignments)
+    op.add_column('labor_hiring', 'laborers_filled', "INTEGER NOT NULL DEFAULT 0")
+
+    op.execute("""
+        INSERT INTO labor_assignments (posting_id, labor_id, created_at)
+        SELECT id, labor_id, created_at FROM labor_hiring
+        WHERE labor_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM labor_assignments
+            WHERE labor_assignments.posting_id = labor_hiring.id
+              AND labor_assignments.labor_id = labor_hiring.labor_id
+        )
+    """)
+    op.execute("""
+        UPDATE labor_hiring SET laborers_filled = (
+            SELECT COUNT(*) FROM labor_assignments
+            WHERE labor_assignments.posting_id = labor_hiring.id
+        )
+    """)
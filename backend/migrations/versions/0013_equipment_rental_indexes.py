@@ -0,0 +1,11 @@
+"""Index equipment_rentals for overlap checks and renter listings"""
+
+transactional = False
+
+
+def upgrade(op):
+    op.create_index(
+        'ix_equipment_rentals_equipment_dates', 'equipment_rentals',
+        ['equipment_id', 'start_date', 'end_date']
+    )
+    op.create_index('ix_equipment_rentals_renter_start', 'equipment_rentals', ['renter_id', 'start_date'])
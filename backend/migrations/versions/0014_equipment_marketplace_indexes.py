@@ -0,0 +1,17 @@
+"""Index equipment and farmer coordinates for the marketplace search"""
+
+transactional = False
+
+# index name -> (table, columns)
+INDEXES = {
+    'ix_equipment_rent_type': ('equipment', ['is_available_for_rent', 'equipment_type', 'id']),
+    'ix_equipment_share_type': ('equipment', ['is_available_for_share', 'equipment_type', 'id']),
+    'ix_equipment_rent_price': ('equipment', ['is_available_for_rent', 'rental_price_per_day']),
+    'ix_equipment_owner_id': ('equipment', ['owner_id']),
+    'ix_farmer_profiles_lat_lon': ('farmer_profiles', ['latitude', 'longitude']),
+}
+
+
+def upgrade(op):
+    for name, (table, columns) in INDEXES.items():
+        op.create_index(name, table, columns)
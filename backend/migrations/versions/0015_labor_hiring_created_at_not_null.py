@@ -0,0 +1,13 @@
+"""Make labor_hiring.created_at NOT NULL
+
+The job boards paginate on ``(created_at, id)``, so every posting needs a
+creation time. Missing ones are backfilled with the current time. SQLite
+cannot add the constraint to an existing column; there the application
+default keeps new rows filled.
+"""
+
+
+def upgrade(op):
+    op.execute("UPDATE labor_hiring SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+    if op.dialect == 'postgresql':
+        op.execute("ALTER TABLE labor_hiring ALTER COLUMN created_at SET NOT NULL")
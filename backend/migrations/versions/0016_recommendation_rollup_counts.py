@@ -0,0 +1,17 @@
+"""Count the non-NULL values behind each recommendation rollup sum
+
+Averages used to divide every sum by the row count, so rows without a value
+(fertilizer requests have no climate inputs) pulled the mean down. Existing
+rollups keep their old averages: a non-zero sum is taken to cover all rows.
+"""
+
+COLUMNS = ['confidence', 'n', 'p', 'k', 'temperature', 'humidity', 'ph', 'rainfall']
+
+
+def upgrade(op):
+    for column in COLUMNS:
+        if op.add_column('recommendation_daily_rollups', f'{column}_count', 'INTEGER NOT NULL DEFAULT 0'):
+            op.execute(
+                f"UPDATE recommendation_daily_rollups "
+                f"SET {column}_count = CASE WHEN {column}_sum <> 0 THEN count ELSE 0 END"
+            )
@@ -0,0 +1,5 @@
+"""Add farmer_profiles.cost_version for cost summary cache invalidation"""
+
+
+def upgrade(op):
+    op.add_column('farmer_profiles', 'cost_version', 'INTEGER NOT NULL DEFAULT 0')
@@ -0,0 +1,10 @@
+"""Drop the labor_hiring index on labor_id
+
+A worker's jobs are read through ``labor_assignments`` (indexed by
+``ix_labor_assignments_labor_created``) since postings take several
+workers, so ``ix_labor_hiring_labor_created`` only slows down writes.
+"""
+
+
+def upgrade(op):
+    op.drop_index('ix_labor_hiring_labor_created', 'labor_hiring')
@@ -0,0 +1 @@
+"""Schema migrations, applied in order of their ``NNNN_`` prefix"""
@@ -4,11 +4,14 @@ Multi-purpose agricultural system with role-based access
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from utils.passwords import password_hasher
 import enum
 
-db = SQLAlchemy()
+from models.session import RoutingSession, REPLICA_BIND, mark_replica_failed
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 class UserRole(enum.Enum):
@@ -29,6 +32,17 @@ class OrderStatus(enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Statuses an order may move to from each status. Orders only move forward;
+# completed and cancelled orders are final.
+ORDER_STATUS_TRANSITIONS = {
+    OrderStatus.PENDING: {OrderStatus.CONFIRMED, OrderStatus.CANCELLED},
+    OrderStatus.CONFIRMED: {OrderStatus.IN_PROGRESS, OrderStatus.COMPLETED, OrderStatus.CANCELLED},
+    OrderStatus.IN_PROGRESS: {OrderStatus.COMPLETED, OrderStatus.CANCELLED},
+    OrderStatus.COMPLETED: set(),
+    OrderStatus.CANCELLED: set(),
+}
+
+
 class User(db.Model):
     """Base user model for all user types"""
     __tablename__ = 'users'
@@ -52,11 +66,15 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verify password"""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        """True if the stored hash predates the current hash settings"""
+        return password_hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -76,6 +94,9 @@ class User(db.Model):
 class FarmerProfile(db.Model):
     """Extended profile for farmers"""
     __tablename__ = 'farmer_profiles'
+    __table_args__ = (
+        db.Index('ix_farmer_profiles_lat_lon', 'latitude', 'longitude'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), unique=True, nullable=False)
@@ -86,6 +107,7 @@ class FarmerProfile(db.Model):
     longitude = db.Column(db.Float)
     soil_type = db.Column(db.String(50))
     irrigation_type = db.Column(db.String(50))
+    cost_version = db.Column(db.Integer, nullable=False, default=0)  # bumped on cost record writes
     
     # Relationships
     user = db.relationship('User', back_populates='farmer_profile')
@@ -218,12 +240,24 @@ class VendorProduct(db.Model):
 class Order(db.Model):
     """Orders placed by buyers"""
     __tablename__ = 'orders'
+    __table_args__ = (
+        db.Index('ix_orders_buyer_created', 'buyer_id', 'created_at'),
+        db.Index('ix_orders_seller_created', 'seller_id', 'created_at'),
+        db.Index('ix_orders_vendor_created', 'vendor_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     order_type = db.Column(db.String(20))  # crop, vendor_product
     crop_listing_id = db.Column(db.Integer, db.ForeignKey('crop_listings.id'), nullable=True)
     vendor_product_id = db.Column(db.Integer, db.ForeignKey('vendor_products.id'), nullable=True)
+    vendor_id = db.Column(db.Integer, db.ForeignKey('vendor_profiles.id'), nullable=True)  # set for vendor_product orders
+    # Read model: names captured when the order is written, kept in step on renames
+    product_name = db.Column(db.String(200))
+    seller_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)  # farmer/vendor user
+    seller_name = db.Column(db.String(100))
+    buyer_name = db.Column(db.String(100))
+    buyer_email = db.Column(db.String(120))
     quantity = db.Column(db.Float, nullable=False)
     unit_price = db.Column(db.Float, nullable=False)
     total_price = db.Column(db.Float, nullable=False)
@@ -237,6 +271,7 @@ class Order(db.Model):
     
     # Relationships
     buyer = db.relationship('User', foreign_keys=[buyer_id])
+    seller = db.relationship('User', foreign_keys=[seller_id])
     crop_listing = db.relationship('CropListing', back_populates='orders')
     vendor_product = db.relationship('VendorProduct', back_populates='orders')
     payments = db.relationship('Payment', back_populates='order', cascade='all, delete-orphan')
@@ -264,7 +299,7 @@ class CostRecord(db.Model):
     __tablename__ = 'cost_records'
     
     id = db.Column(db.Integer, primary_key=True)
-    farmer_id = db.Column(db.Integer, db.ForeignKey('farmer_profiles.id'), nullable=False)
+    farmer_id = db.Column(db.Integer, db.ForeignKey('farmer_profiles.id'), nullable=False, index=True)
     crop_name = db.Column(db.String(100), nullable=False)
     season = db.Column(db.String(50))  # Kharif, Rabi, Zaid
     year = db.Column(db.Integer, nullable=False)
@@ -294,10 +329,17 @@ class CostRecord(db.Model):
 class LaborHiring(db.Model):
     """Labor hiring and work records"""
     __tablename__ = 'labor_hiring'
+    __table_args__ = (
+        # Job board pages are keyset paginated newest first within each filter.
+        db.Index('ix_labor_hiring_status_created', 'status', 'created_at', 'id'),
+        db.Index('ix_labor_hiring_status_start', 'status', 'start_date'),
+        db.Index('ix_labor_hiring_status_wage', 'status', 'daily_wage'),
+        db.Index('ix_labor_hiring_farmer_created', 'farmer_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     farmer_id = db.Column(db.Integer, db.ForeignKey('farmer_profiles.id'), nullable=False)
-    labor_id = db.Column(db.Integer, db.ForeignKey('labor_profiles.id'), nullable=True)
+    labor_id = db.Column(db.Integer, db.ForeignKey('labor_profiles.id'), nullable=True)  # First assigned worker
     job_title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     work_type = db.Column(db.String(50))  # planting, harvesting, irrigation, etc.
@@ -308,17 +350,60 @@ class LaborHiring(db.Model):
     total_wage = db.Column(db.Float, default=0.0)
     location = db.Column(db.String(200))  # Work location
     laborers_needed = db.Column(db.Integer, default=1)  # Number of workers needed
+    laborers_filled = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # Slots claimed in labor_assignments
     status = db.Column(db.String(20), default='open')  # open, active, completed, cancelled
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # keyset pagination key
     
     # Relationships
     farmer = db.relationship('FarmerProfile', back_populates='labor_hiring')
     labor = db.relationship('LaborProfile', back_populates='work_history')
+    assignments = db.relationship('LaborAssignment', back_populates='posting', cascade='all, delete-orphan')
+
+
+class LaborAssignment(db.Model):
+    """Worker holding one of a labor posting's slots"""
+    __tablename__ = 'labor_assignments'
+    __table_args__ = (
+        db.UniqueConstraint('posting_id', 'labor_id', name='uq_labor_assignments_posting_labor'),
+        db.Index('ix_labor_assignments_labor_created', 'labor_id', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    posting_id = db.Column(db.Integer, db.ForeignKey('labor_hiring.id'), nullable=False)
+    labor_id = db.Column(db.Integer, db.ForeignKey('labor_profiles.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Relationships
+    posting = db.relationship('LaborHiring', back_populates='assignments')
+    labor = db.relationship('LaborProfile')
+
+
+class LaborSkillTag(db.Model):
+    """Normalized skill tag of a labor profile (tag -> profiles index)"""
+    __tablename__ = 'labor_skill_tags'
+    
+    tag = db.Column(db.String(50), primary_key=True)
+    labor_id = db.Column(db.Integer, db.ForeignKey('labor_profiles.id'), primary_key=True, index=True)
+
+
+class LaborPostingTag(db.Model):
+    """Normalized work type tag of a labor posting (tag -> postings index)"""
+    __tablename__ = 'labor_posting_tags'
+    
+    tag = db.Column(db.String(50), primary_key=True)
+    posting_id = db.Column(db.Integer, db.ForeignKey('labor_hiring.id'), primary_key=True, index=True)
 
 
 class Equipment(db.Model):
     """Farm equipment owned by farmers (for sharing/renting)"""
     __tablename__ = 'equipment'
+    __table_args__ = (
+        # Marketplace search: offer flag + type, newest first, or a price range.
+        db.Index('ix_equipment_rent_type', 'is_available_for_rent', 'equipment_type', 'id'),
+        db.Index('ix_equipment_share_type', 'is_available_for_share', 'equipment_type', 'id'),
+        db.Index('ix_equipment_rent_price', 'is_available_for_rent', 'rental_price_per_day'),
+        db.Index('ix_equipment_owner_id', 'owner_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     owner_id = db.Column(db.Integer, db.ForeignKey('farmer_profiles.id'), nullable=False)
@@ -340,6 +425,11 @@ class Equipment(db.Model):
 class EquipmentRental(db.Model):
     """Equipment rental transactions"""
     __tablename__ = 'equipment_rentals'
+    __table_args__ = (
+        # Overlap checks seek on (equipment_id, start_date) and read end_date from the index.
+        db.Index('ix_equipment_rentals_equipment_dates', 'equipment_id', 'start_date', 'end_date'),
+        db.Index('ix_equipment_rentals_renter_start', 'renter_id', 'start_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     equipment_id = db.Column(db.Integer, db.ForeignKey('equipment.id'), nullable=False)
@@ -360,27 +450,239 @@ class EquipmentRental(db.Model):
 class RecommendationHistory(db.Model):
     """History of crop and fertilizer recommendations for farmers"""
     __tablename__ = 'recommendation_history'
+    __table_args__ = (
+        db.Index('ix_recommendation_history_farmer_created', 'farmer_id', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     farmer_id = db.Column(db.Integer, db.ForeignKey('farmer_profiles.id'), nullable=False)
     recommendation_type = db.Column(db.String(20))  # crop or fertilizer
     
-    # Input parameters (JSON string)
-    input_parameters = db.Column(db.Text, nullable=False)
+    # Numeric inputs (NULL when not used by the recommendation type)
+    n = db.Column(db.Float)
+    p = db.Column(db.Float)
+    k = db.Column(db.Float)
+    temperature = db.Column(db.Float)
+    humidity = db.Column(db.Float)
+    ph = db.Column(db.Float)
+    rainfall = db.Column(db.Float)
     
     # Results
-    recommendation_result = db.Column(db.Text, nullable=False)
+    top_result = db.Column(db.String(100))  # recommended crop or fertilizer
     confidence_score = db.Column(db.Float)
     
+    # Full input/result as zlib-compressed JSON (optional)
+    payload = db.Column(db.LargeBinary)
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
     farmer = db.relationship('FarmerProfile', back_populates='recommendation_history')
 
 
+class RecommendationDailyRollup(db.Model):
+    """Per-farmer daily aggregates of expired recommendation history"""
+    __tablename__ = 'recommendation_daily_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('farmer_id', 'day', 'recommendation_type', 'top_result',
+                            name='uq_recommendation_rollup_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    farmer_id = db.Column(db.Integer, db.ForeignKey('farmer_profiles.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    recommendation_type = db.Column(db.String(20))
+    top_result = db.Column(db.String(100))
+    count = db.Column(db.Integer, default=0)
+    
+    # Sums rather than averages so repeated rollups can be merged
+    confidence_sum = db.Column(db.Float, default=0.0)
+    n_sum = db.Column(db.Float, default=0.0)
+    p_sum = db.Column(db.Float, default=0.0)
+    k_sum = db.Column(db.Float, default=0.0)
+    temperature_sum = db.Column(db.Float, default=0.0)
+    humidity_sum = db.Column(db.Float, default=0.0)
+    ph_sum = db.Column(db.Float, default=0.0)
+    rainfall_sum = db.Column(db.Float, default=0.0)
+    
+    # Non-NULL values behind each sum, the divisor for its average
+    confidence_count = db.Column(db.Integer, nullable=False, default=0)
+    n_count = db.Column(db.Integer, nullable=False, default=0)
+    p_count = db.Column(db.Integer, nullable=False, default=0)
+    k_count = db.Column(db.Integer, nullable=False, default=0)
+    temperature_count = db.Column(db.Integer, nullable=False, default=0)
+    humidity_count = db.Column(db.Integer, nullable=False, default=0)
+    ph_count = db.Column(db.Integer, nullable=False, default=0)
+    rainfall_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class PlatformCounter(db.Model):
+    """Incrementally maintained row counts for admin analytics"""
+    __tablename__ = 'platform_counters'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+
+
+class AnalyticsRollup(db.Model):
+    """Daily and monthly aggregates for admin time-series analytics"""
+    __tablename__ = 'analytics_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('metric', 'granularity', 'period_start', 'dimension',
+                            name='uq_analytics_rollup_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.String(50), nullable=False)  # orders, crop_revenue, new_users, ...
+    granularity = db.Column(db.String(10), nullable=False)  # day or month
+    period_start = db.Column(db.Date, nullable=False)
+    dimension = db.Column(db.String(100), nullable=False, default='')  # role, crop, category, ...
+    count = db.Column(db.Integer, nullable=False, default=0)
+    amount = db.Column(db.Float, nullable=False, default=0.0)
+
+
+class AnalyticsWatermark(db.Model):
+    """Highest source row id already folded into the analytics rollups"""
+    __tablename__ = 'analytics_watermarks'
+    
+    metric = db.Column(db.String(50), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class InventoryHold(db.Model):
+    """Short-lived reservation of crop listing / vendor product stock"""
+    __tablename__ = 'inventory_holds'
+    __table_args__ = (
+        # Only active holds are ever summed, so keep the index to those rows.
+        db.Index(
+            'ix_inventory_holds_active', 'item_type', 'item_id', 'expires_at', 'quantity',
+            sqlite_where=db.text("status = 'active'"),
+            postgresql_where=db.text("status = 'active'"),
+        ),
+        db.Index('ix_inventory_holds_buyer_status', 'buyer_id', 'status'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    buyer_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    item_type = db.Column(db.String(20), nullable=False)  # crop, vendor_product
+    item_id = db.Column(db.Integer, nullable=False)
+    quantity = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='active')  # active, confirmed, released, expired
+    expires_at = db.Column(db.DateTime, nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id'), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class OrderEvent(db.Model):
+    """Order status change, one row per recipient, for the cross-worker event bus"""
+    __tablename__ = 'order_events'
+    __table_args__ = (
+        db.Index('ix_order_events_user_id', 'user_id', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    order_id = db.Column(db.Integer, nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON event body
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class RateLimitBucket(db.Model):
+    """Shared token bucket state for the database rate limit backend"""
+    __tablename__ = 'rate_limit_buckets'
+    
+    key = db.Column(db.String(200), primary_key=True)  # route class + user/IP
+    tokens = db.Column(db.Float, nullable=False)
+    updated_at = db.Column(db.Float, nullable=False)  # unix time of last refill
+
+
+class RevokedToken(db.Model):
+    """JWT ids revoked before their expiry (logout)"""
+    __tablename__ = 'revoked_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    jti = db.Column(db.String(64), unique=True, nullable=False)
+    user_id = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+def _is_sqlite(uri):
+    return uri.startswith('sqlite')
+
+
+def _tune_sqlite(app, uri):
+    return _is_sqlite(uri) and ':memory:' not in uri and app.config.get('SQLITE_TUNING', True)
+
+
+def _engine_options(app, uri, base=None):
+    """Engine/pool options suited to the database backend behind ``uri``."""
+    options = dict(base or {})
+
+    if _is_sqlite(uri):
+        # SQLite connections are cheap file handles; give every thread its
+        # own so readers never queue behind the pool while a writer commits.
+        options.setdefault('pool_size', app.config['SQLITE_POOL_SIZE'])
+        options.setdefault('max_overflow', app.config['SQLITE_POOL_SIZE'])
+        options.setdefault('connect_args', {'check_same_thread': False})
+    else:
+        options.setdefault('pool_size', app.config['DB_POOL_SIZE'])
+        options.setdefault('max_overflow', app.config['DB_MAX_OVERFLOW'])
+        options.setdefault('pool_pre_ping', app.config['DB_POOL_PRE_PING'])
+        options.setdefault('pool_recycle', app.config['DB_POOL_RECYCLE'])
+
+    return options
+
+
+def _sqlite_pragmas(app):
+    """Per-connection PRAGMA statements for SQLite production tuning."""
+    return [
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA busy_timeout={app.config['SQLITE_BUSY_TIMEOUT_MS']}",
+        f"PRAGMA mmap_size={app.config['SQLITE_MMAP_SIZE']}",
+        f"PRAGMA cache_size={app.config['SQLITE_CACHE_SIZE']}",
+        'PRAGMA temp_store=MEMORY',
+    ]
+
+
+def _install_sqlite_pragmas(app, engine):
+    pragmas = _sqlite_pragmas(app)
+
+    @event.listens_for(engine, 'connect')
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
 def init_db(app):
     """Initialize database with Flask app"""
+    uri = app.config['SQLALCHEMY_DATABASE_URI']
+    replica_uri = app.config.get('DATABASE_REPLICA_URL')
+
+    if _tune_sqlite(app, uri) or not _is_sqlite(uri):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = _engine_options(
+            app, uri, app.config.get('SQLALCHEMY_ENGINE_OPTIONS')
+        )
+
+    if replica_uri:
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        replica_options = {'url': replica_uri}
+        if _tune_sqlite(app, replica_uri) or not _is_sqlite(replica_uri):
+            replica_options.update(_engine_options(app, replica_uri))
+        binds[REPLICA_BIND] = replica_options
+        app.config['SQLALCHEMY_BINDS'] = binds
+
     db.init_app(app)
     with app.app_context():
-        db.create_all()
-        print("✓ Database tables created successfully")
+        if _tune_sqlite(app, uri):
+            _install_sqlite_pragmas(app, db.engine)
+
+        if replica_uri:
+            replica_engine = db.engines[REPLICA_BIND]
+            if _tune_sqlite(app, replica_uri):
+                _install_sqlite_pragmas(app, replica_engine)
+            event.listen(replica_engine, 'handle_error', mark_replica_failed)
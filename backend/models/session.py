@@ -0,0 +1,81 @@
+"""
+Session routing between the primary database and an optional read replica
+
+Views decorated with ``read_only`` send their SELECTs to the ``replica``
+bind (``DATABASE_REPLICA_URL``). Writes, flushes and every other view keep
+using the primary. If the replica errors, it is skipped for
+``REPLICA_RETRY_SECONDS`` and the view is re-run against the primary.
+"""
+
+import time
+from functools import wraps
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select
+
+REPLICA_BIND = 'replica'
+
+_replica_down_until = 0.0
+
+
+def replica_available():
+    """True when a replica is configured and not in its back-off window."""
+    if not has_app_context() or not current_app.config.get('DATABASE_REPLICA_URL'):
+        return False
+    return time.monotonic() >= _replica_down_until
+
+
+def mark_replica_failed(exception_context):
+    """``handle_error`` hook for the replica engine: back off and fall back."""
+    global _replica_down_until
+    retry = current_app.config.get('REPLICA_RETRY_SECONDS', 30) if has_app_context() else 30
+    _replica_down_until = time.monotonic() + retry
+    if has_app_context():
+        g.replica_failed = True
+    print(f"⚠ Read replica error, using primary for {retry}s: {exception_context.original_exception}")
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session that can route reads to the replica bind."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and not self._flushing
+            and has_app_context()
+            and g.get('db_read_only')
+            and (clause is None or isinstance(clause, Select))
+            and replica_available()
+        ):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def read_only(f):
+    """Decorator routing a view's queries to the read replica when available."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not replica_available():
+            return f(*args, **kwargs)
+
+        from models.database import db
+
+        g.db_read_only = True
+        g.replica_failed = False
+        try:
+            response = f(*args, **kwargs)
+        except Exception:
+            if not g.replica_failed:
+                raise
+            response = None
+        finally:
+            g.db_read_only = False
+
+        if g.replica_failed:
+            # Read-only views are safe to repeat against the primary.
+            db.session.rollback()
+            return f(*args, **kwargs)
+        return response
+
+    return decorated_function
@@ -1,8 +1,14 @@
 """Admin portal routes: user management and analytics."""
 
+from datetime import datetime
+
 from flask import jsonify, request
 
-from models.database import User, UserRole, Order, CropListing, VendorProduct, db
+from models.database import User, UserRole, Order, db
+from models.session import read_only
+from services.platform_counters import count_platform, read_counters, user_counter
+from services.export import export_response
+from services.analytics_rollups import METRICS, GRANULARITIES, analytics_refresher, read_timeseries
 from utils.auth import role_required
 
 
@@ -45,33 +51,94 @@ def register_admin_routes(app):
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/admin/orders/export', methods=['GET'])
+    @role_required(UserRole.ADMIN)
+    @read_only
+    def admin_export_orders():
+        """Export all platform orders as CSV/XLSX (?format=csv|xlsx&gzip=1)"""
+        try:
+            query = (
+                db.session.query(
+                    Order.id, Order.created_at, Order.order_type, User.email,
+                    Order.crop_listing_id, Order.vendor_product_id, Order.quantity,
+                    Order.unit_price, Order.total_price, Order.status,
+                    Order.is_contract_farming, Order.delivery_date,
+                )
+                .join(User, Order.buyer_id == User.id)
+                .order_by(Order.id)
+            )
+            header = [
+                'order_id', 'created_at', 'order_type', 'buyer_email', 'crop_listing_id',
+                'vendor_product_id', 'quantity', 'unit_price', 'total_price', 'status',
+                'is_contract_farming', 'delivery_date',
+            ]
+            return export_response(request, header, query, 'orders')
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/admin/analytics', methods=['GET'])
     @role_required(UserRole.ADMIN)
+    @read_only
     def admin_analytics():
         """Get platform analytics"""
         try:
-            total_users = User.query.count()
-            total_farmers = User.query.filter_by(role=UserRole.FARMER).count()
-            total_buyers = User.query.filter_by(role=UserRole.BUYER).count()
-            total_vendors = User.query.filter_by(role=UserRole.VENDOR).count()
-            total_labor = User.query.filter_by(role=UserRole.LABOR).count()
-            total_orders = Order.query.count()
-            total_crops = CropListing.query.count()
-            total_products = VendorProduct.query.count()
+            counters = read_counters() or count_platform()
+            roles = {
+                role: counters.get(user_counter(role), 0) for role in UserRole
+            }
 
             return jsonify({
                 'success': True,
                 'analytics': {
-                    'total_users': total_users,
-                    'farmers': total_farmers,
-                    'buyers': total_buyers,
-                    'vendors': total_vendors,
-                    'labor': total_labor,
-                    'total_orders': total_orders,
-                    'total_crops': total_crops,
-                    'total_products': total_products,
+                    'total_users': sum(roles.values()),
+                    'farmers': roles[UserRole.FARMER],
+                    'buyers': roles[UserRole.BUYER],
+                    'vendors': roles[UserRole.VENDOR],
+                    'labor': roles[UserRole.LABOR],
+                    'total_orders': counters.get('orders', 0),
+                    'total_crops': counters.get('crop_listings', 0),
+                    'total_products': counters.get('vendor_products', 0),
                 },
             })
 
         except Exception as e:
             return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/admin/analytics/timeseries', methods=['GET'])
+    @role_required(UserRole.ADMIN)
+    @read_only
+    def admin_analytics_timeseries():
+        """Get daily or monthly trends from the analytics rollups"""
+        try:
+            metric = request.args.get('metric', 'orders')
+            granularity = request.args.get('granularity', 'day')
+            if metric not in METRICS:
+                return jsonify({'error': f'Invalid metric. Allowed: {sorted(METRICS)}'}), 400
+            if granularity not in GRANULARITIES:
+                return jsonify({'error': f'Invalid granularity. Allowed: {list(GRANULARITIES)}'}), 400
+
+            start = request.args.get('start')
+            end = request.args.get('end')
+            try:
+                start = datetime.strptime(start, '%Y-%m-%d').date() if start else None
+                end = datetime.strptime(end, '%Y-%m-%d').date() if end else None
+            except ValueError:
+                return jsonify({'error': 'Dates must be YYYY-MM-DD'}), 400
+
+            analytics_refresher.ensure_running()
+
+            return jsonify({
+                'success': True,
+                'metric': metric,
+                'granularity': granularity,
+                'series': read_timeseries(
+                    metric, granularity, start, end, request.args.get('dimension')
+                ),
+            })
+
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
@@ -4,15 +4,27 @@ from datetime import datetime
 
 from flask import jsonify, request
 
-from models.database import db, User, CropListing, VendorProduct, Order
+from models.database import db, CropListing, VendorProduct, Order, InventoryHold
+from models.session import read_only
+from services.checkout import (
+    CheckoutError,
+    checkout,
+    place_holds,
+    confirm_holds,
+    release_hold,
+)
+from services.inventory_holds import held_quantities, serialize_hold, ACTIVE
 from utils.auth import login_required, get_current_user
+from utils.rate_limit import rate_limit
 
 
 def register_buyer_routes(app):
     """Register all buyer-related routes on the given Flask app."""
 
     @app.route('/api/buyer/marketplace', methods=['GET'])
+    @rate_limit('search')
     @login_required
+    @read_only
     def buyer_marketplace():
         """Browse marketplace for buyers"""
         try:
@@ -37,10 +49,28 @@ def register_buyer_routes(app):
 
             products = product_query.all()
 
+            # Quantity not reserved by other buyers' active holds
+            crop_held = held_quantities('crop', [crop.id for crop in crops])
+            product_held = held_quantities('vendor_product', [product.id for product in products])
+
+            crop_results = []
+            for crop in crops:
+                crop_dict = crop.to_dict()
+                crop_dict['available_quantity'] = max(crop.quantity - crop_held.get(crop.id, 0), 0)
+                crop_results.append(crop_dict)
+
+            product_results = []
+            for product in products:
+                product_dict = product.to_dict()
+                product_dict['available_quantity'] = max(
+                    product.quantity_available - product_held.get(product.id, 0), 0
+                )
+                product_results.append(product_dict)
+
             return jsonify({
                 'success': True,
-                'crops': [crop.to_dict() for crop in crops],
-                'products': [product.to_dict() for product in products]
+                'crops': crop_results,
+                'products': product_results
             })
 
         except Exception as e:
@@ -61,13 +91,12 @@ def register_buyer_routes(app):
                     .all()
                 )
 
-                print(f"DEBUG: Found {len(orders)} orders for user {current_user['user_id']}")
-
-                results = []
-                for order in orders:
-                    order_dict = {
+                results = [
+                    {
                         'id': order.id,
                         'order_type': order.order_type,
+                        'product_name': order.product_name,
+                        'seller_name': order.seller_name,
                         'quantity': order.quantity,
                         'unit_price': order.unit_price,
                         'total_price': order.total_price,
@@ -77,37 +106,8 @@ def register_buyer_routes(app):
                         'delivery_address': order.delivery_address,
                         'created_at': order.created_at.isoformat(),
                     }
-
-                    try:
-                        if order.order_type == 'crop' and order.crop_listing:
-                            order_dict['product_name'] = order.crop_listing.crop_name
-                            farmer_profile = order.crop_listing.farmer
-                            if farmer_profile:
-                                farmer_user = User.query.get(farmer_profile.user_id)
-                                order_dict['seller_name'] = (
-                                    farmer_user.full_name if farmer_user else 'Unknown Farmer'
-                                )
-                            else:
-                                order_dict['seller_name'] = 'Unknown Farmer'
-                        elif order.order_type == 'vendor_product' and order.vendor_product:
-                            order_dict['product_name'] = order.vendor_product.product_name
-                            vendor_profile = order.vendor_product.vendor
-                            if vendor_profile:
-                                vendor_user = User.query.get(vendor_profile.user_id)
-                                order_dict['seller_name'] = (
-                                    vendor_user.full_name if vendor_user else 'Unknown Vendor'
-                                )
-                            else:
-                                order_dict['seller_name'] = 'Unknown Vendor'
-                    except Exception as e:  # noqa: F841
-                        print(f"DEBUG: Error loading order {order.id} details: {e}")
-                        order_dict['product_name'] = 'Unknown Product'
-                        order_dict['seller_name'] = 'Unknown Seller'
-
-                    print(f"DEBUG: Order {order.id} - {order_dict.get('product_name', 'N/A')}")
-                    results.append(order_dict)
-
-                print(f"DEBUG: Returning {len(results)} orders")
+                    for order in orders
+                ]
                 return jsonify({'success': True, 'orders': results})
 
             # POST: create order(s)
@@ -115,113 +115,108 @@ def register_buyer_routes(app):
 
             # Support cart-based payload from frontend as well as legacy single-item payload
             if 'items' in data:
-                if not isinstance(data['items'], list) or not data['items']:
-                    return jsonify({'error': 'Items list is required'}), 400
-
-                created_orders = []
-
-                for item in data['items']:
-                    item_type = item.get('type')
-                    item_id = item.get('id')
-                    quantity = float(item.get('quantity', 0))
-                    if not item_type or not item_id or quantity <= 0:
-                        return jsonify({'error': 'Invalid item in cart'}), 400
-
-                    if item_type == 'crop':
-                        crop = CropListing.query.get(item_id)
-                        if not crop:
-                            return jsonify({'error': 'Crop listing not found'}), 404
-                        if crop.quantity < quantity:
-                            return jsonify({'error': 'Insufficient quantity available for crop'}), 400
-                        unit_price = float(crop.price_per_unit)
-                        crop.quantity -= quantity
-                        order_type = 'crop'
-                        crop_listing_id = crop.id
-                        vendor_product_id = None
-                    else:
-                        product = VendorProduct.query.get(item_id)
-                        if not product:
-                            return jsonify({'error': 'Vendor product not found'}), 404
-                        if product.quantity_available < quantity:
-                            return jsonify({'error': 'Insufficient quantity available for product'}), 400
-                        unit_price = float(product.price_per_unit)
-                        product.quantity_available -= quantity
-                        order_type = 'vendor_product'
-                        crop_listing_id = None
-                        vendor_product_id = product.id
-
-                    total_price = unit_price * quantity
-
-                    order = Order(
-                        buyer_id=current_user['user_id'],
-                        order_type=order_type,
-                        crop_listing_id=crop_listing_id,
-                        vendor_product_id=vendor_product_id,
-                        quantity=quantity,
-                        unit_price=unit_price,
-                        total_price=total_price,
-                        is_contract_farming=data.get('is_contract_farming', False),
-                        delivery_date=None,
-                        delivery_address=data.get('delivery_address'),
-                        notes=data.get('notes'),
-                    )
-                    db.session.add(order)
-                    created_orders.append(order)
-
-                db.session.commit()
+                try:
+                    order_ids = checkout(current_user['user_id'], data['items'], data)
+                except CheckoutError as e:
+                    return jsonify({'error': str(e)}), e.status_code
 
                 return jsonify({
                     'success': True,
                     'message': 'Order(s) placed successfully',
-                    'order_ids': [o.id for o in created_orders],
+                    'order_ids': order_ids,
                 }), 201
 
-            # Legacy single-item payload (used by scripts/tests)
-            if not all(k in data for k in ['order_type', 'quantity', 'unit_price']):
+            # Legacy single-item payload (used by scripts/tests): checked out as a
+            # one-line cart, so it takes stock atomically, respects holds and is
+            # priced from the listing rather than the client's unit_price.
+            if not all(k in data for k in ['order_type', 'quantity']):
                 return jsonify({'error': 'Missing required order fields'}), 400
+            if data['order_type'] not in ('crop', 'vendor_product'):
+                return jsonify({'error': 'Invalid order type'}), 400
 
-            total_price = float(data['quantity']) * float(data['unit_price'])
-            order_quantity = float(data['quantity'])
-
-            # Check and update product quantities
-            if data['order_type'] == 'crop':
-                crop = CropListing.query.get(data.get('crop_listing_id'))
-                if crop:
-                    if crop.quantity < order_quantity:
-                        return jsonify({'error': 'Insufficient quantity available'}), 400
-                    crop.quantity -= order_quantity
-            elif data['order_type'] == 'vendor_product':
-                product = VendorProduct.query.get(data.get('vendor_product_id'))
-                if product:
-                    if product.quantity_available < order_quantity:
-                        return jsonify({'error': 'Insufficient quantity available'}), 400
-                    product.quantity_available -= order_quantity
-
-            order = Order(
-                buyer_id=current_user['user_id'],
-                order_type=data['order_type'],
-                crop_listing_id=data.get('crop_listing_id'),
-                vendor_product_id=data.get('vendor_product_id'),
-                quantity=order_quantity,
-                unit_price=float(data['unit_price']),
-                total_price=total_price,
-                is_contract_farming=data.get('is_contract_farming', False),
-                delivery_date=datetime.strptime(data['delivery_date'], '%Y-%m-%d').date()
-                if data.get('delivery_date')
-                else None,
-                delivery_address=data.get('delivery_address'),
-                notes=data.get('notes'),
-            )
-
-            db.session.add(order)
-            db.session.commit()
+            item_id = data.get('crop_listing_id' if data['order_type'] == 'crop' else 'vendor_product_id')
+            item = {'type': data['order_type'], 'id': item_id, 'quantity': data['quantity']}
+            try:
+                order_ids = checkout(current_user['user_id'], [item], data)
+            except CheckoutError as e:
+                return jsonify({'error': str(e)}), e.status_code
 
             return jsonify({
                 'success': True,
                 'message': 'Order placed successfully',
-                'order_id': order.id,
+                'order_id': order_ids[0],
+            }), 201
+
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/buyer/holds', methods=['GET', 'POST'])
+    @login_required
+    def buyer_holds():
+        """List active holds or reserve stock for cart items"""
+        try:
+            current_user = get_current_user()
+
+            if request.method == 'GET':
+                holds = (
+                    InventoryHold.query
+                    .filter_by(buyer_id=current_user['user_id'], status=ACTIVE)
+                    .filter(InventoryHold.expires_at > datetime.utcnow())
+                    .order_by(InventoryHold.id)
+                    .all()
+                )
+                return jsonify({'success': True, 'holds': [serialize_hold(h) for h in holds]})
+
+            data = request.json or {}
+            try:
+                holds = place_holds(current_user['user_id'], data.get('items'))
+            except CheckoutError as e:
+                return jsonify({'error': str(e)}), e.status_code
+
+            return jsonify({
+                'success': True,
+                'message': 'Items reserved',
+                'holds': [serialize_hold(h) for h in holds],
             }), 201
 
         except Exception as e:
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/buyer/holds/checkout', methods=['POST'])
+    @login_required
+    def buyer_checkout_holds():
+        """Place orders for previously reserved items"""
+        try:
+            current_user = get_current_user()
+            data = request.json or {}
+
+            try:
+                order_ids = confirm_holds(current_user['user_id'], data.get('hold_ids'), data)
+            except CheckoutError as e:
+                return jsonify({'error': str(e)}), e.status_code
+
+            return jsonify({
+                'success': True,
+                'message': 'Order(s) placed successfully',
+                'order_ids': order_ids,
+            }), 201
+
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/buyer/holds/<int:hold_id>', methods=['DELETE'])
+    @login_required
+    def buyer_release_hold(hold_id):
+        """Release a reservation before it expires"""
+        try:
+            current_user = get_current_user()
+            if not release_hold(current_user['user_id'], hold_id):
+                return jsonify({'error': 'Active hold not found'}), 404
+            return jsonify({'success': True, 'message': 'Hold released'})
+
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
@@ -1,10 +1,8 @@
 """Farmer portal routes: recommendations, listings, costs, labor, equipment, weather, orders."""
 
-import json
-import os
 from datetime import datetime
+from types import SimpleNamespace
 
-import requests
 from flask import jsonify, request
 
 from models.database import (
@@ -14,64 +12,146 @@ from models.database import (
     CropListing,
     CostRecord,
     LaborHiring,
+    LaborAssignment,
+    LaborProfile,
     Equipment,
     RecommendationHistory,
+    RecommendationDailyRollup,
     Order,
     OrderStatus,
+    ORDER_STATUS_TRANSITIONS,
 )
-from utils.auth import role_required, get_current_user
+from models.session import read_only
+from utils.auth import role_required, get_current_principal
+from utils.rate_limit import rate_limit
 import services.ml_models as ml_models
+import services.weather as weather_service
+import services.cost_summary as cost_summary
+import services.bulk_import as bulk_import
+import services.equipment_rentals as equipment_rentals
+import services.equipment_marketplace as equipment_marketplace
+from services.equipment_marketplace import MarketplaceQueryError
+from services.platform_counters import adjust_counter
+from services.export import export_response
+from services.order_events import order_events
+from services.history_writer import history_writer
+from services.labor_matching import posting_candidates
+from services.labor_assignments import AssignmentError, set_laborers_needed
+from services.labor_board import farmer_postings, BoardQueryError
+from services.recommendation_history import (
+    INPUT_COLUMNS,
+    serialize_history,
+    serialize_rollup,
+)
 
-# Weather API configuration (kept close to weather endpoint)
-WEATHER_API_KEY = os.environ.get('WEATHER_API_KEY', 'your-api-key')
-WEATHER_API_URL = 'https://api.openweathermap.org/data/2.5/weather'
+CLIMATE_FIELDS = ['temperature', 'humidity', 'rainfall']
+
+
+def crop_listing_fields(data):
+    """Validated CropListing column values from a request/import record."""
+    return {
+        'crop_name': data['crop_name'],
+        'category': data.get('category', 'others'),
+        'quantity': float(data['quantity']),
+        'unit': data.get('unit', 'kg'),
+        'price_per_unit': float(data['price_per_unit']),
+        'location': data.get('location'),
+        'description': data.get('description'),
+        'image_url': data.get('image_url'),
+        'harvest_date': datetime.strptime(data['harvest_date'], '%Y-%m-%d').date() if data.get('harvest_date') else None
+    }
+
+
+def cost_record_fields(data):
+    """Validated CostRecord column values, including derived totals."""
+    costs = {
+        f'{field}_cost': float(data.get(f'{field}_cost', 0))
+        for field in cost_summary.COST_FIELDS
+    }
+    total_cost = sum(costs.values())
+    revenue = float(data.get('revenue', 0))
+
+    return dict(
+        costs,
+        crop_name=data['crop_name'],
+        season=data.get('season'),
+        year=int(data['year']),
+        total_cost=total_cost,
+        revenue=revenue,
+        profit_loss=revenue - total_cost,
+        notes=data.get('notes')
+    )
 
 
 def register_farmer_routes(app):
     """Register all farmer-related routes on the given Flask app."""
 
     @app.route('/api/farmer/crop-recommendation', methods=['POST'])
+    @rate_limit('recommendation')
     @role_required(UserRole.FARMER)
     def farmer_crop_recommendation():
-        """Get crop recommendation for farmer"""
+        """Get crop recommendation for farmer.
+
+        Climate fields (temperature, humidity, rainfall) may be omitted; they
+        are then filled from the cached weather for ``location`` or, failing
+        that, the farmer's registered farm location.
+        """
         try:
             ml_models.load_models()
             data = request.json
 
-            required_fields = ['N', 'P', 'K', 'temperature', 'humidity', 'pH', 'rainfall']
+            required_fields = ['N', 'P', 'K', 'pH']
             if not all(field in data for field in required_fields):
                 return jsonify({'error': 'Missing required fields'}), 400
 
             if ml_models.crop_model is None:
                 return jsonify({'error': 'Crop model not loaded'}), 500
 
+            user = get_current_principal()
+
+            inputs = dict(data)
+            missing_climate = [field for field in CLIMATE_FIELDS if data.get(field) is None]
+            if missing_climate:
+                location = data.get('location') or (
+                    user.farmer_profile.farm_location if user.farmer_profile else None
+                )
+                if not location:
+                    return jsonify({'error': 'Location required to fill climate fields'}), 400
+
+                climate = weather_service.get_climate_features(location)
+                if climate is None:
+                    return jsonify({'error': 'Weather data not available'}), 502
+
+                for field in missing_climate:
+                    inputs[field] = climate[field]
+
             features = [
-                float(data['N']), float(data['P']), float(data['K']),
-                float(data['temperature']), float(data['humidity']),
-                float(data['pH']), float(data['rainfall'])
+                float(inputs['N']), float(inputs['P']), float(inputs['K']),
+                float(inputs['temperature']), float(inputs['humidity']),
+                float(inputs['pH']), float(inputs['rainfall'])
             ]
 
             recommendation = ml_models.crop_model.predict(features)
 
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
-
             if user.farmer_profile:
-                history = RecommendationHistory(
+                history_writer.enqueue(
                     farmer_id=user.farmer_profile.id,
                     recommendation_type='crop',
-                    input_parameters=json.dumps(data),
-                    recommendation_result=json.dumps(recommendation)
+                    inputs=inputs,
+                    result=recommendation
                 )
-                db.session.add(history)
-                db.session.commit()
 
-            return jsonify({'success': True, 'recommendation': recommendation})
+            return jsonify({
+                'success': True,
+                'recommendation': recommendation,
+                'inputs': {field: inputs[field] for field in CLIMATE_FIELDS},
+            })
 
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
     @app.route('/api/farmer/fertilizer-recommendation', methods=['POST'])
+    @rate_limit('recommendation')
     @role_required(UserRole.FARMER)
     def farmer_fertilizer_recommendation():
         """Get fertilizer recommendation for farmer"""
@@ -94,18 +174,15 @@ def register_farmer_routes(app):
                 'K': float(data['K']),
             })
 
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if user.farmer_profile:
-                history = RecommendationHistory(
+                history_writer.enqueue(
                     farmer_id=user.farmer_profile.id,
                     recommendation_type='fertilizer',
-                    input_parameters=json.dumps(data),
-                    recommendation_result=json.dumps(recommendation)
+                    inputs=data,
+                    result=recommendation
                 )
-                db.session.add(history)
-                db.session.commit()
 
             return jsonify({'success': True, 'recommendation': recommendation})
 
@@ -117,27 +194,53 @@ def register_farmer_routes(app):
     def get_recommendation_history():
         """Get farmer's recommendation history"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
 
-            history = RecommendationHistory.query.filter_by(
-                farmer_id=user.farmer_profile.id
-            ).order_by(RecommendationHistory.created_at.desc()).limit(50).all()
+            compact = request.args.get('compact') == '1'
+            columns = [
+                RecommendationHistory.id,
+                RecommendationHistory.recommendation_type,
+                RecommendationHistory.top_result,
+                RecommendationHistory.confidence_score,
+                RecommendationHistory.created_at,
+            ] + [getattr(RecommendationHistory, column) for column in INPUT_COLUMNS.values()]
+            if not compact:
+                columns.append(RecommendationHistory.payload)
+
+            history = (
+                db.session.query(*columns)
+                .filter(RecommendationHistory.farmer_id == user.farmer_profile.id)
+                .order_by(RecommendationHistory.created_at.desc())
+                .limit(50)
+                .all()
+            )
 
-            results = []
-            for record in history:
-                results.append({
-                    'id': record.id,
-                    'type': record.recommendation_type,
-                    'input': json.loads(record.input_parameters),
-                    'result': json.loads(record.recommendation_result),
-                    'date': record.created_at.isoformat()
-                })
+            # Recommendations still in this worker's write-behind buffer come
+            # first; rows buffered by other workers appear after their next flush.
+            pending = [
+                SimpleNamespace(id=None, **row)
+                for row in reversed(history_writer.pending_rows(user.farmer_profile.id))
+            ]
+            history = (pending + history)[:50]
+
+            results = [serialize_history(record, compact=compact) for record in history]
 
-            return jsonify({'success': True, 'history': results})
+            response = {'success': True, 'history': results}
+
+            if request.args.get('summaries') == '1':
+                rollups = (
+                    RecommendationDailyRollup.query
+                    .filter_by(farmer_id=user.farmer_profile.id)
+                    .order_by(RecommendationDailyRollup.day.desc())
+                    .limit(90)
+                    .all()
+                )
+                response['daily_summaries'] = [serialize_rollup(r) for r in rollups]
+
+            return jsonify(response)
 
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -147,8 +250,7 @@ def register_farmer_routes(app):
     def farmer_crop_listings():
         """Get or create farmer's crop listings"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
@@ -170,15 +272,7 @@ def register_farmer_routes(app):
 
             listing = CropListing(
                 farmer_id=user.farmer_profile.id,
-                crop_name=data['crop_name'],
-                category=data.get('category', 'others'),
-                quantity=float(data['quantity']),
-                unit=data.get('unit', 'kg'),
-                price_per_unit=float(data['price_per_unit']),
-                location=data.get('location'),
-                description=data.get('description'),
-                image_url=data.get('image_url'),
-                harvest_date=datetime.strptime(data['harvest_date'], '%Y-%m-%d').date() if data.get('harvest_date') else None
+                **crop_listing_fields(data)
             )
 
             db.session.add(listing)
@@ -194,13 +288,68 @@ def register_farmer_routes(app):
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/farmer/crop-listings/import', methods=['POST'])
+    @role_required(UserRole.FARMER)
+    def farmer_import_crop_listings():
+        """Bulk import crop listings from CSV or NDJSON"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            farmer_id = user.farmer_profile.id
+            result = bulk_import.import_records(
+                bulk_import.iter_records(request),
+                CropListing,
+                lambda record: dict(crop_listing_fields(record), farmer_id=farmer_id),
+                on_chunk=lambda conn, count: adjust_counter(conn, 'crop_listings', count),
+            )
+            return jsonify(result)
+
+        except bulk_import.ImportFormatError as e:
+            return jsonify({'error': str(e)}), 415
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/crop-listings/export', methods=['GET'])
+    @role_required(UserRole.FARMER)
+    def farmer_export_crop_listings():
+        """Export crop listings as CSV/XLSX (?format=csv|xlsx&gzip=1)"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            query = (
+                db.session.query(
+                    CropListing.id, CropListing.created_at, CropListing.crop_name,
+                    CropListing.category, CropListing.quantity, CropListing.unit,
+                    CropListing.price_per_unit, CropListing.location,
+                    CropListing.harvest_date, CropListing.is_available,
+                )
+                .filter(CropListing.farmer_id == user.farmer_profile.id)
+                .order_by(CropListing.created_at.desc())
+            )
+            header = [
+                'listing_id', 'created_at', 'crop_name', 'category', 'quantity', 'unit',
+                'price_per_unit', 'location', 'harvest_date', 'is_available',
+            ]
+            return export_response(request, header, query, 'crop_listings')
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/farmer/crop-listings/<int:listing_id>', methods=['PUT', 'DELETE'])
     @role_required(UserRole.FARMER)
     def manage_crop_listing(listing_id):
         """Update or delete crop listing"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             listing = CropListing.query.get(listing_id)
             if not listing or listing.farmer_id != user.farmer_profile.id:
@@ -235,8 +384,7 @@ def register_farmer_routes(app):
     def farmer_costs():
         """Get or create cost records"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
@@ -272,35 +420,9 @@ def register_farmer_routes(app):
 
             data = request.json
 
-            total_cost = (
-                float(data.get('seed_cost', 0)) +
-                float(data.get('fertilizer_cost', 0)) +
-                float(data.get('pesticide_cost', 0)) +
-                float(data.get('labor_cost', 0)) +
-                float(data.get('equipment_cost', 0)) +
-                float(data.get('irrigation_cost', 0)) +
-                float(data.get('other_cost', 0))
-            )
-
-            revenue = float(data.get('revenue', 0))
-            profit_loss = revenue - total_cost
-
             record = CostRecord(
                 farmer_id=user.farmer_profile.id,
-                crop_name=data['crop_name'],
-                season=data.get('season'),
-                year=int(data['year']),
-                seed_cost=float(data.get('seed_cost', 0)),
-                fertilizer_cost=float(data.get('fertilizer_cost', 0)),
-                pesticide_cost=float(data.get('pesticide_cost', 0)),
-                labor_cost=float(data.get('labor_cost', 0)),
-                equipment_cost=float(data.get('equipment_cost', 0)),
-                irrigation_cost=float(data.get('irrigation_cost', 0)),
-                other_cost=float(data.get('other_cost', 0)),
-                total_cost=total_cost,
-                revenue=revenue,
-                profit_loss=profit_loss,
-                notes=data.get('notes')
+                **cost_record_fields(data)
             )
 
             db.session.add(record)
@@ -316,43 +438,93 @@ def register_farmer_routes(app):
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/farmer/costs/import', methods=['POST'])
+    @role_required(UserRole.FARMER)
+    def farmer_import_costs():
+        """Bulk import cost records from CSV or NDJSON"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            farmer_id = user.farmer_profile.id
+            result = bulk_import.import_records(
+                bulk_import.iter_records(request),
+                CostRecord,
+                lambda record: dict(cost_record_fields(record), farmer_id=farmer_id),
+                on_chunk=lambda connection, inserted: cost_summary.bump_version(connection, farmer_id),
+            )
+            return jsonify(result)
+
+        except bulk_import.ImportFormatError as e:
+            return jsonify({'error': str(e)}), 415
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/costs/export', methods=['GET'])
+    @role_required(UserRole.FARMER)
+    def farmer_export_costs():
+        """Export cost records as CSV/XLSX (?format=csv|xlsx&gzip=1)"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            cost_columns = [f'{field}_cost' for field in cost_summary.COST_FIELDS]
+            query = (
+                db.session.query(
+                    CostRecord.id, CostRecord.crop_name, CostRecord.season, CostRecord.year,
+                    *[getattr(CostRecord, column) for column in cost_columns],
+                    CostRecord.total_cost, CostRecord.revenue, CostRecord.profit_loss,
+                    CostRecord.notes,
+                )
+                .filter(CostRecord.farmer_id == user.farmer_profile.id)
+                .order_by(CostRecord.year.desc(), CostRecord.created_at.desc())
+            )
+            header = (
+                ['record_id', 'crop_name', 'season', 'year'] + cost_columns
+                + ['total_cost', 'revenue', 'profit_loss', 'notes']
+            )
+            return export_response(request, header, query, 'cost_records')
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/costs/summary', methods=['GET'])
+    @role_required(UserRole.FARMER)
+    def farmer_costs_summary():
+        """Get per-crop, per-season and per-year cost/profit analytics"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            summary = cost_summary.get_summary(user.farmer_profile)
+            return jsonify({'success': True, 'summary': summary})
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/farmer/labor-postings', methods=['GET', 'POST'])
     @role_required(UserRole.FARMER)
     def farmer_labor_postings():
         """Get or create labor hiring postings"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
 
             if request.method == 'GET':
-                postings = LaborHiring.query.filter_by(
-                    farmer_id=user.farmer_profile.id
-                ).order_by(LaborHiring.created_at.desc()).all()
-
-                results = []
-                for posting in postings:
-                    labor_user = User.query.get(posting.labor.user_id) if posting.labor else None
-                    results.append({
-                        'id': posting.id,
-                        'job_title': posting.job_title,
-                        'description': posting.description,
-                        'work_type': posting.work_type,
-                        'start_date': posting.start_date.isoformat(),
-                        'end_date': posting.end_date.isoformat() if posting.end_date else None,
-                        'total_days': posting.total_days,
-                        'wage_per_day': posting.daily_wage,
-                        'total_wage': posting.total_wage,
-                        'status': posting.status,
-                        'location': posting.location,
-                        'laborers_needed': posting.laborers_needed,
-                        'labor_name': labor_user.full_name if labor_user else None,
-                        'labor_phone': labor_user.phone if labor_user else None
-                    })
+                postings, next_cursor = farmer_postings(user.farmer_profile.id, request.args)
 
-                return jsonify({'success': True, 'postings': results})
+                return jsonify({'success': True, 'postings': postings, 'next_cursor': next_cursor})
 
             data = request.json
 
@@ -361,9 +533,19 @@ def register_farmer_routes(app):
 
             total_days = (end_date - start_date).days + 1 if end_date else None
 
+            try:
+                laborers_needed = int(data.get('laborers_needed', 1))
+                labor_id = int(data['labor_id']) if data.get('labor_id') else None
+            except (TypeError, ValueError):
+                return jsonify({'error': 'laborers_needed and labor_id must be integers'}), 400
+            if laborers_needed < 1:
+                return jsonify({'error': 'laborers_needed must be at least 1'}), 400
+            if labor_id is not None and LaborProfile.query.get(labor_id) is None:
+                return jsonify({'error': 'Labor profile not found'}), 404
+
             posting = LaborHiring(
                 farmer_id=user.farmer_profile.id,
-                labor_id=data.get('labor_id'),
+                labor_id=labor_id,
                 job_title=data['job_title'],
                 description=data.get('description'),
                 work_type=data.get('work_type'),
@@ -373,9 +555,13 @@ def register_farmer_routes(app):
                 daily_wage=float(data['wage_per_day']) if data.get('wage_per_day') else None,
                 total_wage=float(data['total_wage']) if data.get('total_wage') else None,
                 location=data.get('location'),
-                laborers_needed=int(data.get('laborers_needed', 1)),
+                laborers_needed=laborers_needed,
                 status='open'
             )
+            if posting.labor_id:
+                # Hired directly: the worker takes the first slot.
+                posting.laborers_filled = 1
+                posting.assignments.append(LaborAssignment(labor_id=posting.labor_id))
 
             db.session.add(posting)
             db.session.commit()
@@ -386,6 +572,8 @@ def register_farmer_routes(app):
                 'posting_id': posting.id
             }), 201
 
+        except BoardQueryError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
@@ -395,8 +583,7 @@ def register_farmer_routes(app):
     def manage_labor_posting(posting_id):
         """Update an existing labor posting (details or status)."""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
@@ -428,7 +615,13 @@ def register_farmer_routes(app):
             if 'location' in data:
                 posting.location = data['location']
             if 'laborers_needed' in data:
-                posting.laborers_needed = int(data['laborers_needed'])
+                try:
+                    laborers_needed = int(data['laborers_needed'])
+                except (TypeError, ValueError):
+                    return jsonify({'error': 'laborers_needed must be an integer'}), 400
+                if laborers_needed < 1:
+                    return jsonify({'error': 'laborers_needed must be at least 1'}), 400
+                set_laborers_needed(posting.id, laborers_needed)
             if 'status' in data:
                 if data['status'] in ['open', 'active', 'completed', 'cancelled']:
                     posting.status = data['status']
@@ -451,23 +644,48 @@ def register_farmer_routes(app):
                 'status': posting.status,
                 'location': posting.location,
                 'laborers_needed': posting.laborers_needed,
+                'laborers_filled': posting.laborers_filled,
                 'labor_name': labor_user.full_name if labor_user else None,
                 'labor_phone': labor_user.phone if labor_user else None
             }
 
             return jsonify({'success': True, 'posting': result})
 
+        except AssignmentError as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), e.status_code
         except Exception as e:
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/farmer/labor-postings/<int:posting_id>/candidates', methods=['GET'])
+    @role_required(UserRole.FARMER)
+    def labor_posting_candidates(posting_id):
+        """Rank available workers for a labor posting"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            posting = LaborHiring.query.get(posting_id)
+            if not posting or posting.farmer_id != user.farmer_profile.id:
+                return jsonify({'error': 'Labor posting not found'}), 404
+
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+            candidates = posting_candidates(posting, limit)
+
+            return jsonify({'success': True, 'candidates': candidates})
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/farmer/equipment', methods=['GET', 'POST'])
     @role_required(UserRole.FARMER)
     def farmer_equipment():
         """Get or create equipment"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
@@ -518,6 +736,152 @@ def register_farmer_routes(app):
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/farmer/equipment/marketplace', methods=['GET'])
+    @rate_limit('search')
+    @role_required(UserRole.FARMER)
+    @read_only
+    def search_equipment_marketplace():
+        """Search other farmers' equipment by type, price, dates and distance"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            try:
+                equipment, next_cursor = equipment_marketplace.search(
+                    user.farmer_profile, request.args
+                )
+            except MarketplaceQueryError as e:
+                return jsonify({'error': str(e)}), 400
+
+            return jsonify({'success': True, 'equipment': equipment, 'next_cursor': next_cursor})
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/equipment/search', methods=['GET'])
+    @rate_limit('search')
+    @role_required(UserRole.FARMER)
+    @read_only
+    def search_rental_equipment():
+        """Find other farmers' equipment that is free to rent for a date range"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+            if not request.args.get('start_date'):
+                return jsonify({'error': 'start_date is required'}), 400
+
+            try:
+                equipment, next_cursor = equipment_marketplace.search(
+                    user.farmer_profile, request.args
+                )
+            except MarketplaceQueryError as e:
+                return jsonify({'error': str(e)}), 400
+
+            return jsonify({'success': True, 'equipment': equipment, 'next_cursor': next_cursor})
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/equipment/<int:equipment_id>/availability', methods=['GET'])
+    @role_required(UserRole.FARMER)
+    def equipment_availability(equipment_id):
+        """Booked dates of a machine, and whether a date range is free"""
+        try:
+            equipment = Equipment.query.get(equipment_id)
+            if not equipment:
+                return jsonify({'error': 'Equipment not found'}), 404
+
+            result = {'success': True, 'equipment_id': equipment_id}
+            if request.args.get('start_date'):
+                try:
+                    start, end = equipment_rentals.parse_range(
+                        request.args.get('start_date'), request.args.get('end_date')
+                    )
+                except equipment_rentals.RentalError as e:
+                    return jsonify({'error': str(e)}), e.status_code
+                result['booked'] = equipment_rentals.booked_ranges(equipment_id, start, end)
+                result['available'] = bool(equipment.is_available_for_rent) and not result['booked']
+            else:
+                result['booked'] = equipment_rentals.booked_ranges(equipment_id)
+
+            return jsonify(result)
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/equipment/<int:equipment_id>/rentals', methods=['POST'])
+    @role_required(UserRole.FARMER)
+    def rent_equipment(equipment_id):
+        """Book another farmer's equipment for a date range"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            data = request.json or {}
+            try:
+                start, end = equipment_rentals.parse_range(data.get('start_date'), data.get('end_date'))
+                rental = equipment_rentals.book(equipment_id, user.farmer_profile.id, start, end)
+            except equipment_rentals.RentalError as e:
+                return jsonify({'error': str(e)}), e.status_code
+
+            return jsonify({
+                'success': True,
+                'message': 'Rental requested',
+                'rental': equipment_rentals.serialize_rental(rental)
+            }), 201
+
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/rentals', methods=['GET'])
+    @role_required(UserRole.FARMER)
+    def farmer_rentals():
+        """Rentals made by the farmer and bookings of the farmer's equipment"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            rentals, bookings = equipment_rentals.list_rentals(user.farmer_profile.id)
+
+            return jsonify({'success': True, 'rentals': rentals, 'bookings': bookings})
+
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/farmer/rentals/<int:rental_id>', methods=['PUT'])
+    @role_required(UserRole.FARMER)
+    def update_rental(rental_id):
+        """Confirm, complete or cancel a rental"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            data = request.json or {}
+            try:
+                rental = equipment_rentals.update_status(
+                    rental_id, user.farmer_profile.id, data.get('status')
+                )
+            except equipment_rentals.RentalError as e:
+                db.session.rollback()
+                return jsonify({'error': str(e)}), e.status_code
+
+            return jsonify({'success': True, 'rental': equipment_rentals.serialize_rental(rental)})
+
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/farmer/weather', methods=['GET'])
     @role_required(UserRole.FARMER)
     def get_weather():
@@ -527,39 +891,11 @@ def register_farmer_routes(app):
             if not location:
                 return jsonify({'error': 'Location parameter required'}), 400
 
-            if WEATHER_API_KEY == 'your-api-key' or not WEATHER_API_KEY:
-                return jsonify({
-                    'success': True,
-                    'weather': {
-                        'temperature': 25.0,
-                        'humidity': 65,
-                        'description': 'Clear sky (demo data)',
-                        'wind_speed': 3.5,
-                        'pressure': 1013
-                    }
-                })
+            weather = weather_service.get_weather(location)
+            if weather is None:
+                return jsonify({'error': 'Weather data not available'}), 500
 
-            params = {
-                'q': location,
-                'appid': WEATHER_API_KEY,
-                'units': 'metric'
-            }
-
-            response = requests.get(WEATHER_API_URL, params=params, timeout=5)
-
-            if response.status_code == 200:
-                weather_data = response.json()
-                return jsonify({
-                    'success': True,
-                    'weather': {
-                        'temperature': weather_data['main']['temp'],
-                        'humidity': weather_data['main']['humidity'],
-                        'description': weather_data['weather'][0]['description'],
-                        'wind_speed': weather_data['wind']['speed'],
-                        'pressure': weather_data['main']['pressure']
-                    }
-                })
-            return jsonify({'error': 'Weather data not available'}), 500
+            return jsonify({'success': True, 'weather': weather})
 
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -569,33 +905,27 @@ def register_farmer_routes(app):
     def farmer_orders():
         """Get orders for this farmer's crop listings and allow them to track status."""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
 
             orders = (
                 Order.query
-                .join(CropListing, Order.crop_listing_id == CropListing.id)
-                .filter(
-                    Order.order_type == 'crop',
-                    CropListing.farmer_id == user.farmer_profile.id
-                )
+                .filter(Order.seller_id == user.id, Order.order_type == 'crop')
                 .order_by(Order.created_at.desc())
                 .all()
             )
 
             results = []
             for order in orders:
-                buyer = User.query.get(order.buyer_id)
                 results.append({
                     'id': order.id,
                     'order_type': order.order_type,
                     'crop_listing_id': order.crop_listing_id,
-                    'product_name': order.crop_listing.crop_name if order.crop_listing else None,
-                    'buyer_name': buyer.full_name if buyer else 'Unknown',
-                    'buyer_email': buyer.email if buyer else None,
+                    'product_name': order.product_name,
+                    'buyer_name': order.buyer_name or 'Unknown',
+                    'buyer_email': order.buyer_email,
                     'quantity': order.quantity,
                     'unit_price': order.unit_price,
                     'total_price': order.total_price,
@@ -609,13 +939,42 @@ def register_farmer_routes(app):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/farmer/orders/export', methods=['GET'])
+    @role_required(UserRole.FARMER)
+    def farmer_export_orders():
+        """Export orders for this farmer's listings as CSV/XLSX"""
+        try:
+            user = get_current_principal()
+
+            if not user.farmer_profile:
+                return jsonify({'error': 'Farmer profile not found'}), 404
+
+            query = (
+                db.session.query(
+                    Order.id, Order.created_at, Order.product_name,
+                    Order.buyer_name, Order.buyer_email, Order.quantity, Order.unit_price,
+                    Order.total_price, Order.status, Order.delivery_date,
+                )
+                .filter(Order.seller_id == user.id, Order.order_type == 'crop')
+                .order_by(Order.created_at.desc())
+            )
+            header = [
+                'order_id', 'created_at', 'product_name', 'buyer_name', 'buyer_email',
+                'quantity', 'unit_price', 'total_price', 'status', 'delivery_date',
+            ]
+            return export_response(request, header, query, 'farmer_orders')
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/farmer/orders/<int:order_id>/status', methods=['PUT'])
     @role_required(UserRole.FARMER)
     def update_farmer_order_status(order_id):
         """Allow farmer to update the status of an order for their crop listing."""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.farmer_profile:
                 return jsonify({'error': 'Farmer profile not found'}), 404
@@ -633,11 +992,18 @@ def register_farmer_routes(app):
                 return jsonify({'error': 'Status is required'}), 400
 
             try:
-                order.status = OrderStatus(new_status)
+                new_status = OrderStatus(new_status)
             except ValueError:
                 return jsonify({'error': 'Invalid status value'}), 400
+            if new_status not in ORDER_STATUS_TRANSITIONS[order.status]:
+                return jsonify({
+                    'error': f'Cannot change a {order.status.value} order to {new_status.value}'
+                }), 409
+
+            order.status = new_status
 
             db.session.commit()
+            order_events.publish_status_change(order)
 
             return jsonify({
                 'success': True,
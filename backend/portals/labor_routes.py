@@ -1,9 +1,12 @@
 """Labor portal routes: job postings and applications."""
 
-from flask import jsonify
+from flask import jsonify, request
 
-from models.database import db, User, UserRole, LaborHiring
-from utils.auth import role_required, get_current_user
+from models.database import db, UserRole
+from utils.auth import role_required, get_current_principal
+from services.labor_matching import recommended_jobs
+from services.labor_board import open_postings, labor_jobs, labor_earnings, BoardQueryError
+from services.labor_assignments import AssignmentError, claim_slot
 
 
 def register_labor_routes(app):
@@ -12,35 +15,31 @@ def register_labor_routes(app):
     @app.route('/api/labor/job-postings', methods=['GET'])
     @role_required(UserRole.LABOR)
     def labor_job_postings():
-        """Get available job postings for labor"""
+        """Get available job postings for labor (filtered, keyset paginated)"""
         try:
-            postings = (
-                LaborHiring.query
-                .filter_by(status='open')
-                .order_by(LaborHiring.created_at.desc())
-                .all()
-            )
-
-            results = []
-            for posting in postings:
-                farmer_user = User.query.get(posting.farmer.user_id)
-                results.append({
-                    'id': posting.id,
-                    'farmer_name': farmer_user.full_name if farmer_user else 'Unknown',
-                    'farmer_location': posting.farmer.farm_location,
-                    'job_title': posting.job_title,
-                    'description': posting.description,
-                    'work_type': posting.work_type,
-                    'start_date': posting.start_date.isoformat(),
-                    'end_date': posting.end_date.isoformat() if posting.end_date else None,
-                    'wage_per_day': posting.daily_wage,
-                    'total_wage': posting.total_wage,
-                    'location': posting.location,
-                    'laborers_needed': posting.laborers_needed,
-                    'total_days': posting.total_days,
-                })
-
-            return jsonify({'success': True, 'postings': results})
+            postings, next_cursor = open_postings(request.args)
+
+            return jsonify({'success': True, 'postings': postings, 'next_cursor': next_cursor})
+
+        except BoardQueryError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/labor/recommended-jobs', methods=['GET'])
+    @role_required(UserRole.LABOR)
+    def labor_recommended_jobs():
+        """Open job postings ranked by skills, wage and location"""
+        try:
+            user = get_current_principal()
+
+            if not user.labor_profile:
+                return jsonify({'error': 'Labor profile not found'}), 404
+
+            limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+            postings = recommended_jobs(user, limit)
+
+            return jsonify({'success': True, 'postings': postings})
 
         except Exception as e:
             return jsonify({'error': str(e)}), 500
@@ -50,21 +49,15 @@ def register_labor_routes(app):
     def labor_apply_job(posting_id):
         """Apply for a job posting"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.labor_profile:
                 return jsonify({'error': 'Labor profile not found'}), 404
 
-            posting = LaborHiring.query.get(posting_id)
-            if not posting:
-                return jsonify({'error': 'Job posting not found'}), 404
-
-            if posting.labor_id:
-                return jsonify({'error': 'Job already taken'}), 400
-
-            posting.labor_id = user.labor_profile.id
-            db.session.commit()
+            try:
+                claim_slot(posting_id, user.labor_profile.id)
+            except AssignmentError as e:
+                return jsonify({'error': str(e)}), e.status_code
 
             return jsonify({'success': True, 'message': 'Application successful'})
 
@@ -77,35 +70,31 @@ def register_labor_routes(app):
     def labor_my_jobs():
         """Get labor's current and past jobs"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
+
+            if not user.labor_profile:
+                return jsonify({'error': 'Labor profile not found'}), 404
+
+            jobs, next_cursor = labor_jobs(user.labor_profile.id, request.args)
+
+            return jsonify({'success': True, 'jobs': jobs, 'next_cursor': next_cursor})
+
+        except BoardQueryError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/labor/earnings', methods=['GET'])
+    @role_required(UserRole.LABOR)
+    def labor_earnings_summary():
+        """Get labor's earnings from completed jobs"""
+        try:
+            user = get_current_principal()
 
             if not user.labor_profile:
                 return jsonify({'error': 'Labor profile not found'}), 404
 
-            jobs = (
-                LaborHiring.query
-                .filter_by(labor_id=user.labor_profile.id)
-                .order_by(LaborHiring.created_at.desc())
-                .all()
-            )
-
-            results = []
-            for job in jobs:
-                farmer_user = User.query.get(job.farmer.user_id)
-                results.append({
-                    'id': job.id,
-                    'farmer_name': farmer_user.full_name if farmer_user else 'Unknown',
-                    'job_title': job.job_title,
-                    'work_type': job.work_type,
-                    'start_date': job.start_date.isoformat(),
-                    'end_date': job.end_date.isoformat() if job.end_date else None,
-                    'daily_wage': job.daily_wage,
-                    'total_wage': job.total_wage,
-                    'status': job.status,
-                })
-
-            return jsonify({'success': True, 'jobs': results})
+            return jsonify({'success': True, 'earnings': labor_earnings(user.labor_profile.id)})
 
         except Exception as e:
             return jsonify({'error': str(e)}), 500
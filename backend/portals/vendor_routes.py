@@ -2,8 +2,27 @@
 
 from flask import jsonify, request
 
-from models.database import db, User, UserRole, VendorProduct, Order, OrderStatus
-from utils.auth import role_required, get_current_user
+from models.database import db, UserRole, VendorProduct, Order, OrderStatus, ORDER_STATUS_TRANSITIONS
+from utils.auth import role_required, get_current_principal
+import services.bulk_import as bulk_import
+from services.platform_counters import adjust_counter
+from services.export import export_response
+from services.order_events import order_events
+
+
+def vendor_product_fields(data):
+    """Validated VendorProduct column values from a request/import record."""
+    return {
+        'product_name': data['product_name'],
+        'category': data.get('category'),
+        'brand': data.get('brand'),
+        'quantity_available': float(data['quantity_available']),
+        'unit': data.get('unit', 'unit'),
+        'price_per_unit': float(data['price_per_unit']),
+        'description': data.get('description'),
+        'image_url': data.get('image_url'),
+        'specifications': data.get('specifications'),
+    }
 
 
 def register_vendor_routes(app):
@@ -14,8 +33,7 @@ def register_vendor_routes(app):
     def vendor_products():
         """Get or create vendor products"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.vendor_profile:
                 return jsonify({'error': 'Vendor profile not found'}), 404
@@ -36,15 +54,7 @@ def register_vendor_routes(app):
 
             product = VendorProduct(
                 vendor_id=user.vendor_profile.id,
-                product_name=data['product_name'],
-                category=data.get('category'),
-                brand=data.get('brand'),
-                quantity_available=float(data['quantity_available']),
-                unit=data.get('unit', 'unit'),
-                price_per_unit=float(data['price_per_unit']),
-                description=data.get('description'),
-                image_url=data.get('image_url'),
-                specifications=data.get('specifications'),
+                **vendor_product_fields(data)
             )
 
             db.session.add(product)
@@ -60,13 +70,37 @@ def register_vendor_routes(app):
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/vendor/products/import', methods=['POST'])
+    @role_required(UserRole.VENDOR)
+    def vendor_import_products():
+        """Bulk import vendor products from CSV or NDJSON"""
+        try:
+            user = get_current_principal()
+
+            if not user.vendor_profile:
+                return jsonify({'error': 'Vendor profile not found'}), 404
+
+            vendor_id = user.vendor_profile.id
+            result = bulk_import.import_records(
+                bulk_import.iter_records(request),
+                VendorProduct,
+                lambda record: dict(vendor_product_fields(record), vendor_id=vendor_id),
+                on_chunk=lambda conn, count: adjust_counter(conn, 'vendor_products', count),
+            )
+            return jsonify(result)
+
+        except bulk_import.ImportFormatError as e:
+            return jsonify({'error': str(e)}), 415
+        except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/vendor/products/<int:product_id>', methods=['PUT', 'DELETE'])
     @role_required(UserRole.VENDOR)
     def manage_vendor_product(product_id):
         """Update or delete vendor product"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             product = VendorProduct.query.get(product_id)
             if not product or product.vendor_id != user.vendor_profile.id:
@@ -100,31 +134,25 @@ def register_vendor_routes(app):
     def vendor_orders():
         """Get orders for vendor's products"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user.vendor_profile:
                 return jsonify({'error': 'Vendor profile not found'}), 404
 
-            product_ids = [p.id for p in user.vendor_profile.products]
-
             orders = (
                 Order.query
-                .filter(Order.vendor_product_id.in_(product_ids))
+                .filter(Order.vendor_id == user.vendor_profile.id)
                 .order_by(Order.created_at.desc())
                 .all()
             )
 
             results = []
             for order in orders:
-                buyer = User.query.get(order.buyer_id)
                 results.append({
                     'id': order.id,
-                    'buyer_name': buyer.full_name if buyer else 'Unknown',
-                    'buyer_email': buyer.email if buyer else None,
-                    'product_name': (
-                        order.vendor_product.product_name if order.vendor_product else None
-                    ),
+                    'buyer_name': order.buyer_name or 'Unknown',
+                    'buyer_email': order.buyer_email,
+                    'product_name': order.product_name,
                     'quantity': order.quantity,
                     'total_price': order.total_price,
                     'status': order.status.value,
@@ -139,13 +167,42 @@ def register_vendor_routes(app):
         except Exception as e:
             return jsonify({'error': str(e)}), 500
 
+    @app.route('/api/vendor/orders/export', methods=['GET'])
+    @role_required(UserRole.VENDOR)
+    def vendor_export_orders():
+        """Export vendor's orders as CSV/XLSX (?format=csv|xlsx&gzip=1)"""
+        try:
+            user = get_current_principal()
+
+            if not user.vendor_profile:
+                return jsonify({'error': 'Vendor profile not found'}), 404
+
+            query = (
+                db.session.query(
+                    Order.id, Order.created_at, Order.product_name,
+                    Order.buyer_name, Order.buyer_email, Order.quantity, Order.unit_price,
+                    Order.total_price, Order.status, Order.delivery_date,
+                )
+                .filter(Order.vendor_id == user.vendor_profile.id)
+                .order_by(Order.created_at.desc())
+            )
+            header = [
+                'order_id', 'created_at', 'product_name', 'buyer_name', 'buyer_email',
+                'quantity', 'unit_price', 'total_price', 'status', 'delivery_date',
+            ]
+            return export_response(request, header, query, 'vendor_orders')
+
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+
     @app.route('/api/vendor/orders/<int:order_id>', methods=['PUT'])
     @role_required(UserRole.VENDOR)
     def vendor_update_order(order_id):
         """Update order status for orders containing this vendor's products."""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
 
             if not user or not user.vendor_profile:
                 return jsonify({'error': 'Vendor profile not found'}), 404
@@ -155,8 +212,7 @@ def register_vendor_routes(app):
                 return jsonify({'error': 'Order not found'}), 404
 
             # Ensure the order belongs to this vendor
-            product_ids = {p.id for p in user.vendor_profile.products}
-            if order.vendor_product_id not in product_ids:
+            if order.vendor_id != user.vendor_profile.id:
                 return jsonify({'error': 'Not authorized to update this order'}), 403
 
             data = request.json or {}
@@ -165,12 +221,19 @@ def register_vendor_routes(app):
                 return jsonify({'error': 'Missing status'}), 400
 
             try:
-                order.status = OrderStatus(new_status)
+                new_status = OrderStatus(new_status)
             except ValueError:
                 allowed = [s.value for s in OrderStatus]
                 return jsonify({'error': f'Invalid status. Allowed: {allowed}'}), 400
+            if new_status not in ORDER_STATUS_TRANSITIONS[order.status]:
+                return jsonify({
+                    'error': f'Cannot change a {order.status.value} order to {new_status.value}'
+                }), 409
+
+            order.status = new_status
 
             db.session.commit()
+            order_events.publish_status_change(order)
             return jsonify({'success': True, 'message': 'Order updated', 'order': {
                 'id': order.id,
                 'status': order.status.value,
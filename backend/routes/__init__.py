@@ -1,5 +1,6 @@
 """Routes package"""
 from .auth_routes import register_auth_routes
 from .error_handlers import register_error_handlers
+from .event_routes import register_event_routes
 
-__all__ = ['register_auth_routes', 'register_error_handlers']
+__all__ = ['register_auth_routes', 'register_error_handlers', 'register_event_routes']
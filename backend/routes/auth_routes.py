@@ -4,14 +4,54 @@ Handles user registration, login, and public endpoints
 """
 from flask import request, jsonify
 from datetime import datetime
+import math
 from models.database import (
     db, User, UserRole, FarmerProfile, VendorProfile, LaborProfile,
     CropListing, VendorProduct
 )
-from utils.auth import generate_token, login_required, get_current_user
+from models.session import read_only
+from utils.auth import (
+    generate_token,
+    decode_token,
+    revoke_token,
+    get_token_from_header,
+    login_required,
+    get_current_principal,
+)
+from utils.passwords import PasswordHasherBusy
+from utils.rate_limit import rate_limit
 from models.fertilizer_recommendation import FertilizerRecommendationModel
 
 
+# Valid range of each farm coordinate
+COORDINATE_RANGES = {'latitude': (-90.0, 90.0), 'longitude': (-180.0, 180.0)}
+
+
+def parse_coordinates(data):
+    """Validated ``latitude``/``longitude`` among ``data``'s keys (``None`` clears one).
+
+    Raises ``ValueError`` with a message for the client on a bad value.
+    """
+    coordinates = {}
+    for name, (low, high) in COORDINATE_RANGES.items():
+        if name not in data:
+            continue
+        value = data[name]
+        if value is None or value == '':
+            coordinates[name] = None
+            continue
+        try:
+            if isinstance(value, bool):
+                raise ValueError
+            value = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f'{name} must be a number')
+        if not math.isfinite(value) or not low <= value <= high:
+            raise ValueError(f'{name} must be between {low:g} and {high:g}')
+        coordinates[name] = value
+    return coordinates
+
+
 def register_auth_routes(app):
     """Register authentication and public routes"""
     
@@ -32,6 +72,8 @@ def register_auth_routes(app):
         })
     
     @app.route('/api/public/products', methods=['GET'])
+    @rate_limit('search')
+    @read_only
     def get_public_products():
         """Get all public products (crops, vendor products) for landing page"""
         try:
@@ -67,6 +109,7 @@ def register_auth_routes(app):
             return jsonify({'error': str(e)}), 500
     
     @app.route('/api/public/labor-listings', methods=['GET'])
+    @read_only
     def get_public_labor_listings():
         """Get available labor for landing page"""
         try:
@@ -126,6 +169,11 @@ def register_auth_routes(app):
                 role = UserRole(data['role'])
             except ValueError:
                 return jsonify({'error': 'Invalid role'}), 400
+
+            try:
+                coordinates = parse_coordinates(data)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
             
             # Create user
             user = User(
@@ -147,7 +195,9 @@ def register_auth_routes(app):
                     user_id=user.id,
                     farm_name=data.get('farm_name'),
                     farm_size=data.get('farm_size'),
-                    farm_location=data.get('farm_location')
+                    farm_location=data.get('farm_location'),
+                    latitude=coordinates.get('latitude'),
+                    longitude=coordinates.get('longitude')
                 )
                 db.session.add(farmer_profile)
             
@@ -180,11 +230,16 @@ def register_auth_routes(app):
                 'user': user.to_dict()
             }), 201
         
+        except PasswordHasherBusy as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+        
         except Exception as e:
             db.session.rollback()
             return jsonify({'error': str(e)}), 500
     
     @app.route('/api/auth/login', methods=['POST'])
+    @rate_limit('login', by_user=False)
     def login():
         """Login user"""
         try:
@@ -201,6 +256,11 @@ def register_auth_routes(app):
             if not user.is_active:
                 return jsonify({'error': 'Account is deactivated'}), 403
             
+            # Upgrade hashes made with older settings while we have the password
+            if user.password_needs_rehash():
+                user.set_password(data['password'])
+                db.session.commit()
+            
             token = generate_token(user.id, user.role)
             
             return jsonify({
@@ -209,7 +269,30 @@ def register_auth_routes(app):
                 'user': user.to_dict()
             })
         
+        except PasswordHasherBusy as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
+        
         except Exception as e:
+            db.session.rollback()
+            return jsonify({'error': str(e)}), 500
+    
+    @app.route('/api/auth/logout', methods=['POST'])
+    @login_required
+    def logout():
+        """Revoke the token used for this request"""
+        try:
+            payload = decode_token(get_token_from_header())
+            
+            if not payload.get('jti'):
+                return jsonify({'error': 'Token cannot be revoked; it will expire on its own'}), 400
+            
+            revoke_token(payload)
+            
+            return jsonify({'success': True, 'message': 'Logged out'})
+        
+        except Exception as e:
+            db.session.rollback()
             return jsonify({'error': str(e)}), 500
     
     @app.route('/api/auth/profile', methods=['GET'])
@@ -217,8 +300,7 @@ def register_auth_routes(app):
     def get_profile():
         """Get current user profile"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
             
             if not user:
                 return jsonify({'error': 'User not found'}), 404
@@ -231,6 +313,8 @@ def register_auth_routes(app):
                     'farm_name': user.farmer_profile.farm_name,
                     'farm_size': user.farmer_profile.farm_size,
                     'farm_location': user.farmer_profile.farm_location,
+                    'latitude': user.farmer_profile.latitude,
+                    'longitude': user.farmer_profile.longitude,
                     'soil_type': user.farmer_profile.soil_type
                 }
             elif user.role == UserRole.VENDOR and user.vendor_profile:
@@ -258,14 +342,18 @@ def register_auth_routes(app):
     def update_profile():
         """Update current user profile (except email)"""
         try:
-            current_user = get_current_user()
-            user = User.query.get(current_user['user_id'])
+            user = get_current_principal()
             
             if not user:
                 return jsonify({'error': 'User not found'}), 404
             
             data = request.json
             
+            try:
+                coordinates = parse_coordinates(data)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            
             # Update basic user info (except email)
             if 'full_name' in data:
                 user.full_name = data['full_name']
@@ -282,6 +370,8 @@ def register_auth_routes(app):
                     user.farmer_profile.farm_size = data['farm_size']
                 if 'farm_location' in data:
                     user.farmer_profile.farm_location = data['farm_location']
+                for name, value in coordinates.items():
+                    setattr(user.farmer_profile, name, value)
                 if 'soil_type' in data:
                     user.farmer_profile.soil_type = data['soil_type']
                 if 'irrigation_type' in data:
@@ -313,6 +403,8 @@ def register_auth_routes(app):
                     'farm_name': user.farmer_profile.farm_name,
                     'farm_size': user.farmer_profile.farm_size,
                     'farm_location': user.farmer_profile.farm_location,
+                    'latitude': user.farmer_profile.latitude,
+                    'longitude': user.farmer_profile.longitude,
                     'soil_type': user.farmer_profile.soil_type,
                     'irrigation_type': user.farmer_profile.irrigation_type
                 }
@@ -0,0 +1,96 @@
+"""Server-Sent Events stream of order status changes."""
+
+import json
+import time
+
+from flask import Response, current_app, jsonify, request, stream_with_context
+
+from services.order_events import order_events
+from utils.auth import (
+    get_token_from_header,
+    decode_token,
+    generate_stream_token,
+    decode_stream_token,
+)
+
+
+def register_event_routes(app):
+    """Register the order event stream on the given Flask app."""
+
+    @app.route('/api/orders/events/token', methods=['POST'])
+    def order_event_stream_token():
+        """Issue a short-lived token for ``?stream_token=`` on the event stream.
+
+        ``EventSource`` cannot send headers, and a regular token in the URL
+        would end up in access logs, so browsers fetch one of these first and
+        fetch a new one when the stream reports it expired.
+        """
+        token = get_token_from_header()
+        if not token:
+            return jsonify({'error': 'Authentication token is missing'}), 401
+
+        payload = decode_token(token)
+        if 'error' in payload:
+            return jsonify({'error': payload['error']}), 401
+
+        ttl = current_app.config.get('ORDER_EVENTS_TOKEN_SECONDS', 300)
+        return jsonify({
+            'success': True,
+            'stream_token': generate_stream_token(payload, ttl),
+            'expires_in': ttl,
+        }), 200
+
+    @app.route('/api/orders/events', methods=['GET'])
+    def order_event_stream():
+        """Push order status changes for the current user as SSE.
+
+        Authenticates with the ``Authorization`` header or a stream token
+        from ``POST /api/orders/events/token`` as ``?stream_token=``. Streams
+        end after ``ORDER_EVENTS_STREAM_SECONDS`` and the browser reconnects
+        with ``Last-Event-ID``.
+        """
+        if not current_app.config.get('ORDER_EVENTS_STREAMING', True):
+            return jsonify({
+                'error': 'Order event streaming is disabled on this server; poll the order lists instead'
+            }), 503
+
+        token = get_token_from_header()
+        stream_token = request.args.get('stream_token')
+        if not token and not stream_token:
+            return jsonify({'error': 'Authentication token is missing'}), 401
+
+        payload = decode_token(token) if token else decode_stream_token(stream_token)
+        if 'error' in payload:
+            return jsonify({'error': payload['error']}), 401
+
+        user_id = payload['user_id']
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        try:
+            after = int(last_event_id) if last_event_id else order_events.last_id(user_id)
+        except ValueError:
+            return jsonify({'error': 'Invalid Last-Event-ID'}), 400
+
+        duration = current_app.config.get('ORDER_EVENTS_STREAM_SECONDS', 30)
+        heartbeat = min(15, duration)
+
+        def stream(after):
+            yield 'retry: 3000\n\n'
+            deadline = time.monotonic() + duration
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                events = order_events.read(user_id, after, min(heartbeat, remaining))
+                if not events:
+                    # Comment line keeps proxies from closing an idle stream.
+                    yield ': keepalive\n\n'
+                    continue
+                for event_id, event in events:
+                    after = event_id
+                    yield f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+        return Response(
+            stream_with_context(stream(after)),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
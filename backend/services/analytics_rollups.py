@@ -0,0 +1,264 @@
+"""Time-series rollups for admin analytics.
+
+Each metric folds new source rows (``id`` above its high-water mark in
+``analytics_watermarks``) into daily and monthly ``analytics_rollups`` rows,
+so trend queries never scan ``orders`` or ``users``. Refreshes run in a
+background thread every ``ANALYTICS_REFRESH_SECONDS`` and from
+``flask refresh-analytics``; the time-series endpoint only reads.
+
+Ids are allocated when a row is inserted but become visible when its
+transaction commits, so a lower id can appear after a higher one (notably
+on PostgreSQL). A refresh therefore only advances the mark to the newest
+row created at least ``ANALYTICS_SETTLE_SECONDS`` ago; every row below it
+belongs to a transaction that has had that long to commit.
+
+Rollups count rows when they are created: orders stay in GMV if they are
+later cancelled, and deleted listings stay in their creation day.
+"""
+
+import os
+import threading
+from datetime import date, datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import func, literal
+from sqlalchemy.exc import IntegrityError
+
+from models.database import (
+    db,
+    User,
+    Order,
+    CropListing,
+    VendorProduct,
+    AnalyticsRollup,
+    AnalyticsWatermark,
+)
+
+
+def _grouped(model, dimension, amount, **filters):
+    """Build ``(lo, hi) -> [(day, dimension, count, amount)]`` for ``model``."""
+    def query(lo, hi):
+        day = func.date(model.created_at)
+        total = func.coalesce(func.sum(amount), 0.0) if amount is not None else literal(0.0)
+        q = db.session.query(day, dimension, func.count(model.id), total)
+        q = q.filter(model.id > lo, model.id <= hi)
+        for column, value in filters.items():
+            q = q.filter(getattr(model, column) == value)
+        return q.group_by(day, dimension).all()
+    return query
+
+
+# metric -> (source model, grouped query)
+METRICS = {
+    'orders': (
+        Order,
+        _grouped(Order, Order.order_type, Order.total_price),
+    ),
+    'crop_revenue': (
+        Order,
+        # The crop name copied onto the order survives the listing's deletion.
+        _grouped(Order, Order.product_name, Order.total_price, order_type='crop'),
+    ),
+    'new_users': (
+        User,
+        _grouped(User, User.role, None),
+    ),
+    'new_crop_listings': (
+        CropListing,
+        _grouped(CropListing, CropListing.category,
+                 CropListing.quantity * CropListing.price_per_unit),
+    ),
+    'new_vendor_products': (
+        VendorProduct,
+        _grouped(VendorProduct, VendorProduct.category,
+                 VendorProduct.quantity_available * VendorProduct.price_per_unit),
+    ),
+}
+
+GRANULARITIES = ('day', 'month')
+
+
+def _dimension_value(value):
+    if value is None:
+        return ''
+    return getattr(value, 'value', value)
+
+
+def _settled_high_id(model, cutoff):
+    """Highest id of ``model`` created at or before ``cutoff`` (0 if none).
+
+    Walks the primary key down from the newest row, so only rows newer than
+    the cutoff are skipped.
+    """
+    return (
+        db.session.query(model.id)
+        .filter(model.created_at <= cutoff)
+        .order_by(model.id.desc())
+        .limit(1)
+        .scalar()
+    ) or 0
+
+
+def _claim_range(metric, hi):
+    """Advance ``metric``'s watermark to ``hi``; return the old mark or None.
+
+    The conditional update makes concurrent refreshes in other workers skip
+    a range that is already being folded in.
+    """
+    mark = db.session.get(AnalyticsWatermark, metric)
+    if mark is None:
+        try:
+            db.session.add(AnalyticsWatermark(metric=metric, last_id=0))
+            db.session.flush()
+        except IntegrityError:
+            db.session.rollback()
+        mark = db.session.get(AnalyticsWatermark, metric)
+
+    lo = mark.last_id
+    if hi <= lo:
+        return None
+
+    table = AnalyticsWatermark.__table__
+    claimed = db.session.execute(
+        table.update()
+        .where(table.c.metric == metric, table.c.last_id == lo)
+        .values(last_id=hi)
+    ).rowcount
+    return lo if claimed else None
+
+
+def _merge(metric, totals):
+    """Add ``{(granularity, period_start, dimension): [count, amount]}``."""
+    for (granularity, period_start, dimension), (count, amount) in totals.items():
+        rollup = AnalyticsRollup.query.filter_by(
+            metric=metric,
+            granularity=granularity,
+            period_start=period_start,
+            dimension=dimension,
+        ).first()
+        if rollup is None:
+            db.session.add(AnalyticsRollup(
+                metric=metric,
+                granularity=granularity,
+                period_start=period_start,
+                dimension=dimension,
+                count=count,
+                amount=amount,
+            ))
+        else:
+            rollup.count += count
+            rollup.amount += amount
+
+
+def refresh_rollups():
+    """Fold source rows added since the last refresh into the rollups."""
+    processed = 0
+
+    settle = current_app.config.get('ANALYTICS_SETTLE_SECONDS', 60)
+    cutoff = datetime.utcnow() - timedelta(seconds=settle)
+
+    for metric, (model, grouped) in METRICS.items():
+        try:
+            hi = _settled_high_id(model, cutoff)
+            lo = _claim_range(metric, hi)
+            if lo is None:
+                db.session.rollback()
+                continue
+
+            totals = {}
+            for day, dimension, count, amount in grouped(lo, hi):
+                if isinstance(day, str):
+                    day = date.fromisoformat(day)
+                dimension = _dimension_value(dimension)
+                for granularity in GRANULARITIES:
+                    start = day if granularity == 'day' else day.replace(day=1)
+                    entry = totals.setdefault((granularity, start, dimension), [0, 0.0])
+                    entry[0] += count
+                    entry[1] += float(amount or 0.0)
+                processed += count
+
+            _merge(metric, totals)
+            db.session.commit()
+
+        except Exception:
+            db.session.rollback()
+            raise
+
+    return processed
+
+
+class AnalyticsRefresher:
+    """Background thread that refreshes the rollups every ``ANALYTICS_REFRESH_SECONDS``."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Bind the refresher to ``app`` and start it in this worker."""
+        self.app = app
+        self.interval = app.config.get('ANALYTICS_REFRESH_SECONDS', 300)
+        self.ensure_running()
+
+    def ensure_running(self):
+        """Start the refresher thread (again, after a fork) if needed."""
+        pid = os.getpid()
+        if self.app is None:
+            return
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(
+                target=self._run, name='analytics-refresher', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        stop = threading.Event()
+        while not stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    refresh_rollups()
+                except Exception as e:
+                    print(f"Analytics refresh failed: {e}")
+
+
+analytics_refresher = AnalyticsRefresher()
+
+
+def read_timeseries(metric, granularity, start=None, end=None, dimension=None):
+    """Return rollup points for ``metric`` ordered by period."""
+    query = AnalyticsRollup.query.filter_by(metric=metric, granularity=granularity)
+    if start:
+        query = query.filter(AnalyticsRollup.period_start >= start)
+    if end:
+        query = query.filter(AnalyticsRollup.period_start <= end)
+    if dimension is not None:
+        query = query.filter_by(dimension=dimension)
+
+    return [
+        {
+            'period': rollup.period_start.isoformat(),
+            'dimension': rollup.dimension,
+            'count': rollup.count,
+            'amount': round(rollup.amount, 2),
+        }
+        for rollup in query.order_by(AnalyticsRollup.period_start, AnalyticsRollup.dimension)
+    ]
+
+
+def register_analytics_commands(app):
+    """Register the ``refresh-analytics`` CLI command on ``app``."""
+
+    @app.cli.command('refresh-analytics')
+    def refresh_analytics_command():
+        """Fold new orders, listings, products and users into the rollups."""
+        processed = refresh_rollups()
+        print(f"✓ Folded {processed} new source rows into analytics rollups")
@@ -0,0 +1,176 @@
+"""Streaming CSV/NDJSON bulk import shared by the portal import endpoints.
+
+Records are read lazily from the request body (or an uploaded ``file``),
+validated in chunks of ``IMPORT_CHUNK_SIZE`` and written with
+``bulk_insert_mappings``, one transaction per chunk. Invalid rows are
+skipped and reported with their 1-based row number. If the database rejects
+a chunk, its rows are retried one by one, each in a savepoint, so only the
+rows that actually fail are skipped. pysqlite cannot nest a SAVEPOINT in the
+session's transaction (it opens and commits one of its own instead), so on
+SQLite each retried row is committed on its own.
+"""
+
+import csv
+import io
+import json
+from itertools import islice
+
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+
+from models.database import db
+
+
+CSV_TYPES = {'text/csv', 'application/csv'}
+NDJSON_TYPES = {'application/x-ndjson', 'application/ndjson', 'application/jsonl'}
+
+
+class ImportFormatError(ValueError):
+    """Raised when the upload is not CSV or NDJSON."""
+
+
+def _clean(record):
+    """Drop blank values so builders treat them as missing fields."""
+    return {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in record.items()
+        if key and value not in (None, '')
+    }
+
+
+def iter_records(req):
+    """Yield record dicts from ``req`` as CSV or NDJSON, without buffering."""
+    upload = req.files.get('file')
+    if upload is not None:
+        stream = upload.stream
+        filename = (upload.filename or '').lower()
+        kind = 'ndjson' if filename.endswith(('.ndjson', '.jsonl')) else 'csv'
+    else:
+        stream = req.stream
+        mimetype = req.mimetype
+        if mimetype in CSV_TYPES:
+            kind = 'csv'
+        elif mimetype in NDJSON_TYPES:
+            kind = 'ndjson'
+        else:
+            raise ImportFormatError(
+                'Send text/csv or application/x-ndjson, or upload a CSV/NDJSON file'
+            )
+
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if kind == 'csv':
+        for record in csv.DictReader(text):
+            yield _clean(record)
+    else:
+        for line in text:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield _clean(record) if isinstance(record, dict) else None
+
+
+def import_records(records, model, build_row, on_chunk=None):
+    """Validate and bulk insert ``records`` into ``model``.
+
+    ``build_row(record)`` returns a column mapping or raises ``ValueError``
+    / ``KeyError`` for invalid rows. ``on_chunk(connection, inserted)`` runs
+    inside each chunk's transaction, e.g. to keep counters in step.
+    """
+    chunk_size = current_app.config.get('IMPORT_CHUNK_SIZE', 1000)
+    max_errors = current_app.config.get('IMPORT_MAX_ERRORS', 100)
+
+    imported = 0
+    failed = 0
+    errors = []
+    row_number = 0
+    records = iter(records)
+
+    def reject(number, message):
+        nonlocal failed
+        failed += 1
+        if len(errors) < max_errors:
+            errors.append({'row': number, 'error': message})
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        rows = []  # (row number, mapping)
+        for record in chunk:
+            row_number += 1
+            try:
+                if record is None:
+                    raise ValueError('Malformed record')
+                rows.append((row_number, build_row(record)))
+            except KeyError as e:
+                reject(row_number, f'Missing field {e}')
+            except (TypeError, ValueError) as e:
+                reject(row_number, str(e))
+
+        if not rows:
+            continue
+
+        try:
+            db.session.bulk_insert_mappings(model, [row for _, row in rows])
+            inserted = len(rows)
+        except SQLAlchemyError:
+            db.session.rollback()
+            if db.engine.dialect.name == 'sqlite':
+                imported += _commit_one_by_one(model, rows, reject, on_chunk)
+                continue
+            inserted = _insert_one_by_one(model, rows, reject)
+
+        try:
+            if inserted and on_chunk is not None:
+                on_chunk(db.session.connection(), inserted)
+            db.session.commit()
+            imported += inserted
+        except Exception as e:
+            db.session.rollback()
+            failed += inserted
+            if len(errors) < max_errors:
+                errors.append({
+                    'row': rows[0][0],
+                    'error': f'Chunk of {len(chunk)} rows rejected: {e}',
+                })
+
+    return {
+        'success': True,
+        'imported': imported,
+        'failed': failed,
+        'errors': errors,
+    }
+
+
+def _insert_one_by_one(model, rows, reject):
+    """Insert ``rows`` each in its own savepoint; return how many succeeded."""
+    inserted = 0
+    for number, row in rows:
+        try:
+            with db.session.begin_nested():
+                db.session.bulk_insert_mappings(model, [row])
+            inserted += 1
+        except SQLAlchemyError as e:
+            reject(number, f'Rejected by the database: {getattr(e, "orig", e)}')
+    return inserted
+
+
+def _commit_one_by_one(model, rows, reject, on_chunk):
+    """Insert and commit ``rows`` one at a time; return how many succeeded."""
+    inserted = 0
+    for number, row in rows:
+        try:
+            db.session.bulk_insert_mappings(model, [row])
+            if on_chunk is not None:
+                on_chunk(db.session.connection(), 1)
+            db.session.commit()
+            inserted += 1
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            reject(number, f'Rejected by the database: {getattr(e, "orig", e)}')
+    return inserted
@@ -0,0 +1,308 @@
+"""Set-based cart checkout.
+
+All listings and products referenced by a cart are loaded with one ``IN``
+query per table. Stock is then taken with conditional
+``UPDATE ... SET quantity = quantity - :q WHERE quantity >= :q`` statements,
+so two buyers racing for the last units cannot both succeed. The orders are
+inserted in bulk, and everything happens in a single transaction.
+
+Buyers can also reserve stock first (``place_holds``) and check the held
+lines out later (``confirm_holds``); direct checkouts never take stock that
+is held by someone else.
+"""
+
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import insert
+
+from models.database import db, CropListing, VendorProduct, Order, InventoryHold
+from services.platform_counters import adjust_counter
+from services import inventory_holds, order_read_model
+
+
+# cart item type -> (model, stock column, order type, order foreign key)
+ITEM_TYPES = {
+    'crop': (CropListing, 'quantity', 'crop', 'crop_listing_id'),
+    'vendor_product': (VendorProduct, 'quantity_available', 'vendor_product', 'vendor_product_id'),
+}
+
+NOT_FOUND = {
+    'crop': 'Crop listing not found',
+    'vendor_product': 'Vendor product not found',
+}
+INSUFFICIENT = {
+    'crop': 'Insufficient quantity available for crop',
+    'vendor_product': 'Insufficient quantity available for product',
+}
+
+
+class CheckoutError(ValueError):
+    """Raised when a cart cannot be checked out; carries an HTTP status."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_cart(items):
+    """Validate cart lines and return ``[(item_type, item_id, quantity)]``."""
+    if not isinstance(items, list) or not items:
+        raise CheckoutError('Items list is required')
+
+    lines = []
+    for item in items:
+        item_type = item.get('type')
+        item_id = item.get('id')
+        try:
+            quantity = float(item.get('quantity', 0))
+            item_id = int(item_id) if item_id else None
+        except (TypeError, ValueError):
+            raise CheckoutError('Invalid item in cart')
+        if not item_type or not item_id or quantity <= 0:
+            raise CheckoutError('Invalid item in cart')
+        # Anything that is not a crop is a vendor product, as before.
+        if item_type != 'crop':
+            item_type = 'vendor_product'
+        lines.append((item_type, item_id, quantity))
+    return lines
+
+
+def _load_items(lines):
+    """Return ``{(item_type, id): item info}`` using one query per table.
+
+    The info holds the price plus the names copied onto the order (see
+    ``services.order_read_model``).
+    """
+    items = {}
+    for item_type in ITEM_TYPES:
+        ids = {item_id for t, item_id, _ in lines if t == item_type}
+        described = order_read_model.describe_items(item_type, ids)
+        items.update({(item_type, row_id): info for row_id, info in described.items()})
+
+    for item_type, item_id, _ in lines:
+        if (item_type, item_id) not in items:
+            raise CheckoutError(NOT_FOUND[item_type], 404)
+    return items
+
+
+def _needed(lines):
+    """Sum cart quantities per item, in a fixed order.
+
+    The fixed order keeps concurrent checkouts from locking rows in opposite
+    orders.
+    """
+    needed = {}
+    for item_type, item_id, quantity in lines:
+        needed[(item_type, item_id)] = needed.get((item_type, item_id), 0) + quantity
+    return sorted(needed.items())
+
+
+def _decrement(item_type, item_id, quantity, respect_holds=True):
+    """Conditionally take ``quantity`` from stock; return False if short."""
+    model, stock, _, _ = ITEM_TYPES[item_type]
+    table = model.__table__
+    column = table.c[stock]
+    available = column
+    if respect_holds:
+        available = column - inventory_holds.held_quantity(item_type, item_id)
+    return bool(db.session.execute(
+        table.update()
+        .where(table.c.id == item_id, available >= quantity)
+        .values({stock: column - quantity})
+    ).rowcount)
+
+
+def _take_stock(lines):
+    """Decrement stock for every cart line, or raise if any line is short."""
+    for (item_type, item_id), quantity in _needed(lines):
+        if not _decrement(item_type, item_id, quantity):
+            raise CheckoutError(INSUFFICIENT[item_type])
+
+
+def _delivery_date(data):
+    if not data.get('delivery_date'):
+        return None
+    try:
+        return datetime.strptime(data['delivery_date'], '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise CheckoutError('delivery_date must be in YYYY-MM-DD format')
+
+
+def _insert_orders(buyer_id, lines, items, data):
+    """Bulk insert one order per ``(item_type, item_id, quantity)`` line."""
+    buyer = order_read_model.buyer_fields(buyer_id)
+    delivery_date = _delivery_date(data)
+    rows = []
+    for item_type, item_id, quantity in lines:
+        _, _, order_type, foreign_key = ITEM_TYPES[item_type]
+        info = items[(item_type, item_id)]
+        unit_price = float(info['price'])
+        row = {
+            'buyer_id': buyer_id,
+            'order_type': order_type,
+            'crop_listing_id': None,
+            'vendor_product_id': None,
+            'quantity': quantity,
+            'unit_price': unit_price,
+            'total_price': unit_price * quantity,
+            'is_contract_farming': data.get('is_contract_farming', False),
+            'delivery_date': delivery_date,
+            'delivery_address': data.get('delivery_address'),
+            'notes': data.get('notes'),
+            'product_name': info['product_name'],
+            'seller_id': info['seller_id'],
+            'seller_name': info['seller_name'],
+            'vendor_id': info['profile_id'] if item_type == 'vendor_product' else None,
+            **buyer,
+        }
+        row[foreign_key] = item_id
+        rows.append(row)
+
+    order_ids = db.session.scalars(
+        insert(Order).returning(Order.id, sort_by_parameter_order=True),
+        rows,
+    ).all()
+    # Bulk inserts skip mapper events, so keep the dashboard counter in step here.
+    adjust_counter(db.session.connection(), 'orders', len(order_ids))
+    return order_ids
+
+
+def checkout(buyer_id, items, data):
+    """Place one order per cart line and return the new order ids.
+
+    Raises ``CheckoutError`` without changing anything if a line refers to a
+    missing listing/product or more stock than is available.
+    """
+    lines = parse_cart(items)
+
+    try:
+        items = _load_items(lines)
+        _take_stock(lines)
+
+        order_ids = _insert_orders(buyer_id, lines, items, data)
+        db.session.commit()
+        return order_ids
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def place_holds(buyer_id, items):
+    """Reserve stock for every cart line and return the new holds.
+
+    Each item's stock row is locked with a no-op UPDATE only for this short
+    transaction; the check against existing holds runs after the lock.
+    """
+    lines = parse_cart(items)
+    ttl = current_app.config.get('HOLD_TTL_SECONDS', 600)
+
+    try:
+        _load_items(lines)
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl)
+
+        for (item_type, item_id), quantity in _needed(lines):
+            model, stock, _, _ = ITEM_TYPES[item_type]
+            table = model.__table__
+            db.session.execute(
+                table.update().where(table.c.id == item_id).values({stock: table.c[stock]})
+            )
+            available = db.session.query(
+                getattr(model, stock) - inventory_holds.held_quantity(item_type, item_id, now)
+            ).filter(model.id == item_id).scalar()
+            if available < quantity:
+                raise CheckoutError(INSUFFICIENT[item_type])
+
+        holds = [
+            InventoryHold(
+                buyer_id=buyer_id,
+                item_type=item_type,
+                item_id=item_id,
+                quantity=quantity,
+                status=inventory_holds.ACTIVE,
+                expires_at=expires_at,
+            )
+            for item_type, item_id, quantity in lines
+        ]
+        db.session.add_all(holds)
+        db.session.commit()
+        inventory_holds.hold_sweeper.ensure_running()
+        return holds
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def confirm_holds(buyer_id, hold_ids, data):
+    """Turn the buyer's active holds into orders and return the order ids."""
+    if not isinstance(hold_ids, list) or not hold_ids:
+        raise CheckoutError('hold_ids list is required')
+
+    try:
+        holds = (
+            InventoryHold.query
+            .filter(
+                InventoryHold.id.in_(hold_ids),
+                InventoryHold.buyer_id == buyer_id,
+            )
+            .order_by(InventoryHold.id)
+            .all()
+        )
+        if len(holds) != len(set(hold_ids)):
+            raise CheckoutError('Hold not found', 404)
+
+        # Claim the holds first so a hold can only be checked out once and,
+        # once claimed, no longer counts against the stock we take below.
+        table = InventoryHold.__table__
+        claimed = db.session.execute(
+            table.update()
+            .where(
+                table.c.id.in_([hold.id for hold in holds]),
+                table.c.status == inventory_holds.ACTIVE,
+                table.c.expires_at > datetime.utcnow(),
+            )
+            .values(status=inventory_holds.CONFIRMED)
+        ).rowcount
+        if claimed != len(holds):
+            raise CheckoutError('One or more holds have expired or were already used', 409)
+
+        lines = [(hold.item_type, hold.item_id, hold.quantity) for hold in holds]
+        items = _load_items(lines)
+        for (item_type, item_id), quantity in _needed(lines):
+            if not _decrement(item_type, item_id, quantity, respect_holds=False):
+                raise CheckoutError(INSUFFICIENT[item_type], 409)
+
+        order_ids = _insert_orders(buyer_id, lines, items, data)
+        for hold, order_id in zip(holds, order_ids):
+            db.session.execute(
+                table.update().where(table.c.id == hold.id).values(order_id=order_id)
+            )
+        db.session.commit()
+        return order_ids
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def release_hold(buyer_id, hold_id):
+    """Release one of the buyer's active holds; return False if there is none."""
+    try:
+        table = InventoryHold.__table__
+        released = db.session.execute(
+            table.update()
+            .where(
+                table.c.id == hold_id,
+                table.c.buyer_id == buyer_id,
+                table.c.status == inventory_holds.ACTIVE,
+            )
+            .values(status=inventory_holds.RELEASED)
+        ).rowcount
+        db.session.commit()
+        return bool(released)
+    except Exception:
+        db.session.rollback()
+        raise
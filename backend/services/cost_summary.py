@@ -0,0 +1,157 @@
+"""Cost and profit analytics over a farmer's ``CostRecord`` rows.
+
+The summary is built from one ``GROUP BY year, season, crop_name`` query and
+then folded into per-crop, per-season, per-year and overall totals. Results
+are cached per farmer and keyed by ``FarmerProfile.cost_version``, which
+mapper events bump inside the same transaction as every ORM insert, update
+or delete of a cost record (bulk imports bump it per chunk). The route
+already loads the profile, so a cache hit costs no extra query, and writes
+from other workers change the version too.
+"""
+
+import threading
+from collections import OrderedDict
+
+from sqlalchemy import event, func
+
+from models.database import db, CostRecord, FarmerProfile
+
+
+COST_FIELDS = ['seed', 'fertilizer', 'pesticide', 'labor', 'equipment', 'irrigation', 'other']
+
+CACHE_SIZE = 1024
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def bump_version(connection, farmer_id):
+    """Mark ``farmer_id``'s cached summary stale on the flushing connection."""
+    table = FarmerProfile.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == farmer_id)
+        .values(cost_version=table.c.cost_version + 1)
+    )
+
+
+@event.listens_for(CostRecord, 'after_insert')
+@event.listens_for(CostRecord, 'after_update')
+@event.listens_for(CostRecord, 'after_delete')
+def _on_write(mapper, connection, target):
+    bump_version(connection, target.farmer_id)
+
+
+def _empty_totals():
+    totals = {f'{field}_cost': 0.0 for field in COST_FIELDS}
+    totals.update(total_cost=0.0, revenue=0.0, profit_loss=0.0, records=0)
+    return totals
+
+
+def _add(totals, row):
+    for key in totals:
+        totals[key] += getattr(row, key) or 0
+
+
+def _finish(totals, farm_size=None, margin=True):
+    totals = {key: round(value, 2) for key, value in totals.items()}
+    if margin:
+        totals['margin_per_acre'] = (
+            round(totals['profit_loss'] / farm_size, 2) if farm_size else None
+        )
+    return totals
+
+
+def _change(current, previous):
+    delta = current - previous
+    return {
+        'delta': round(delta, 2),
+        'pct': round(delta / abs(previous) * 100, 2) if previous else None,
+    }
+
+
+def build_summary(farmer_id, farm_size=None):
+    """Aggregate all cost records of ``farmer_id`` in a single grouped query."""
+    sums = [
+        func.coalesce(func.sum(getattr(CostRecord, f'{field}_cost')), 0.0).label(f'{field}_cost')
+        for field in COST_FIELDS
+    ]
+    rows = (
+        db.session.query(
+            CostRecord.year,
+            CostRecord.season,
+            CostRecord.crop_name,
+            *sums,
+            func.coalesce(func.sum(CostRecord.total_cost), 0.0).label('total_cost'),
+            func.coalesce(func.sum(CostRecord.revenue), 0.0).label('revenue'),
+            func.coalesce(func.sum(CostRecord.profit_loss), 0.0).label('profit_loss'),
+            func.count(CostRecord.id).label('records'),
+        )
+        .filter(CostRecord.farmer_id == farmer_id)
+        .group_by(CostRecord.year, CostRecord.season, CostRecord.crop_name)
+        .all()
+    )
+
+    overall = _empty_totals()
+    by_crop, by_season, by_year = {}, {}, {}
+    for row in rows:
+        _add(overall, row)
+        _add(by_crop.setdefault(row.crop_name, _empty_totals()), row)
+        _add(by_season.setdefault(row.season or 'unspecified', _empty_totals()), row)
+        _add(by_year.setdefault(row.year, _empty_totals()), row)
+
+    total = overall['total_cost']
+    breakdown = {
+        field: round(overall[f'{field}_cost'] / total, 4) if total else 0.0
+        for field in COST_FIELDS
+    }
+
+    years = []
+    previous = None
+    for year in sorted(by_year):
+        entry = dict(_finish(by_year[year], farm_size), year=year)
+        if previous is not None:
+            entry['yoy'] = {
+                key: _change(entry[key], previous[key])
+                for key in ('total_cost', 'revenue', 'profit_loss')
+            }
+        years.append(entry)
+        previous = entry
+
+    return {
+        'farm_size': farm_size,
+        'totals': _finish(overall, farm_size),
+        'breakdown': breakdown,
+        # Records carry no acreage, so a crop's or season's share of the
+        # farm is unknown; these totals have no margin_per_acre.
+        'by_crop': [
+            dict(_finish(totals, margin=False), crop_name=crop)
+            for crop, totals in sorted(by_crop.items())
+        ],
+        'by_season': [
+            dict(_finish(totals, margin=False), season=season)
+            for season, totals in sorted(by_season.items())
+        ],
+        'by_year': years,
+    }
+
+
+def get_summary(farmer_profile):
+    """Return the cached summary for ``farmer_profile``, rebuilding it if stale."""
+    farmer_id = farmer_profile.id
+    key = (farmer_profile.cost_version, farmer_profile.farm_size)
+
+    with _cache_lock:
+        entry = _cache.get(farmer_id)
+        if entry and entry[0] == key:
+            _cache.move_to_end(farmer_id)
+            return entry[1]
+
+    summary = build_summary(farmer_id, farmer_profile.farm_size)
+
+    with _cache_lock:
+        _cache[farmer_id] = (key, summary)
+        _cache.move_to_end(farmer_id)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return summary
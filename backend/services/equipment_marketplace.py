@@ -0,0 +1,199 @@
+"""Cross-farmer equipment marketplace search.
+
+Lists other farmers' equipment offered for rent (or for sharing) newest
+first, keyset paginated on ``equipment.id``. Every filter is applied in
+SQL against composite indexes: the offer flag, type and price through the
+``ix_equipment_*`` indexes, the availability window through the rental
+overlap index (see ``services.equipment_rentals``) and distance through a
+latitude/longitude bounding box on ``ix_farmer_profiles_lat_lon`` (split
+in two where it crosses the antimeridian, and without a longitude bound
+when it reaches a pole). Only
+the rows of a page are loaded. The exact great-circle distance is then
+computed for them to trim the corners of the box; if that leaves the page
+short, the next keyset window is fetched.
+
+Distance is measured from ``lat``/``lon`` when given, otherwise from the
+searching farmer's own coordinates.
+"""
+
+import math
+
+from sqlalchemy import or_
+
+from models.database import db, User, FarmerProfile, Equipment
+from services.equipment_rentals import RentalError, parse_range, is_free
+
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.045
+
+
+class MarketplaceQueryError(ValueError):
+    """Invalid search parameter; reported to the client as a 400."""
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(math.sqrt(a), 1.0))
+
+
+def bounding_box(lat, lon, radius_km):
+    """``(min_lat, max_lat, lon_ranges)`` enclosing the search circle.
+
+    ``lon_ranges`` is a list of ``(min_lon, max_lon)`` ranges within
+    [-180, 180]: two when the box crosses the antimeridian, and empty when
+    the box reaches a pole and every longitude may match.
+    """
+    dlat = radius_km / KM_PER_DEGREE
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90 or max_lat >= 90:
+        return min_lat, max_lat, []
+
+    dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+    if dlon >= 180:
+        return min_lat, max_lat, []
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        return min_lat, max_lat, [(min_lon + 360, 180), (-180, max_lon)]
+    if max_lon > 180:
+        return min_lat, max_lat, [(min_lon, 180), (-180, max_lon - 360)]
+    return min_lat, max_lat, [(min_lon, max_lon)]
+
+
+def _number(args, name, cast=float):
+    if args.get(name) in (None, ''):
+        return None
+    try:
+        value = cast(args[name])
+    except ValueError:
+        raise MarketplaceQueryError(f'{name} must be a number')
+    if not math.isfinite(value):
+        raise MarketplaceQueryError(f'{name} must be a finite number')
+    return value
+
+
+def _origin(args, profile):
+    lat, lon = _number(args, 'lat'), _number(args, 'lon')
+    if (lat is None) != (lon is None):
+        raise MarketplaceQueryError('lat and lon must be given together')
+    if lat is not None and not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise MarketplaceQueryError('lat must be within [-90, 90] and lon within [-180, 180]')
+    if lat is None:
+        lat, lon = profile.latitude, profile.longitude
+    return (lat, lon) if lat is not None and lon is not None else None
+
+
+def search(profile, args):
+    """One page of marketplace equipment for the farmer ``profile``.
+
+    Returns ``(equipment, next_cursor)``.
+    """
+    limit = min(max(_number(args, 'limit', int) or DEFAULT_PAGE_SIZE, 1), MAX_PAGE_SIZE)
+    mode = args.get('mode', 'rent')
+    if mode not in ('rent', 'share'):
+        raise MarketplaceQueryError("mode must be 'rent' or 'share'")
+
+    query = (
+        db.session.query(
+            Equipment.id,
+            Equipment.equipment_name,
+            Equipment.equipment_type,
+            Equipment.description,
+            Equipment.rental_price_per_day,
+            Equipment.is_available_for_rent,
+            Equipment.is_available_for_share,
+            Equipment.condition,
+            Equipment.image_url,
+            User.full_name.label('owner_name'),
+            FarmerProfile.farm_location,
+            FarmerProfile.latitude,
+            FarmerProfile.longitude,
+        )
+        .join(FarmerProfile, Equipment.owner_id == FarmerProfile.id)
+        .join(User, FarmerProfile.user_id == User.id)
+        .filter(Equipment.owner_id != profile.id)
+    )
+    if mode == 'rent':
+        query = query.filter(Equipment.is_available_for_rent.is_(True))
+    else:
+        query = query.filter(Equipment.is_available_for_share.is_(True))
+
+    if args.get('equipment_type'):
+        query = query.filter(Equipment.equipment_type == args['equipment_type'])
+    if args.get('condition'):
+        query = query.filter(Equipment.condition.in_(args['condition'].split(',')))
+
+    min_price, max_price = _number(args, 'min_price'), _number(args, 'max_price')
+    if min_price is not None:
+        query = query.filter(Equipment.rental_price_per_day >= min_price)
+    if max_price is not None:
+        query = query.filter(Equipment.rental_price_per_day <= max_price)
+
+    days = None
+    if args.get('start_date'):
+        try:
+            start, end = parse_range(args.get('start_date'), args.get('end_date'))
+        except RentalError as e:
+            raise MarketplaceQueryError(str(e))
+        query = query.filter(is_free(start, end))
+        days = (end - start).days + 1
+
+    origin = _origin(args, profile)
+    radius = _number(args, 'radius_km')
+    if radius is not None:
+        if radius <= 0:
+            raise MarketplaceQueryError('radius_km must be positive')
+        if origin is None:
+            raise MarketplaceQueryError('radius_km needs lat/lon or coordinates on your farm profile')
+        min_lat, max_lat, lon_ranges = bounding_box(origin[0], origin[1], radius)
+        query = query.filter(FarmerProfile.latitude.between(min_lat, max_lat))
+        if lon_ranges:
+            query = query.filter(or_(*(
+                FarmerProfile.longitude.between(min_lon, max_lon)
+                for min_lon, max_lon in lon_ranges
+            )))
+        else:
+            query = query.filter(FarmerProfile.longitude.isnot(None))
+
+    after = _number(args, 'cursor', int)
+    batch_size = limit + 1 if radius is None else max(2 * limit, 50)
+    rows = []
+    while len(rows) <= limit:
+        window = query
+        if after is not None:
+            window = window.filter(Equipment.id < after)
+        batch = window.order_by(Equipment.id.desc()).limit(batch_size).all()
+        for row in batch:
+            distance = None
+            if origin is not None and row.latitude is not None and row.longitude is not None:
+                distance = haversine_km(origin[0], origin[1], row.latitude, row.longitude)
+            if radius is not None and distance > radius:
+                continue
+            rows.append((row, distance))
+        if len(batch) < batch_size:
+            break
+        after = batch[-1].id
+
+    next_cursor = str(rows[limit - 1][0].id) if len(rows) > limit else None
+    equipment = [{
+        'id': row.id,
+        'equipment_name': row.equipment_name,
+        'equipment_type': row.equipment_type,
+        'description': row.description,
+        'rental_price_per_day': row.rental_price_per_day,
+        'estimated_cost': row.rental_price_per_day * days if days and row.rental_price_per_day else None,
+        'is_available_for_rent': row.is_available_for_rent,
+        'is_available_for_share': row.is_available_for_share,
+        'condition': row.condition,
+        'image_url': row.image_url,
+        'owner_name': row.owner_name,
+        'owner_location': row.farm_location,
+        'distance_km': round(distance, 1) if distance is not None else None,
+    } for row, distance in rows[:limit]]
+    return equipment, next_cursor
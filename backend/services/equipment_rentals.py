@@ -0,0 +1,212 @@
+"""Equipment rental availability and booking.
+
+A machine is unavailable for a date range when it has a pending or active
+rental whose ``[start_date, end_date]`` overlaps it (both ends inclusive).
+Overlaps are found with a range query on the
+``ix_equipment_rentals_equipment_dates`` index: the seek on
+``(equipment_id, start_date <= end)`` is logarithmic in the number of
+rentals, and ``end_date >= start`` is checked from the same index entry.
+Many machines are checked at once with a single ``NOT EXISTS`` (``is_free``,
+used by the marketplace search) rather than one query per machine.
+
+Bookings lock the equipment row with a no-op UPDATE before the overlap
+check, so two farmers booking the same dates cannot both succeed.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import and_, exists
+from sqlalchemy.orm import aliased
+
+from models.database import db, FarmerProfile, User, Equipment, EquipmentRental
+
+
+# Rentals that hold the machine for their dates
+BLOCKING_STATUSES = ('pending', 'active')
+RENTAL_STATUSES = ('pending', 'active', 'completed', 'cancelled')
+# Statuses a rental may move to from each status; rentals only move forward
+RENTAL_TRANSITIONS = {
+    'pending': ('active', 'cancelled'),
+    'active': ('completed', 'cancelled'),
+    'completed': (),
+    'cancelled': (),
+}
+
+
+class RentalError(ValueError):
+    """Raised when a rental cannot be booked or changed; carries an HTTP status."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def parse_range(start_value, end_value):
+    """Parse a ``YYYY-MM-DD`` date range, defaulting the end to the start."""
+    if not start_value:
+        raise RentalError('start_date is required')
+    try:
+        start = datetime.strptime(start_value, '%Y-%m-%d').date()
+        end = datetime.strptime(end_value, '%Y-%m-%d').date() if end_value else start
+    except ValueError:
+        raise RentalError('Dates must be in YYYY-MM-DD format')
+    if end < start:
+        raise RentalError('end_date must not be before start_date')
+    return start, end
+
+
+def overlaps(start, end, equipment_id=None):
+    """Condition for blocking rentals overlapping ``[start, end]``.
+
+    ``equipment_id`` may be a column (correlated subquery) or a value.
+    """
+    conditions = [
+        EquipmentRental.start_date <= end,
+        EquipmentRental.end_date >= start,
+        EquipmentRental.status.in_(BLOCKING_STATUSES),
+    ]
+    if equipment_id is not None:
+        conditions.insert(0, EquipmentRental.equipment_id == equipment_id)
+    return and_(*conditions)
+
+
+def is_free(start, end):
+    """Filter for ``Equipment`` queries: no blocking rental in the range."""
+    return ~exists().where(overlaps(start, end, Equipment.id))
+
+
+def booked_ranges(equipment_id, start=None, end=None):
+    """Blocking rentals of one machine, optionally limited to a window."""
+    query = db.session.query(
+        EquipmentRental.start_date, EquipmentRental.end_date, EquipmentRental.status
+    ).filter(
+        EquipmentRental.equipment_id == equipment_id,
+        EquipmentRental.status.in_(BLOCKING_STATUSES),
+    )
+    if start is not None and end is not None:
+        query = query.filter(EquipmentRental.start_date <= end, EquipmentRental.end_date >= start)
+    else:
+        query = query.filter(EquipmentRental.end_date >= date.today())
+    return [
+        {'start_date': s.isoformat(), 'end_date': e.isoformat(), 'status': status}
+        for s, e, status in query.order_by(EquipmentRental.start_date)
+    ]
+
+
+def book(equipment_id, renter_id, start, end):
+    """Create a pending rental of ``equipment_id`` for ``[start, end]`` and commit."""
+    if start < date.today():
+        raise RentalError('Rentals cannot start in the past')
+
+    try:
+        equipment = db.session.get(Equipment, equipment_id)
+        if equipment is None:
+            raise RentalError('Equipment not found', 404)
+        if not equipment.is_available_for_rent:
+            raise RentalError('Equipment is not available for rent')
+        if equipment.owner_id == renter_id:
+            raise RentalError('You cannot rent your own equipment')
+        if not equipment.rental_price_per_day:
+            raise RentalError('Equipment has no rental price')
+
+        table = Equipment.__table__
+        db.session.execute(
+            table.update().where(table.c.id == equipment_id).values(id=table.c.id)
+        )
+        booked = db.session.query(
+            exists().where(overlaps(start, end, equipment_id))
+        ).scalar()
+        if booked:
+            raise RentalError('Equipment is already booked for those dates', 409)
+
+        total_days = (end - start).days + 1
+        rental = EquipmentRental(
+            equipment_id=equipment_id,
+            renter_id=renter_id,
+            start_date=start,
+            end_date=end,
+            total_days=total_days,
+            rental_rate=equipment.rental_price_per_day,
+            total_cost=equipment.rental_price_per_day * total_days,
+            status='pending',
+        )
+        db.session.add(rental)
+        db.session.commit()
+        return rental
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def update_status(rental_id, farmer_id, status):
+    """Change a rental's status as its equipment owner or its renter and commit.
+
+    The owner may confirm (active), complete or cancel; the renter may only
+    cancel a rental that has not started.
+    """
+    if status not in RENTAL_STATUSES:
+        raise RentalError('Invalid status value')
+
+    rental = db.session.get(EquipmentRental, rental_id)
+    if rental is None:
+        raise RentalError('Rental not found', 404)
+    is_owner = rental.equipment.owner_id == farmer_id
+    if not is_owner and rental.renter_id != farmer_id:
+        raise RentalError('Rental not found', 404)
+    if not is_owner and not (status == 'cancelled' and rental.status == 'pending'):
+        raise RentalError('Renters can only cancel pending rentals', 403)
+    if status not in RENTAL_TRANSITIONS[rental.status]:
+        raise RentalError(f'Cannot change a {rental.status} rental to {status}', 409)
+
+    rental.status = status
+    db.session.commit()
+    return rental
+
+
+def list_rentals(farmer_id):
+    """Rentals the farmer made and rentals of the farmer's equipment."""
+    owner_user = aliased(User)
+    owner_profile = aliased(FarmerProfile)
+    renter_user = aliased(User)
+    rows = (
+        db.session.query(
+            EquipmentRental,
+            Equipment.equipment_name,
+            Equipment.owner_id,
+            owner_user.full_name,
+            renter_user.full_name,
+        )
+        .join(Equipment, EquipmentRental.equipment_id == Equipment.id)
+        .join(owner_profile, Equipment.owner_id == owner_profile.id)
+        .join(owner_user, owner_profile.user_id == owner_user.id)
+        .join(FarmerProfile, EquipmentRental.renter_id == FarmerProfile.id)
+        .join(renter_user, FarmerProfile.user_id == renter_user.id)
+        .filter((EquipmentRental.renter_id == farmer_id) | (Equipment.owner_id == farmer_id))
+        .order_by(EquipmentRental.start_date.desc(), EquipmentRental.id.desc())
+    )
+
+    rentals, bookings = [], []
+    for rental, equipment_name, owner_id, owner_name, renter_name in rows:
+        item = serialize_rental(rental, equipment_name)
+        item['owner_name'] = owner_name
+        item['renter_name'] = renter_name
+        (bookings if owner_id == farmer_id else rentals).append(item)
+    return rentals, bookings
+
+
+def serialize_rental(rental, equipment_name=None):
+    return {
+        'id': rental.id,
+        'equipment_id': rental.equipment_id,
+        'equipment_name': equipment_name,
+        'renter_id': rental.renter_id,
+        'start_date': rental.start_date.isoformat(),
+        'end_date': rental.end_date.isoformat(),
+        'total_days': rental.total_days,
+        'rental_rate': rental.rental_rate,
+        'total_cost': rental.total_cost,
+        'status': rental.status,
+        'created_at': rental.created_at.isoformat() if rental.created_at else None,
+    }
+
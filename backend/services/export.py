@@ -0,0 +1,129 @@
+"""Streaming spreadsheet exports.
+
+Rows come straight from a ``yield_per`` query, executed while the view
+runs, and are written to the response in chunks, so memory use does not depend on how many rows are
+exported. CSV can optionally be gzip-compressed on the fly. XLSX uses
+openpyxl's write-only mode, which spools rows to a temporary file; the
+workbook is finished before the download starts and is limited to one
+sheet's worth of rows, so very large exports should use CSV.
+
+Text that a spreadsheet would run as a formula (starting with ``=``, ``+``,
+``-``, ``@``, tab or carriage return) is prefixed with ``'`` in both formats.
+"""
+
+import csv
+import io
+import tempfile
+import zlib
+from datetime import date, datetime
+from enum import Enum
+
+from flask import Response, send_file, stream_with_context
+
+
+YIELD_PER = 1000
+FLUSH_BYTES = 64 * 1024
+
+FORMATS = ('csv', 'xlsx')
+
+XLSX_MAX_ROWS = 1048575  # one sheet, less the header row
+
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _cell(value):
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _iter_rows(query):
+    """Execute ``query`` now and convert its rows as they are read.
+
+    The query runs before the response starts streaming, still inside the
+    view, so ``read_only`` sends it to the replica (and re-runs the view on
+    the primary if the replica fails). Later batches come from the same
+    cursor.
+    """
+    result = query.session.execute(query.statement, execution_options={'yield_per': YIELD_PER})
+    return ([_cell(value) for value in row] for row in result)
+
+
+def _csv_chunks(header, rows, compress):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    gzip = zlib.compressobj(wbits=31) if compress else None
+
+    def drain():
+        data = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate(0)
+        return gzip.compress(data) if gzip else data
+
+    writer.writerow(header)
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= FLUSH_BYTES:
+            chunk = drain()
+            if chunk:
+                yield chunk
+
+    chunk = drain()
+    if gzip:
+        chunk += gzip.flush()
+    if chunk:
+        yield chunk
+
+
+def csv_response(header, query, filename, compress=False):
+    """Stream ``query`` rows as a CSV attachment (``.csv.gz`` if compressed)."""
+    if compress:
+        filename += '.csv.gz'
+        mimetype = 'application/gzip'
+    else:
+        filename += '.csv'
+        mimetype = 'text/csv'
+
+    return Response(
+        stream_with_context(_csv_chunks(header, _iter_rows(query), compress)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+def xlsx_response(header, query, filename):
+    """Write ``query`` rows to a write-only XLSX workbook and send it."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=filename[:31])
+    sheet.append(header)
+    for count, row in enumerate(_iter_rows(query), 1):
+        if count > XLSX_MAX_ROWS:
+            raise ValueError(f'Too many rows for XLSX (limit {XLSX_MAX_ROWS}); use format=csv')
+        sheet.append(row)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    workbook.save(spool)
+    spool.seek(0)
+
+    return send_file(
+        spool,
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        as_attachment=True,
+        download_name=f'{filename}.xlsx',
+    )
+
+
+def export_response(request, header, query, filename):
+    """Build a CSV or XLSX response from ``?format=`` and ``?gzip=1``."""
+    fmt = request.args.get('format', 'csv')
+    if fmt not in FORMATS:
+        raise ValueError(f'Invalid format. Allowed: {list(FORMATS)}')
+    if fmt == 'xlsx':
+        return xlsx_response(header, query, filename)
+    return csv_response(header, query, filename, compress=request.args.get('gzip') == '1')
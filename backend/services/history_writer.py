@@ -0,0 +1,142 @@
+"""Write-behind buffer for ``RecommendationHistory`` rows.
+
+Recommendation endpoints enqueue plain row mappings instead of committing
+them on the request thread. A background thread flushes the buffer with
+``bulk_insert_mappings`` every ``HISTORY_FLUSH_INTERVAL`` seconds or as soon
+as ``HISTORY_BATCH_SIZE`` rows are pending, and whatever is left is flushed
+when the process exits.
+
+If a batch fails, its rows are retried one by one: rows the database
+rejects (say, for a farmer deleted in the meantime) are dropped and
+counted in ``discarded``, so one bad row cannot block every later flush.
+Other failures (the database being unreachable) keep the rows queued,
+up to ``HISTORY_QUEUE_MAX``.
+"""
+
+import atexit
+import os
+import threading
+from datetime import datetime
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from models.database import db, RecommendationHistory
+from services.recommendation_history import build_history_row
+
+
+class HistoryWriter:
+    """Bounded in-process write-behind queue for recommendation history."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._rows = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+        self.discarded = 0  # rows dropped since startup
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Bind the writer to ``app`` and register the shutdown flush."""
+        self.app = app
+        self.flush_interval = app.config.get('HISTORY_FLUSH_INTERVAL', 2.0)
+        self.batch_size = app.config.get('HISTORY_BATCH_SIZE', 100)
+        self.max_pending = app.config.get('HISTORY_QUEUE_MAX', 1000)
+        atexit.register(self.flush)
+
+    def enqueue(self, farmer_id, recommendation_type, inputs, result):
+        """Buffer one history row; it is persisted on the next flush."""
+        row = build_history_row(farmer_id, recommendation_type, inputs, result)
+        row['created_at'] = datetime.utcnow()
+
+        with self._lock:
+            self._rows.append(row)
+            pending = len(self._rows)
+
+        if pending >= self.max_pending:
+            # Queue is full: apply backpressure by flushing on the caller.
+            self.flush()
+        elif pending >= self.batch_size:
+            self._wakeup.set()
+
+        self._ensure_thread()
+
+    def pending_rows(self, farmer_id):
+        """Rows buffered in this process for ``farmer_id``, oldest first."""
+        with self._lock:
+            return [row for row in self._rows if row['farmer_id'] == farmer_id]
+
+    def flush(self):
+        """Write all buffered rows in a single transaction; return how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+            if not rows or self.app is None:
+                return 0
+
+            with self.app.app_context():
+                try:
+                    db.session.bulk_insert_mappings(RecommendationHistory, rows)
+                    db.session.commit()
+                    return len(rows)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"History flush of {len(rows)} rows failed, retrying row by row: {e}")
+                return self._flush_rows(rows)
+
+    def _flush_rows(self, rows):
+        written = 0
+        for index, row in enumerate(rows):
+            try:
+                db.session.bulk_insert_mappings(RecommendationHistory, [row])
+                db.session.commit()
+                written += 1
+            except (IntegrityError, DataError) as e:
+                db.session.rollback()
+                self._discard(1, f"row for farmer {row['farmer_id']} rejected: {e.orig}")
+            except Exception as e:
+                db.session.rollback()
+                print(f"History flush failed, requeueing {len(rows) - index} rows: {e}")
+                self._requeue(rows[index:])
+                break
+        return written
+
+    def _requeue(self, rows):
+        with self._lock:
+            rows = rows + self._rows
+            self._rows = rows[:self.max_pending]
+        overflow = len(rows) - self.max_pending
+        if overflow > 0:
+            self._discard(overflow, 'queue full')
+
+    def _discard(self, count, reason):
+        with self._lock:
+            self.discarded += count
+            total = self.discarded
+        print(f"History writer dropped {count} rows ({reason}); {total} dropped since startup")
+
+    def _ensure_thread(self):
+        """Start the flusher thread (again, after a fork) if needed."""
+        pid = os.getpid()
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(
+                target=self._run, name='history-writer', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+history_writer = HistoryWriter()
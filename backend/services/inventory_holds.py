@@ -0,0 +1,139 @@
+"""Expiring inventory holds for checkout.
+
+A hold reserves stock for one buyer for ``HOLD_TTL_SECONDS``. Holds do not
+touch the listing's stock column; the quantity a new cart can take is the
+stock minus the sum of active, unexpired holds, read from the partial
+``ix_inventory_holds_active`` index. A hold past ``expires_at`` stops
+counting immediately. The sweeper thread (and ``flask expire-holds``) only
+marks such holds ``expired`` so the active index stays small.
+"""
+
+import os
+import threading
+from datetime import datetime
+
+from sqlalchemy import func
+
+from models.database import db, InventoryHold
+
+
+ACTIVE = 'active'
+CONFIRMED = 'confirmed'
+RELEASED = 'released'
+EXPIRED = 'expired'
+
+
+def held_quantity(item_type, item_id, now=None):
+    """Scalar subquery: active hold quantity on one listing/product."""
+    now = now or datetime.utcnow()
+    return (
+        db.session.query(func.coalesce(func.sum(InventoryHold.quantity), 0.0))
+        .filter(
+            InventoryHold.item_type == item_type,
+            InventoryHold.item_id == item_id,
+            InventoryHold.status == ACTIVE,
+            InventoryHold.expires_at > now,
+        )
+        .scalar_subquery()
+    )
+
+
+def held_quantities(item_type, item_ids):
+    """Return ``{item_id: held quantity}`` for ``item_ids`` in one query."""
+    if not item_ids:
+        return {}
+    rows = (
+        db.session.query(InventoryHold.item_id, func.sum(InventoryHold.quantity))
+        .filter(
+            InventoryHold.item_type == item_type,
+            InventoryHold.item_id.in_(item_ids),
+            InventoryHold.status == ACTIVE,
+            InventoryHold.expires_at > datetime.utcnow(),
+        )
+        .group_by(InventoryHold.item_id)
+    )
+    return dict(rows.all())
+
+
+def serialize_hold(hold):
+    return {
+        'id': hold.id,
+        'type': hold.item_type,
+        'item_id': hold.item_id,
+        'quantity': hold.quantity,
+        'status': hold.status,
+        'expires_at': hold.expires_at.isoformat(),
+        'order_id': hold.order_id,
+    }
+
+
+def expire_holds():
+    """Mark active holds past their expiry as expired; return how many."""
+    try:
+        table = InventoryHold.__table__
+        expired = db.session.execute(
+            table.update()
+            .where(table.c.status == ACTIVE, table.c.expires_at <= datetime.utcnow())
+            .values(status=EXPIRED)
+        ).rowcount
+        db.session.commit()
+        return expired
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+class HoldSweeper:
+    """Background thread that expires stale holds every ``HOLD_SWEEP_INTERVAL``."""
+
+    def __init__(self, app=None):
+        self.app = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Bind the sweeper to ``app`` and start it, so every worker expires holds."""
+        self.app = app
+        self.interval = app.config.get('HOLD_SWEEP_INTERVAL', 60)
+        self.ensure_running()
+
+    def ensure_running(self):
+        """Start the sweeper thread (again, after a fork) if needed."""
+        pid = os.getpid()
+        if self.app is None:
+            return
+        if self._thread is not None and self._pid == pid and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == pid and self._thread.is_alive():
+                return
+            self._pid = pid
+            self._thread = threading.Thread(
+                target=self._run, name='hold-sweeper', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        stop = threading.Event()
+        while not stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    expire_holds()
+                except Exception as e:
+                    print(f"Hold sweep failed: {e}")
+
+
+hold_sweeper = HoldSweeper()
+
+
+def register_hold_commands(app):
+    """Register the ``expire-holds`` CLI command on ``app``."""
+
+    @app.cli.command('expire-holds')
+    def expire_holds_command():
+        """Mark inventory holds past their expiry as expired."""
+        expired = expire_holds()
+        print(f"✓ Expired {expired} inventory holds")
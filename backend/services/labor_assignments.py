@@ -0,0 +1,111 @@
+"""Slot claiming for labor postings.
+
+A posting needs ``laborers_needed`` workers and counts claimed slots in
+``laborers_filled``. Applying takes a slot with one conditional
+``UPDATE ... SET laborers_filled = laborers_filled + 1 WHERE laborers_filled
+< laborers_needed`` and records the worker in ``labor_assignments`` in the
+same transaction, so concurrent applicants can never overfill a posting.
+The unique (posting, labor) key stops a worker taking two slots: the
+duplicate insert fails and the rollback returns the slot. Lowering
+``laborers_needed`` is conditional on ``laborers_filled`` the same way, so it
+cannot race a claim into an overfilled posting.
+"""
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from models.database import db, User, LaborProfile, LaborHiring, LaborAssignment
+
+
+class AssignmentError(ValueError):
+    """Raised when a slot cannot be claimed; carries an HTTP status."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _already_assigned(posting_id, labor_id):
+    return db.session.query(
+        LaborAssignment.query.filter_by(posting_id=posting_id, labor_id=labor_id).exists()
+    ).scalar()
+
+
+def _claim_failure(posting_id, labor_id):
+    """Explain why the conditional claim matched no row."""
+    posting = db.session.get(LaborHiring, posting_id)
+    if posting is None:
+        return AssignmentError('Job posting not found', 404)
+    if _already_assigned(posting_id, labor_id):
+        return AssignmentError('You have already applied for this job', 409)
+    if posting.status != 'open':
+        return AssignmentError('Job posting is no longer open', 409)
+    return AssignmentError('All positions for this job are filled', 409)
+
+
+def claim_slot(posting_id, labor_id):
+    """Assign the worker to one open slot of the posting and commit."""
+    table = LaborHiring.__table__
+    claimed = db.session.execute(
+        table.update()
+        .where(
+            table.c.id == posting_id,
+            table.c.status == 'open',
+            table.c.laborers_filled < table.c.laborers_needed,
+        )
+        .values(
+            laborers_filled=table.c.laborers_filled + 1,
+            labor_id=func.coalesce(table.c.labor_id, labor_id),
+        )
+    ).rowcount
+    if not claimed:
+        db.session.rollback()
+        raise _claim_failure(posting_id, labor_id)
+
+    try:
+        db.session.add(LaborAssignment(posting_id=posting_id, labor_id=labor_id))
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        raise AssignmentError('You have already applied for this job', 409)
+
+
+def set_laborers_needed(posting_id, laborers_needed):
+    """Change the slot count unless more workers are already assigned.
+
+    The caller commits; on a conflict nothing is written.
+    """
+    table = LaborHiring.__table__
+    updated = db.session.execute(
+        table.update()
+        .where(table.c.id == posting_id, table.c.laborers_filled <= laborers_needed)
+        .values(laborers_needed=laborers_needed)
+    ).rowcount
+    if not updated:
+        raise AssignmentError('Cannot need fewer laborers than are already assigned', 409)
+
+
+def assigned_workers(posting_ids):
+    """Return ``{posting_id: [worker, ...]}`` in assignment order."""
+    workers = {}
+    if not posting_ids:
+        return workers
+    rows = (
+        db.session.query(
+            LaborAssignment.posting_id,
+            LaborProfile.id,
+            User.full_name,
+            User.phone,
+        )
+        .join(LaborProfile, LaborAssignment.labor_id == LaborProfile.id)
+        .join(User, LaborProfile.user_id == User.id)
+        .filter(LaborAssignment.posting_id.in_(posting_ids))
+        .order_by(LaborAssignment.id)
+    )
+    for posting_id, labor_id, full_name, phone in rows:
+        workers.setdefault(posting_id, []).append({
+            'labor_id': labor_id,
+            'name': full_name,
+            'phone': phone,
+        })
+    return workers
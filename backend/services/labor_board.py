@@ -0,0 +1,245 @@
+"""Labor job board queries.
+
+Each list is one projection query: the posting columns joined to the
+farmer's profile and user (the farmer view adds one query for the workers
+assigned on the page), so a page costs the same however many rows it
+holds. Pages are keyset paginated newest first on ``(created_at, id)``:
+the opaque ``next_cursor`` of a page is the position of its last row and
+the next page continues from there through the ``ix_labor_hiring_*_created``
+indexes (a worker's jobs through ``ix_labor_assignments_labor_created``)
+instead of skipping an OFFSET.
+
+Pages hold ``limit`` rows (default ``DEFAULT_PAGE_SIZE``, at most
+``MAX_PAGE_SIZE``); clients request the next page with ``next_cursor`` when
+the user asks for more. Totals that need every row, such as a worker's
+earnings, are aggregated in SQL instead.
+
+Filters: ``work_type`` (matched through the normalized tag index, so
+"Harvest" finds "harvesting" postings), ``start_from`` / ``start_to``
+(YYYY-MM-DD, on start_date) and ``min_wage`` (daily wage).
+"""
+
+import base64
+from datetime import date, datetime
+
+from sqlalchemy import and_, case, func, or_, select
+
+from models.database import (
+    db,
+    User,
+    FarmerProfile,
+    LaborHiring,
+    LaborAssignment,
+    LaborPostingTag,
+)
+from services.labor_matching import normalize_tag
+from services.labor_assignments import assigned_workers
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+POSTING_COLUMNS = (
+    LaborHiring.id,
+    LaborHiring.job_title,
+    LaborHiring.description,
+    LaborHiring.work_type,
+    LaborHiring.start_date,
+    LaborHiring.end_date,
+    LaborHiring.total_days,
+    LaborHiring.daily_wage,
+    LaborHiring.total_wage,
+    LaborHiring.location,
+    LaborHiring.laborers_needed,
+    LaborHiring.laborers_filled,
+    LaborHiring.status,
+    LaborHiring.created_at,
+)
+
+
+class BoardQueryError(ValueError):
+    """Invalid filter, limit or cursor; reported to the client as a 400."""
+
+
+def encode_cursor(created_at, posting_id):
+    raw = f"{created_at.isoformat()}|{posting_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, posting_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(posting_id)
+    except ValueError:
+        raise BoardQueryError('Invalid cursor')
+
+
+def _page_size(args):
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise BoardQueryError('limit must be an integer')
+    return min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def _date_arg(args, name):
+    try:
+        return datetime.strptime(args[name], '%Y-%m-%d').date()
+    except ValueError:
+        raise BoardQueryError(f'{name} must be a date in YYYY-MM-DD format')
+
+
+def _filtered(query, args):
+    if args.get('work_type'):
+        tagged = select(LaborPostingTag.posting_id).where(
+            LaborPostingTag.tag == normalize_tag(args['work_type'])
+        )
+        query = query.filter(LaborHiring.id.in_(tagged))
+    if args.get('start_from'):
+        query = query.filter(LaborHiring.start_date >= _date_arg(args, 'start_from'))
+    if args.get('start_to'):
+        query = query.filter(LaborHiring.start_date <= _date_arg(args, 'start_to'))
+    if args.get('min_wage'):
+        try:
+            min_wage = float(args['min_wage'])
+        except ValueError:
+            raise BoardQueryError('min_wage must be a number')
+        query = query.filter(LaborHiring.daily_wage >= min_wage)
+    return query
+
+
+def _page(query, args):
+    """Apply filters and the keyset window; return ``(rows, next_cursor)``."""
+    query = _filtered(query, args)
+    if args.get('cursor'):
+        created_at, posting_id = decode_cursor(args['cursor'])
+        query = query.filter(or_(
+            LaborHiring.created_at < created_at,
+            and_(LaborHiring.created_at == created_at, LaborHiring.id < posting_id),
+        ))
+
+    limit = _page_size(args)
+    rows = (
+        query.order_by(LaborHiring.created_at.desc(), LaborHiring.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def _with_farmer(query):
+    return (
+        query.join(FarmerProfile, LaborHiring.farmer_id == FarmerProfile.id)
+        .join(User, FarmerProfile.user_id == User.id)
+    )
+
+
+def open_postings(args):
+    """One page of open postings for the labor job board."""
+    query = _with_farmer(db.session.query(
+        *POSTING_COLUMNS,
+        User.full_name.label('farmer_name'),
+        FarmerProfile.farm_location,
+    )).filter(
+        LaborHiring.status == 'open',
+        LaborHiring.laborers_filled < LaborHiring.laborers_needed,
+    )
+    rows, next_cursor = _page(query, args)
+
+    postings = [{
+        'id': row.id,
+        'farmer_name': row.farmer_name or 'Unknown',
+        'farmer_location': row.farm_location,
+        'job_title': row.job_title,
+        'description': row.description,
+        'work_type': row.work_type,
+        'start_date': row.start_date.isoformat(),
+        'end_date': row.end_date.isoformat() if row.end_date else None,
+        'wage_per_day': row.daily_wage,
+        'total_wage': row.total_wage,
+        'location': row.location,
+        'laborers_needed': row.laborers_needed,
+        'laborers_filled': row.laborers_filled,
+        'total_days': row.total_days,
+    } for row in rows]
+    return postings, next_cursor
+
+
+def labor_jobs(labor_id, args):
+    """One page of the jobs a labor profile holds a slot in."""
+    query = _with_farmer(
+        db.session.query(*POSTING_COLUMNS, User.full_name.label('farmer_name'))
+        .join(LaborAssignment, LaborAssignment.posting_id == LaborHiring.id)
+    ).filter(LaborAssignment.labor_id == labor_id)
+    rows, next_cursor = _page(query, args)
+
+    jobs = [{
+        'id': row.id,
+        'farmer_name': row.farmer_name or 'Unknown',
+        'job_title': row.job_title,
+        'work_type': row.work_type,
+        'start_date': row.start_date.isoformat(),
+        'end_date': row.end_date.isoformat() if row.end_date else None,
+        'daily_wage': row.daily_wage,
+        'total_wage': row.total_wage,
+        'status': row.status,
+    } for row in rows]
+    return jobs, next_cursor
+
+
+def labor_earnings(labor_id):
+    """Earnings from a labor profile's completed jobs: total, this month, count.
+
+    A job pays its ``total_wage``, or ``daily_wage`` times ``total_days`` when
+    no total was set (null or 0). "This month" counts jobs posted this calendar month.
+    """
+    wage = func.coalesce(
+        func.nullif(LaborHiring.total_wage, 0),
+        LaborHiring.daily_wage * LaborHiring.total_days,
+        0.0,
+    )
+    month_start = datetime.combine(date.today().replace(day=1), datetime.min.time())
+    total, this_month, completed = (
+        db.session.query(
+            func.coalesce(func.sum(wage), 0.0),
+            func.coalesce(func.sum(case((LaborHiring.created_at >= month_start, wage), else_=0.0)), 0.0),
+            func.count(LaborHiring.id),
+        )
+        .join(LaborAssignment, LaborAssignment.posting_id == LaborHiring.id)
+        .filter(LaborAssignment.labor_id == labor_id, LaborHiring.status == 'completed')
+        .one()
+    )
+    return {'total': float(total), 'this_month': float(this_month), 'completed': completed}
+
+
+def farmer_postings(farmer_id, args):
+    """One page of a farmer's postings with their assigned workers."""
+    query = db.session.query(*POSTING_COLUMNS).filter(LaborHiring.farmer_id == farmer_id)
+    rows, next_cursor = _page(query, args)
+    workers = assigned_workers([row.id for row in rows])
+
+    postings = [{
+        'id': row.id,
+        'job_title': row.job_title,
+        'description': row.description,
+        'work_type': row.work_type,
+        'start_date': row.start_date.isoformat(),
+        'end_date': row.end_date.isoformat() if row.end_date else None,
+        'total_days': row.total_days,
+        'wage_per_day': row.daily_wage,
+        'total_wage': row.total_wage,
+        'status': row.status,
+        'location': row.location,
+        'laborers_needed': row.laborers_needed,
+        'laborers_filled': row.laborers_filled,
+        'workers': workers.get(row.id, []),
+        # First worker, for clients written before multi-worker postings
+        'labor_name': workers[row.id][0]['name'] if row.id in workers else None,
+        'labor_phone': workers[row.id][0]['phone'] if row.id in workers else None,
+    } for row in rows]
+    return postings, next_cursor
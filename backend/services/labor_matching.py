@@ -0,0 +1,350 @@
+"""Labor job matching on normalized skill tags.
+
+Free-text skills ("Planting, Harvesting") and posting work types are parsed
+into normalized tags and kept in ``labor_skill_tags`` / ``labor_posting_tags``
+by mapper events (migration 0010 fills them for existing rows). Both
+directions of matching start from the ``tag`` index of those tables, so only
+profiles or postings sharing at least one tag are loaded and scored on skill
+overlap, wage fit and location. When more than ``MAX_CANDIDATES`` share a
+tag, the ones with the most shared tags are scored (newest postings, oldest
+profiles first among equals), so the candidate set is stable.
+
+Profiles and postings have no coordinates, so location is scored as the
+share of the posting's location words (village, district, ...) that also
+appear in the worker's address.
+"""
+
+import json
+import re
+
+from sqlalchemy import delete, event, func, inspect, insert, select
+
+from models.database import (
+    db,
+    User,
+    FarmerProfile,
+    LaborProfile,
+    LaborHiring,
+    LaborAssignment,
+    LaborSkillTag,
+    LaborPostingTag,
+)
+
+
+# Common spellings -> canonical tag
+SKILL_SYNONYMS = {
+    'harvest': 'harvesting',
+    'reaping': 'harvesting',
+    'picking': 'harvesting',
+    'plant': 'planting',
+    'sowing': 'planting',
+    'seeding': 'planting',
+    'transplanting': 'planting',
+    'irrigate': 'irrigation',
+    'watering': 'irrigation',
+    'weed': 'weeding',
+    'weed control': 'weeding',
+    'spray': 'spraying',
+    'pesticide spraying': 'spraying',
+    'pest control': 'spraying',
+    'plough': 'plowing',
+    'ploughing': 'plowing',
+    'tilling': 'plowing',
+    'tillage': 'plowing',
+    'tractor': 'tractor driving',
+    'tractor operation': 'tractor driving',
+    'fertilizing': 'fertilizer application',
+    'fertiliser application': 'fertilizer application',
+    'dairy': 'livestock',
+    'cattle': 'livestock',
+}
+VOCABULARY = set(SKILL_SYNONYMS) | set(SKILL_SYNONYMS.values())
+
+WEIGHTS = {'skills': 0.6, 'wage': 0.25, 'location': 0.15}
+MAX_TAG_LENGTH = 50
+MAX_CANDIDATES = 500  # tag matches scored per request
+
+
+def normalize_tag(text):
+    """Lowercase, strip punctuation and map synonyms to one canonical tag."""
+    tag = ' '.join(re.findall(r'[a-z0-9]+', text.lower()))[:MAX_TAG_LENGTH]
+    return SKILL_SYNONYMS.get(tag, tag)
+
+
+def parse_skills(skills):
+    """Return the set of tags in a skills value (JSON list or comma separated)."""
+    if not skills:
+        return set()
+    items = skills
+    if isinstance(skills, str):
+        try:
+            parsed = json.loads(skills)
+        except ValueError:
+            parsed = None
+        items = parsed if isinstance(parsed, list) else re.split(r'[,;/|\n]+', skills)
+    return {tag for tag in (normalize_tag(str(item)) for item in items) if tag}
+
+
+def posting_tags(work_type, job_title=None):
+    """Tags of a posting: its work type plus known skills named in the title."""
+    tags = parse_skills(work_type)
+    if job_title:
+        words = re.findall(r'[a-z]+', job_title.lower())
+        tags |= {SKILL_SYNONYMS.get(word, word) for word in words if word in VOCABULARY}
+    return tags
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance
+# ---------------------------------------------------------------------------
+
+def _replace_tags(connection, model, owner_key, owner_id, tags):
+    table = model.__table__
+    connection.execute(delete(table).where(table.c[owner_key] == owner_id))
+    if tags:
+        connection.execute(
+            insert(table),
+            [{'tag': tag, owner_key: owner_id} for tag in sorted(tags)]
+        )
+
+
+@event.listens_for(LaborProfile, 'after_insert')
+def _index_new_profile(mapper, connection, profile):
+    _replace_tags(connection, LaborSkillTag, 'labor_id', profile.id, parse_skills(profile.skills))
+
+
+@event.listens_for(LaborProfile, 'after_update')
+def _reindex_profile(mapper, connection, profile):
+    if inspect(profile).attrs.skills.history.has_changes():
+        _replace_tags(connection, LaborSkillTag, 'labor_id', profile.id, parse_skills(profile.skills))
+
+
+@event.listens_for(LaborProfile, 'before_delete')
+def _unindex_profile(mapper, connection, profile):
+    _replace_tags(connection, LaborSkillTag, 'labor_id', profile.id, ())
+
+
+@event.listens_for(LaborHiring, 'after_insert')
+def _index_new_posting(mapper, connection, posting):
+    _replace_tags(
+        connection, LaborPostingTag, 'posting_id', posting.id,
+        posting_tags(posting.work_type, posting.job_title)
+    )
+
+
+@event.listens_for(LaborHiring, 'after_update')
+def _reindex_posting(mapper, connection, posting):
+    attrs = inspect(posting).attrs
+    if attrs.work_type.history.has_changes() or attrs.job_title.history.has_changes():
+        _replace_tags(
+            connection, LaborPostingTag, 'posting_id', posting.id,
+            posting_tags(posting.work_type, posting.job_title)
+        )
+
+
+@event.listens_for(LaborHiring, 'before_delete')
+def _unindex_posting(mapper, connection, posting):
+    _replace_tags(connection, LaborPostingTag, 'posting_id', posting.id, ())
+
+
+def sync_labor_tags():
+    """Rebuild the tag tables from existing rows with the current parser."""
+    skill_rows = [
+        {'tag': tag, 'labor_id': labor_id}
+        for labor_id, skills in db.session.query(LaborProfile.id, LaborProfile.skills)
+        for tag in parse_skills(skills)
+    ]
+    posting_rows = [
+        {'tag': tag, 'posting_id': posting_id}
+        for posting_id, work_type, job_title
+        in db.session.query(LaborHiring.id, LaborHiring.work_type, LaborHiring.job_title)
+        for tag in posting_tags(work_type, job_title)
+    ]
+
+    db.session.execute(delete(LaborSkillTag))
+    db.session.execute(delete(LaborPostingTag))
+    if skill_rows:
+        db.session.execute(insert(LaborSkillTag), skill_rows)
+    if posting_rows:
+        db.session.execute(insert(LaborPostingTag), posting_rows)
+    db.session.commit()
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+# ---------------------------------------------------------------------------
+
+def _location_words(text):
+    return {word for word in re.findall(r'[a-z0-9]+', (text or '').lower()) if len(word) > 2}
+
+
+def score_match(job_tags, worker_tags, offered_wage, expected_wage, job_location, address):
+    """Return the weighted score and its parts, each between 0 and 1."""
+    matched = job_tags & worker_tags
+    skills = len(matched) / len(job_tags) if job_tags else 0.0
+
+    if offered_wage and expected_wage:
+        wage = min(1.0, offered_wage / expected_wage)
+    else:
+        wage = 0.5  # unknown on one side: neither reward nor penalise
+
+    wanted = _location_words(job_location)
+    location = len(wanted & _location_words(address)) / len(wanted) if wanted else 0.0
+
+    parts = {'skills': skills, 'wage': wage, 'location': location}
+    score = sum(WEIGHTS[name] * value for name, value in parts.items())
+    return {
+        'score': round(score, 4),
+        'skills': round(skills, 4),
+        'wage': round(wage, 4),
+        'location': round(location, 4),
+        'matched_skills': sorted(matched),
+    }
+
+
+def _tags_by_owner(model, owner_column, owner_ids):
+    tags = {}
+    for owner_id, tag in db.session.query(owner_column, model.tag).filter(owner_column.in_(owner_ids)):
+        tags.setdefault(owner_id, set()).add(tag)
+    return tags
+
+
+def recommended_jobs(user, limit=20):
+    """Open postings with free slots ranked for the labor ``user``."""
+    profile = user.labor_profile
+    worker_tags = parse_skills(profile.skills)
+    if not worker_tags:
+        return []
+
+    posting_ids = [
+        posting_id for (posting_id,) in (
+            db.session.query(LaborPostingTag.posting_id)
+            .join(LaborHiring, LaborHiring.id == LaborPostingTag.posting_id)
+            .filter(
+                LaborPostingTag.tag.in_(worker_tags),
+                LaborHiring.status == 'open',
+                LaborHiring.laborers_filled < LaborHiring.laborers_needed,
+                ~LaborHiring.id.in_(
+                    select(LaborAssignment.posting_id).where(LaborAssignment.labor_id == profile.id)
+                ),
+            )
+            .group_by(LaborPostingTag.posting_id)
+            .order_by(func.count().desc(), LaborPostingTag.posting_id.desc())
+            .limit(MAX_CANDIDATES)
+        )
+    ]
+    if not posting_ids:
+        return []
+
+    tags = _tags_by_owner(LaborPostingTag, LaborPostingTag.posting_id, posting_ids)
+    rows = (
+        db.session.query(LaborHiring, FarmerProfile.farm_location, User.full_name)
+        .join(FarmerProfile, LaborHiring.farmer_id == FarmerProfile.id)
+        .join(User, FarmerProfile.user_id == User.id)
+        .filter(LaborHiring.id.in_(posting_ids))
+        .all()
+    )
+
+    results = []
+    for posting, farm_location, farmer_name in rows:
+        match = score_match(
+            tags.get(posting.id, set()), worker_tags,
+            posting.daily_wage, profile.daily_wage,
+            posting.location or farm_location, user.address
+        )
+        results.append({
+            'id': posting.id,
+            'farmer_name': farmer_name,
+            'farmer_location': farm_location,
+            'job_title': posting.job_title,
+            'description': posting.description,
+            'work_type': posting.work_type,
+            'start_date': posting.start_date.isoformat(),
+            'end_date': posting.end_date.isoformat() if posting.end_date else None,
+            'wage_per_day': posting.daily_wage,
+            'total_wage': posting.total_wage,
+            'location': posting.location,
+            'laborers_needed': posting.laborers_needed,
+            'laborers_filled': posting.laborers_filled,
+            'total_days': posting.total_days,
+            'match': match,
+        })
+
+    results.sort(key=lambda job: (job['match']['score'], job['id']), reverse=True)
+    return results[:limit]
+
+
+def posting_candidates(posting, limit=20):
+    """Available workers, not yet assigned to ``posting``, ranked for it."""
+    job_tags = {
+        tag for (tag,) in
+        db.session.query(LaborPostingTag.tag).filter_by(posting_id=posting.id)
+    }
+    if not job_tags:
+        return []
+
+    labor_ids = [
+        labor_id for (labor_id,) in (
+            db.session.query(LaborSkillTag.labor_id)
+            .join(LaborProfile, LaborProfile.id == LaborSkillTag.labor_id)
+            .join(User, LaborProfile.user_id == User.id)
+            .filter(
+                LaborSkillTag.tag.in_(job_tags),
+                LaborProfile.availability.isnot(False),
+                User.is_active.is_(True),
+                ~LaborSkillTag.labor_id.in_(
+                    select(LaborAssignment.labor_id).where(LaborAssignment.posting_id == posting.id)
+                ),
+            )
+            .group_by(LaborSkillTag.labor_id)
+            .order_by(func.count().desc(), LaborSkillTag.labor_id)
+            .limit(MAX_CANDIDATES)
+        )
+    ]
+    if not labor_ids:
+        return []
+
+    tags = _tags_by_owner(LaborSkillTag, LaborSkillTag.labor_id, labor_ids)
+    rows = (
+        db.session.query(LaborProfile, User)
+        .join(User, LaborProfile.user_id == User.id)
+        .filter(LaborProfile.id.in_(labor_ids))
+        .all()
+    )
+    job_location = posting.location or posting.farmer.farm_location
+
+    results = []
+    for profile, labor_user in rows:
+        match = score_match(
+            job_tags, tags.get(profile.id, set()),
+            posting.daily_wage, profile.daily_wage,
+            job_location, labor_user.address
+        )
+        results.append({
+            'labor_id': profile.id,
+            'user_id': labor_user.id,
+            'full_name': labor_user.full_name,
+            'phone': labor_user.phone,
+            'address': labor_user.address,
+            'skills': profile.skills,
+            'experience_years': profile.experience_years,
+            'daily_wage': profile.daily_wage,
+            'rating': profile.rating,
+            'match': match,
+        })
+
+    results.sort(
+        key=lambda c: (c['match']['score'], c['rating'] or 0, c['experience_years'] or 0),
+        reverse=True
+    )
+    return results[:limit]
+
+
+def register_labor_matching_commands(app):
+    """Register the ``reindex-labor-tags`` CLI command on ``app``."""
+
+    @app.cli.command('reindex-labor-tags')
+    def reindex_labor_tags_command():
+        """Rebuild the labor skill and posting tag indexes."""
+        sync_labor_tags()
+        print("✓ Labor skill and posting tags rebuilt")
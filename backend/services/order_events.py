@@ -0,0 +1,178 @@
+"""Order status event bus behind the ``/api/orders/events`` SSE stream.
+
+Status updates publish one event per interested user (the buyer and the
+farmer or vendor selling the item). Subscribers read events for their own
+user id after the last id they have seen. Two backends are available via
+``ORDER_EVENTS_BACKEND``:
+
+``memory``
+    A bounded in-process ring buffer with a condition variable. Events are
+    delivered immediately but are only visible to the worker that
+    published them, so use it with a single gunicorn worker.
+``database``
+    Rows in ``order_events`` read through the ``(user_id, id)`` index every
+    ``ORDER_EVENTS_POLL_INTERVAL`` seconds. Works across workers and
+    restarts; events older than ``ORDER_EVENTS_RETENTION_HOURS`` are pruned.
+
+Another broker can be plugged in by implementing ``publish``, ``last_id``
+and ``read`` and adding it to ``BACKENDS``.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from models.database import db, OrderEvent
+
+
+class MemoryBackend:
+    """Per-process event buffer."""
+
+    def __init__(self, app, maxlen=10000):
+        self._events = deque(maxlen=maxlen)
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def publish(self, user_ids, event):
+        with self._cond:
+            for user_id in user_ids:
+                self._seq += 1
+                self._events.append((self._seq, user_id, event))
+            self._cond.notify_all()
+
+    def last_id(self, user_id):
+        return self._seq
+
+    def _pending(self, user_id, after):
+        return [
+            (seq, event)
+            for seq, owner, event in self._events
+            if seq > after and owner == user_id
+        ]
+
+    def read(self, user_id, after, timeout):
+        with self._cond:
+            pending = self._pending(user_id, after)
+            deadline = time.monotonic() + timeout
+            while not pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+                pending = self._pending(user_id, after)
+            return pending
+
+
+class DatabaseBackend:
+    """Events stored in ``order_events``, shared by all workers."""
+
+    PRUNE_EVERY = 600  # seconds
+
+    def __init__(self, app):
+        self.poll_interval = app.config.get('ORDER_EVENTS_POLL_INTERVAL', 1.0)
+        self.retention = timedelta(hours=app.config.get('ORDER_EVENTS_RETENTION_HOURS', 24))
+        self._last_prune = 0.0
+
+    def publish(self, user_ids, event):
+        try:
+            payload = json.dumps(event)
+            db.session.add_all([
+                OrderEvent(user_id=user_id, order_id=event['order_id'], payload=payload)
+                for user_id in user_ids
+            ])
+            if time.monotonic() - self._last_prune > self.PRUNE_EVERY:
+                self._last_prune = time.monotonic()
+                OrderEvent.query.filter(
+                    OrderEvent.created_at < datetime.utcnow() - self.retention
+                ).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def last_id(self, user_id):
+        last = (
+            db.session.query(db.func.max(OrderEvent.id))
+            .filter(OrderEvent.user_id == user_id)
+            .scalar()
+        )
+        db.session.rollback()
+        return last or 0
+
+    def read(self, user_id, after, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            rows = (
+                db.session.query(OrderEvent.id, OrderEvent.payload)
+                .filter(OrderEvent.user_id == user_id, OrderEvent.id > after)
+                .order_by(OrderEvent.id)
+                .limit(100)
+                .all()
+            )
+            # End the read transaction so the next poll sees new commits and
+            # the connection goes back to the pool between polls.
+            db.session.rollback()
+            remaining = deadline - time.monotonic()
+            if rows or remaining <= 0:
+                return [(row_id, json.loads(payload)) for row_id, payload in rows]
+            time.sleep(min(self.poll_interval, remaining))
+
+
+BACKENDS = {
+    'memory': MemoryBackend,
+    'database': DatabaseBackend,
+}
+
+
+class OrderEventBus:
+    """Facade over the configured backend."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        name = app.config.get('ORDER_EVENTS_BACKEND', 'memory')
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown ORDER_EVENTS_BACKEND {name!r}; use one of {sorted(BACKENDS)}")
+        self.backend = BACKENDS[name](app)
+
+    def publish_status_change(self, order):
+        """Notify the buyer and seller of ``order`` about its new status."""
+        if self.backend is None:
+            return
+        event = {
+            'type': 'order_status',
+            'order_id': order.id,
+            'order_type': order.order_type,
+            'status': order.status.value,
+            'updated_at': (order.updated_at or datetime.utcnow()).isoformat(),
+        }
+        try:
+            self.backend.publish(order_recipients(order), event)
+        except Exception as e:
+            # The status change is already committed; a lost notification
+            # only means clients see it on their next full refresh.
+            print(f"Order event publish failed for order {order.id}: {e}")
+
+    def last_id(self, user_id):
+        return self.backend.last_id(user_id)
+
+    def read(self, user_id, after, timeout):
+        return self.backend.read(user_id, after, timeout)
+
+
+def order_recipients(order):
+    """User ids of the buyer and the seller of ``order``."""
+    user_ids = {order.buyer_id}
+    if order.crop_listing and order.crop_listing.farmer:
+        user_ids.add(order.crop_listing.farmer.user_id)
+    if order.vendor_product and order.vendor_product.vendor:
+        user_ids.add(order.vendor_product.vendor.user_id)
+    return sorted(user_ids)
+
+
+order_events = OrderEventBus()
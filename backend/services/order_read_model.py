@@ -0,0 +1,105 @@
+"""Denormalized names on ``orders``.
+
+Each order stores the product name, the seller's user id and name, and the
+buyer's name and email when it is written, so order lists read one table
+through ``ix_orders_buyer_created`` / ``ix_orders_seller_created`` instead of
+joining listing -> profile -> user per row. ``describe_items`` resolves the
+names for a whole cart in one query per item type; mapper events fill ORM
+inserts and copy user renames onto existing orders.
+"""
+
+from sqlalchemy import event, inspect
+
+from models.database import (
+    db,
+    User,
+    FarmerProfile,
+    VendorProfile,
+    CropListing,
+    VendorProduct,
+    Order,
+)
+
+
+# item type -> (model, product name column, profile model, profile foreign key)
+SOURCES = {
+    'crop': (CropListing, CropListing.crop_name, FarmerProfile, CropListing.farmer_id),
+    'vendor_product': (VendorProduct, VendorProduct.product_name, VendorProfile, VendorProduct.vendor_id),
+}
+
+
+def _items_query(item_type, ids):
+    model, name, profile, profile_fk = SOURCES[item_type]
+    return (
+        db.select(model.id, model.price_per_unit, name, profile.id, User.id, User.full_name)
+        .outerjoin(profile, profile_fk == profile.id)
+        .outerjoin(User, profile.user_id == User.id)
+        .where(model.id.in_(ids))
+    )
+
+
+def describe_items(item_type, ids, connection=None):
+    """Return ``{id: {price, product_name, profile_id, seller_id, seller_name}}``.
+
+    ``profile_id`` is the farmer or vendor profile id of the seller.
+    """
+    if not ids:
+        return {}
+    execute = connection.execute if connection is not None else db.session.execute
+    return {
+        row_id: {
+            'price': price,
+            'product_name': product_name,
+            'profile_id': profile_id,
+            'seller_id': seller_id,
+            'seller_name': seller_name,
+        }
+        for row_id, price, product_name, profile_id, seller_id, seller_name
+        in execute(_items_query(item_type, ids))
+    }
+
+
+def buyer_fields(buyer_id, connection=None):
+    """Return the ``buyer_name`` / ``buyer_email`` columns for ``buyer_id``."""
+    execute = connection.execute if connection is not None else db.session.execute
+    row = execute(
+        db.select(User.full_name, User.email).where(User.id == buyer_id)
+    ).first()
+    return {
+        'buyer_name': row[0] if row else None,
+        'buyer_email': row[1] if row else None,
+    }
+
+
+@event.listens_for(Order, 'before_insert')
+def _fill_read_model(mapper, connection, order):
+    """Fill the name columns of ORM-inserted orders that did not set them."""
+    if order.buyer_name is None:
+        fields = buyer_fields(order.buyer_id, connection)
+        order.buyer_name = fields['buyer_name']
+        order.buyer_email = fields['buyer_email']
+
+    if order.seller_id is None:
+        item_type = 'crop' if order.order_type == 'crop' else 'vendor_product'
+        item_id = order.crop_listing_id if item_type == 'crop' else order.vendor_product_id
+        info = describe_items(item_type, [item_id], connection).get(item_id) if item_id else None
+        if info:
+            order.product_name = order.product_name or info['product_name']
+            order.seller_id = info['seller_id']
+            order.seller_name = info['seller_name']
+            if item_type == 'vendor_product':
+                order.vendor_id = info['profile_id']
+
+
+@event.listens_for(User, 'after_update')
+def _user_renamed(mapper, connection, user):
+    if not inspect(user).attrs.full_name.history.has_changes():
+        return
+    table = Order.__table__
+    connection.execute(
+        table.update().where(table.c.buyer_id == user.id).values(buyer_name=user.full_name)
+    )
+    connection.execute(
+        table.update().where(table.c.seller_id == user.id).values(seller_name=user.full_name)
+    )
+
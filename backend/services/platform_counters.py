@@ -0,0 +1,130 @@
+"""Incrementally maintained platform counters for the admin dashboard.
+
+``platform_counters`` holds one row per counted entity (users per role,
+orders, crop listings, vendor products). Mapper events adjust the counters
+inside the same transaction as each ORM insert or delete (and move a user
+between role counters when the role changes), so the dashboard
+reads a handful of rows instead of counting whole tables. ``sync_counters``
+seeds the table at startup with one grouped query; ``flask sync-counters``
+recomputes everything, e.g. after bulk statements that skip mapper events.
+"""
+
+from sqlalchemy import event, func, inspect, literal, select, type_coerce, union_all
+from sqlalchemy.exc import IntegrityError
+
+from models.database import (
+    db,
+    User,
+    UserRole,
+    Order,
+    CropListing,
+    VendorProduct,
+    PlatformCounter,
+)
+
+
+COUNTED_TABLES = {
+    'orders': Order,
+    'crop_listings': CropListing,
+    'vendor_products': VendorProduct,
+}
+
+
+def user_counter(role):
+    """Counter name for users with ``role``."""
+    return f"users:{role.value if isinstance(role, UserRole) else role}"
+
+
+def count_platform():
+    """Count users per role and each counted table in a single query."""
+    role = type_coerce(User.role, db.String)
+    queries = [select(role, func.count(User.id)).group_by(role)]
+    queries += [
+        select(literal(name), func.count()).select_from(model)
+        for name, model in COUNTED_TABLES.items()
+    ]
+
+    counts = {user_counter(r): 0 for r in UserRole}
+    counts.update({name: 0 for name in COUNTED_TABLES})
+    for name, value in db.session.execute(union_all(*queries)).all():
+        if name in COUNTED_TABLES:
+            counts[name] = value
+        else:
+            counts[user_counter(UserRole[name])] = value
+    return counts
+
+
+def sync_counters(reset=False):
+    """Seed missing counters from the base tables (all of them if ``reset``)."""
+    existing = {c.name: c for c in PlatformCounter.query.all()}
+    if not reset and len(existing) >= len(UserRole) + len(COUNTED_TABLES):
+        return
+
+    counts = count_platform()
+    for name, value in counts.items():
+        if name not in existing:
+            db.session.add(PlatformCounter(name=name, value=value))
+        elif reset:
+            existing[name].value = value
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # Another worker seeded the table concurrently.
+        db.session.rollback()
+
+
+def read_counters():
+    """Return ``{name: value}`` for every counter row."""
+    return dict(db.session.query(PlatformCounter.name, PlatformCounter.value).all())
+
+
+def adjust_counter(connection, name, delta):
+    """Apply ``delta`` to counter ``name`` on the flushing connection."""
+    table = PlatformCounter.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.name == name)
+        .values(value=table.c.value + delta)
+    )
+
+
+def _listen(model, counter_name):
+    @event.listens_for(model, 'after_insert')
+    def _on_insert(mapper, connection, target):
+        adjust_counter(connection, counter_name(target), 1)
+
+    @event.listens_for(model, 'after_delete')
+    def _on_delete(mapper, connection, target):
+        adjust_counter(connection, counter_name(target), -1)
+
+
+_listen(User, lambda user: user_counter(user.role))
+
+for _name, _model in COUNTED_TABLES.items():
+    _listen(_model, lambda target, name=_name: name)
+
+
+@event.listens_for(User.role, 'set', active_history=True)
+def _load_previous_role(target, value, previous, initiator):
+    # active_history loads the old role on assignment even when the
+    # attribute was expired (e.g. after a commit), so the update below sees it.
+    pass
+
+
+@event.listens_for(User, 'after_update')
+def _on_role_change(mapper, connection, target):
+    # Move the user between role counters; other updates leave them alone.
+    old_roles = inspect(target).attrs.role.history.deleted
+    if old_roles and old_roles[0] is not None and old_roles[0] != target.role:
+        adjust_counter(connection, user_counter(old_roles[0]), -1)
+        adjust_counter(connection, user_counter(target.role), 1)
+
+
+def register_counter_commands(app):
+    """Register the ``sync-counters`` CLI command on ``app``."""
+
+    @app.cli.command('sync-counters')
+    def sync_counters_command():
+        """Recompute platform counters from the base tables."""
+        sync_counters(reset=True)
+        print("✓ Platform counters recomputed")
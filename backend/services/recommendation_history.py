@@ -0,0 +1,234 @@
+"""Compact storage and retention for recommendation history.
+
+History rows keep the numeric model inputs and the top result in typed
+columns so summaries and rollups never parse JSON. Everything else in the
+request and response (the fertilizer soil and crop type, amount and reason,
+the crop model's top three, ...) is kept as zlib-compressed JSON in
+``payload``, so a row always converts back to the original input/result
+pair. Rows older than ``HISTORY_RETENTION_DAYS`` are folded into
+per-farmer daily aggregates by ``rollup_history`` (also available as
+``flask rollup-history``).
+"""
+
+import json
+import zlib
+from datetime import date, datetime, timedelta
+
+import click
+from flask import current_app
+from sqlalchemy import func
+
+from models.database import db, RecommendationHistory, RecommendationDailyRollup
+
+
+# Request field -> typed column
+INPUT_COLUMNS = {
+    'N': 'n',
+    'P': 'p',
+    'K': 'k',
+    'temperature': 'temperature',
+    'humidity': 'humidity',
+    'pH': 'ph',
+    'rainfall': 'rainfall',
+}
+
+# Column used for each recommendation type's top result
+RESULT_KEYS = {'crop': 'crop', 'fertilizer': 'fertilizer'}
+
+# Rollup ``<prefix>_sum``/``<prefix>_count`` pairs and the history columns they aggregate
+SUM_COLUMNS = ['confidence'] + list(INPUT_COLUMNS.values())
+VALUE_COLUMNS = ['confidence_score'] + list(INPUT_COLUMNS.values())
+
+
+def encode_payload(inputs, result):
+    """Compress an input/result pair for storage."""
+    raw = json.dumps({'input': inputs, 'result': result}, separators=(',', ':'))
+    return zlib.compress(raw.encode('utf-8'))
+
+
+def decode_payload(payload):
+    """Inverse of ``encode_payload``; returns ``None`` for empty payloads."""
+    if not payload:
+        return None
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def build_history_row(farmer_id, recommendation_type, inputs, result):
+    """Build a ``RecommendationHistory`` mapping for ``bulk_insert_mappings``.
+
+    Numeric inputs, the top result and the confidence go to typed columns;
+    the payload holds only the fields those columns cannot reproduce.
+    """
+    result_key = RESULT_KEYS.get(recommendation_type, 'crop')
+    row = {
+        'farmer_id': farmer_id,
+        'recommendation_type': recommendation_type,
+        'top_result': result.get(result_key),
+        'confidence_score': result.get('confidence'),
+    }
+    for field, column in INPUT_COLUMNS.items():
+        value = inputs.get(field)
+        row[column] = float(value) if _is_number(value) else None
+
+    extra_inputs = {
+        field: value for field, value in inputs.items()
+        if not (field in INPUT_COLUMNS and _is_number(value))
+    }
+    extra_result = {
+        field: value for field, value in result.items()
+        if field not in (result_key, 'confidence')
+    }
+    if not _is_number(row['confidence_score']):
+        row['confidence_score'] = None
+        if 'confidence' in result:
+            extra_result['confidence'] = result['confidence']
+    row['payload'] = encode_payload(extra_inputs, extra_result) if extra_inputs or extra_result else None
+    return row
+
+
+def serialize_history(record, compact=False):
+    """Convert a history row (or column tuple) to the API shape.
+
+    The typed columns are merged with the stored payload to give back the
+    original request and response; ``compact`` skips the payload and
+    returns only the typed fields.
+    """
+    inputs = {
+        field: getattr(record, column)
+        for field, column in INPUT_COLUMNS.items()
+        if getattr(record, column) is not None
+    }
+    result = {RESULT_KEYS.get(record.recommendation_type, 'crop'): record.top_result}
+    if record.confidence_score is not None:
+        result['confidence'] = record.confidence_score
+    if not compact:
+        # Older rows may hold the full pair; the overlay is the same either way.
+        payload = decode_payload(record.payload)
+        if payload:
+            inputs.update(payload['input'])
+            result.update(payload['result'])
+    return {
+        'id': record.id,
+        'type': record.recommendation_type,
+        'input': inputs,
+        'result': result,
+        'date': record.created_at.isoformat()
+    }
+
+
+def serialize_rollup(rollup):
+    """Convert a daily rollup row to averages for the API.
+
+    Each average divides by the number of rows that had that value, so
+    fertilizer rows without climate inputs do not pull the means down.
+    """
+    averages = {}
+    for field, column in INPUT_COLUMNS.items():
+        count = getattr(rollup, f'{column}_count')
+        if count:
+            averages[field] = round(getattr(rollup, f'{column}_sum') / count, 3)
+    return {
+        'date': rollup.day.isoformat(),
+        'type': rollup.recommendation_type,
+        'top_result': rollup.top_result,
+        'count': rollup.count,
+        'avg_confidence': (
+            round(rollup.confidence_sum / rollup.confidence_count, 4)
+            if rollup.confidence_count else None
+        ),
+        'avg_input': averages,
+    }
+
+
+def rollup_history(retention_days):
+    """Fold history older than ``retention_days`` into daily rollups.
+
+    Returns the number of history rows removed. Aggregation and deletion
+    happen in one transaction, and rollups are merged additively so the job
+    can run repeatedly.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    day = func.date(RecommendationHistory.created_at)
+
+    values = [getattr(RecommendationHistory, column) for column in VALUE_COLUMNS]
+    sums = [func.coalesce(func.sum(value), 0.0) for value in values]
+    counts = [func.count(value) for value in values]  # non-NULL values only
+
+    groups = (
+        db.session.query(
+            RecommendationHistory.farmer_id,
+            day,
+            RecommendationHistory.recommendation_type,
+            RecommendationHistory.top_result,
+            func.count(RecommendationHistory.id),
+            *sums,
+            *counts
+        )
+        .filter(RecommendationHistory.created_at < cutoff)
+        .group_by(
+            RecommendationHistory.farmer_id,
+            day,
+            RecommendationHistory.recommendation_type,
+            RecommendationHistory.top_result,
+        )
+        .all()
+    )
+
+    try:
+        for farmer_id, group_day, rec_type, top_result, count, *totals in groups:
+            if isinstance(group_day, str):
+                group_day = date.fromisoformat(group_day)
+
+            rollup = RecommendationDailyRollup.query.filter_by(
+                farmer_id=farmer_id,
+                day=group_day,
+                recommendation_type=rec_type,
+                top_result=top_result,
+            ).first()
+            if rollup is None:
+                rollup = RecommendationDailyRollup(
+                    farmer_id=farmer_id,
+                    day=group_day,
+                    recommendation_type=rec_type,
+                    top_result=top_result,
+                    count=0,
+                    **{f'{column}_sum': 0.0 for column in SUM_COLUMNS},
+                    **{f'{column}_count': 0 for column in SUM_COLUMNS}
+                )
+                db.session.add(rollup)
+
+            rollup.count += count
+            group_sums, group_counts = totals[:len(SUM_COLUMNS)], totals[len(SUM_COLUMNS):]
+            for column, total, non_null in zip(SUM_COLUMNS, group_sums, group_counts):
+                for attr, value in ((f'{column}_sum', float(total)), (f'{column}_count', non_null)):
+                    setattr(rollup, attr, (getattr(rollup, attr) or 0) + value)
+
+        removed = (
+            RecommendationHistory.query
+            .filter(RecommendationHistory.created_at < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.session.commit()
+        return removed
+
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def register_history_commands(app):
+    """Register the ``rollup-history`` CLI command on ``app``."""
+
+    @app.cli.command('rollup-history')
+    @click.option('--days', type=int, default=None,
+                  help='Retention window in days (defaults to HISTORY_RETENTION_DAYS).')
+    def rollup_history_command(days):
+        """Roll old recommendation history into daily aggregates."""
+        if days is None:
+            days = current_app.config.get('HISTORY_RETENTION_DAYS', 90)
+        removed = rollup_history(days)
+        print(f"✓ Rolled up {removed} recommendation history rows older than {days} days")
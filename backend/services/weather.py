@@ -0,0 +1,100 @@
+"""Weather lookups shared by the weather endpoint and crop recommendation.
+
+Results are cached per location for ``Config.WEATHER_CACHE_TTL`` seconds so
+that a dashboard refresh followed by a recommendation only hits the
+upstream API once. The cache is an LRU of at most ``Config.WEATHER_CACHE_SIZE``
+locations.
+
+The current-weather API only reports precipitation over the last hour or
+three, while the crop model's rainfall feature is seasonal rainfall (tens to
+hundreds of mm). Recommendations therefore take temperature and humidity
+from the weather and rainfall from ``Config.DEFAULT_RAINFALL_MM``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+
+from config.settings import Config
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _demo_weather():
+    """Static snapshot used when no API key is configured."""
+    return {
+        'temperature': 25.0,
+        'humidity': 65,
+        'description': 'Clear sky (demo data)',
+        'wind_speed': 3.5,
+        'pressure': 1013,
+        'recent_rainfall_mm': 0.0,
+    }
+
+
+def _fetch_weather(location):
+    """Fetch current conditions for ``location`` from the weather API."""
+    if Config.WEATHER_API_KEY == 'your-api-key' or not Config.WEATHER_API_KEY:
+        return _demo_weather()
+
+    params = {
+        'q': location,
+        'appid': Config.WEATHER_API_KEY,
+        'units': 'metric'
+    }
+
+    response = requests.get(Config.WEATHER_API_URL, params=params, timeout=5)
+    if response.status_code != 200:
+        return None
+
+    weather_data = response.json()
+    rain = weather_data.get('rain') or {}
+    return {
+        'temperature': weather_data['main']['temp'],
+        'humidity': weather_data['main']['humidity'],
+        'description': weather_data['weather'][0]['description'],
+        'wind_speed': weather_data['wind']['speed'],
+        'pressure': weather_data['main']['pressure'],
+        'recent_rainfall_mm': float(rain.get('1h', rain.get('3h', 0.0))),
+    }
+
+
+def get_weather(location):
+    """Return cached weather for ``location`` or ``None`` if unavailable."""
+    key = location.strip().lower()
+    now = time.monotonic()
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry and entry[0] > now:
+            _cache.move_to_end(key)
+            return entry[1]
+
+    weather = _fetch_weather(location)
+    if weather is not None:
+        with _cache_lock:
+            _cache[key] = (now + Config.WEATHER_CACHE_TTL, weather)
+            _cache.move_to_end(key)
+            while len(_cache) > Config.WEATHER_CACHE_SIZE:
+                _cache.popitem(last=False)
+    return weather
+
+
+def get_climate_features(location):
+    """Return ``temperature``, ``humidity`` and ``rainfall`` for ``location``.
+
+    Rainfall is the configured seasonal figure, not the current weather's
+    recent precipitation (see the module docstring).
+    """
+    weather = get_weather(location)
+    if weather is None:
+        return None
+    return {
+        'temperature': float(weather['temperature']),
+        'humidity': float(weather['humidity']),
+        'rainfall': float(Config.DEFAULT_RAINFALL_MM),
+    }
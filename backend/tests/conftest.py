@@ -0,0 +1,156 @@
+"""
+Shared fixtures: an application on a fresh SQLite database per test, and
+factories for the rows the service tests need.
+"""
+
+from datetime import date
+
+import pytest
+
+from app import create_app
+from config.settings import Config
+from utils.auth import generate_token
+from models.database import (
+    db,
+    User,
+    UserRole,
+    FarmerProfile,
+    LaborProfile,
+    VendorProfile,
+    CropListing,
+    VendorProduct,
+    LaborHiring,
+    Equipment,
+)
+
+
+@pytest.fixture
+def app_config():
+    """Extra Config values for the app under test; override per module."""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch, app_config):
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    monkeypatch.setattr(Config, 'HOLD_SWEEP_INTERVAL', 3600)
+    monkeypatch.setattr(Config, 'ANALYTICS_REFRESH_SECONDS', 3600)
+    monkeypatch.setattr(Config, 'RATE_LIMIT_ENABLED', False)
+    for name, value in app_config.items():
+        monkeypatch.setattr(Config, name, value)
+    app = create_app()
+    app.config['TESTING'] = True
+
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    def headers(user):
+        return {'Authorization': f'Bearer {generate_token(user.id, user.role)}'}
+    return headers
+
+
+def _user(email, role):
+    user = User(email=email, full_name=email.split('@')[0], role=role, password_hash='-')
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+@pytest.fixture
+def make_buyer(app):
+    def make(email='buyer@example.com'):
+        user = _user(email, UserRole.BUYER)
+        db.session.commit()
+        return user
+    return make
+
+
+@pytest.fixture
+def make_farmer(app):
+    def make(email='farmer@example.com'):
+        profile = FarmerProfile(user_id=_user(email, UserRole.FARMER).id, farm_name='Farm')
+        db.session.add(profile)
+        db.session.commit()
+        return profile
+    return make
+
+
+@pytest.fixture
+def make_laborer(app):
+    def make(email='labor@example.com'):
+        profile = LaborProfile(user_id=_user(email, UserRole.LABOR).id, skills='[]')
+        db.session.add(profile)
+        db.session.commit()
+        return profile
+    return make
+
+
+@pytest.fixture
+def make_listing(make_farmer):
+    def make(quantity=10, price=2.0, farmer=None):
+        farmer = farmer or make_farmer()
+        listing = CropListing(
+            farmer_id=farmer.id, crop_name='rice', quantity=quantity, price_per_unit=price
+        )
+        db.session.add(listing)
+        db.session.commit()
+        return listing
+    return make
+
+
+@pytest.fixture
+def make_vendor_product(app):
+    def make(quantity=10, price=5.0, email='vendor@example.com'):
+        vendor = VendorProfile(user_id=_user(email, UserRole.VENDOR).id, business_name='Supplies')
+        db.session.add(vendor)
+        db.session.flush()
+        product = VendorProduct(
+            vendor_id=vendor.id, product_name='urea', quantity_available=quantity, price_per_unit=price
+        )
+        db.session.add(product)
+        db.session.commit()
+        return product
+    return make
+
+
+@pytest.fixture
+def make_posting(make_farmer):
+    def make(laborers_needed=1, status='open', farmer=None):
+        farmer = farmer or make_farmer('poster@example.com')
+        posting = LaborHiring(
+            farmer_id=farmer.id,
+            job_title='Harvest',
+            start_date=date(2030, 1, 1),
+            laborers_needed=laborers_needed,
+            status=status,
+        )
+        db.session.add(posting)
+        db.session.commit()
+        return posting
+    return make
+
+
+@pytest.fixture
+def make_equipment(make_farmer):
+    def make(price=100.0):
+        equipment = Equipment(
+            owner_id=make_farmer('owner@example.com').id,
+            equipment_name='Tractor',
+            equipment_type='tractor',
+            rental_price_per_day=price,
+            is_available_for_rent=True,
+        )
+        db.session.add(equipment)
+        db.session.commit()
+        return equipment
+    return make
@@ -0,0 +1,57 @@
+"""Analytics rollups fold new rows once; the time-series endpoint only reads."""
+
+from sqlalchemy import event
+
+from models.database import db, User, UserRole, AnalyticsRollup
+from services.analytics_rollups import read_timeseries, refresh_rollups
+from services.checkout import checkout
+
+
+def _buy(make_buyer, make_listing, quantity):
+    listing = make_listing(quantity=10, price=5.0)
+    checkout(make_buyer().id, [{'type': 'crop', 'id': listing.id, 'quantity': quantity}], {})
+
+
+def test_refresh_folds_each_order_once(app, make_buyer, make_listing):
+    app.config['ANALYTICS_SETTLE_SECONDS'] = 0
+    _buy(make_buyer, make_listing, 2)
+
+    refresh_rollups()
+    refresh_rollups()
+
+    for granularity in ('day', 'month'):
+        series = read_timeseries('crop_revenue', granularity)
+        assert [(p['dimension'], p['count'], p['amount']) for p in series] == [('rice', 1, 10.0)]
+
+
+def test_unsettled_orders_wait_for_the_next_refresh(app, make_buyer, make_listing):
+    app.config['ANALYTICS_SETTLE_SECONDS'] = 3600
+    _buy(make_buyer, make_listing, 1)
+
+    refresh_rollups()
+    assert read_timeseries('orders', 'day') == []
+
+    app.config['ANALYTICS_SETTLE_SECONDS'] = 0
+    refresh_rollups()
+    assert [p['count'] for p in read_timeseries('orders', 'day')] == [1]
+
+
+def test_timeseries_endpoint_does_not_write(app, client, auth_headers, make_buyer, make_listing):
+    app.config['ANALYTICS_SETTLE_SECONDS'] = 0
+    _buy(make_buyer, make_listing, 1)
+    admin = User.query.filter_by(role=UserRole.ADMIN).first()
+    rollups_before = AnalyticsRollup.query.count()
+
+    statements = []
+    event.listen(
+        db.engine, 'before_cursor_execute',
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    response = client.get(
+        '/api/admin/analytics/timeseries?metric=orders', headers=auth_headers(admin)
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()['series'] == []
+    assert not [s for s in statements if s.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))]
+    assert AnalyticsRollup.query.count() == rollups_before
@@ -0,0 +1,34 @@
+"""Token verification cache and the per-request principal."""
+
+import utils.auth as auth
+from utils.auth import decode_token, generate_token, revoke_token
+
+
+def test_verified_tokens_are_cached_but_revocation_still_applies(make_buyer):
+    buyer = make_buyer()
+    token = generate_token(buyer.id, buyer.role)
+
+    payload = decode_token(token)
+    assert payload['user_id'] == buyer.id
+    assert token in auth._verified_tokens
+
+    revoke_token(payload)
+    assert decode_token(token) == {'error': 'Token has been revoked'}
+
+
+def test_tampered_token_is_not_served_from_the_cache(make_buyer):
+    token = generate_token(make_buyer().id, 'buyer')
+    decode_token(token)
+    assert decode_token(token[:-2] + ('AA' if token[-2:] != 'AA' else 'BB')) == {'error': 'Invalid token'}
+
+
+def test_each_request_loads_its_own_principal(client, auth_headers, make_listing, make_farmer):
+    own = make_listing()
+    other_farmer = make_farmer('other@example.com')
+
+    # Both requests run inside the test's app context, as a job or script would
+    for farmer, expected in ((own.farmer, [own.id]), (other_farmer, [])):
+        listings = client.get(
+            '/api/farmer/crop-listings', headers=auth_headers(farmer.user)
+        ).get_json()['listings']
+        assert [listing['id'] for listing in listings] == expected
@@ -0,0 +1,44 @@
+"""Bulk import keeps the good rows of a chunk the database rejects."""
+
+import pytest
+
+from models.database import db, CropListing
+from services.bulk_import import import_records
+
+
+@pytest.fixture
+def chunk_size(app):
+    app.config['IMPORT_CHUNK_SIZE'] = 10
+
+
+def _builder(farmer_id):
+    def build_row(record):
+        return {
+            'farmer_id': farmer_id,
+            'crop_name': record.get('crop_name'),  # NOT NULL in the database
+            'quantity': float(record['quantity']),
+            'price_per_unit': 1.0,
+        }
+    return build_row
+
+
+def test_rows_rejected_by_the_database_are_skipped(chunk_size, make_farmer):
+    farmer = make_farmer()
+    chunks = []
+    records = [
+        {'crop_name': 'rice', 'quantity': '1'},
+        {'crop_name': 'wheat', 'quantity': 'lots'},  # fails validation
+        {'quantity': '3'},                           # fails in the database
+        {'crop_name': 'maize', 'quantity': '4'},
+    ]
+
+    result = import_records(
+        records, CropListing, _builder(farmer.id),
+        on_chunk=lambda connection, inserted: chunks.append(inserted),
+    )
+
+    assert (result['imported'], result['failed']) == (2, 2)
+    assert [error['row'] for error in result['errors']] == [2, 3]
+    assert sum(chunks) == 2
+    db.session.expire_all()
+    assert sorted(listing.crop_name for listing in CropListing.query) == ['maize', 'rice']
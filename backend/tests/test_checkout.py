@@ -0,0 +1,77 @@
+"""Checkout takes stock with a conditional decrement and respects holds."""
+
+import threading
+
+import pytest
+
+from models.database import db, CropListing, Order
+from services.checkout import CheckoutError, checkout, place_holds
+
+
+def _stock(listing_id):
+    db.session.expire_all()
+    return db.session.get(CropListing, listing_id).quantity
+
+
+def test_checkout_takes_stock_at_the_listing_price(make_buyer, make_listing):
+    buyer = make_buyer()
+    listing = make_listing(quantity=5, price=3.0)
+
+    order_ids = checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 2}], {})
+
+    assert _stock(listing.id) == 3
+    order = db.session.get(Order, order_ids[0])
+    assert (order.unit_price, order.total_price) == (3.0, 6.0)
+
+
+def test_checkout_beyond_stock_changes_nothing(make_buyer, make_listing):
+    buyer = make_buyer()
+    listing = make_listing(quantity=5)
+
+    with pytest.raises(CheckoutError):
+        checkout(buyer.id, [
+            {'type': 'crop', 'id': listing.id, 'quantity': 3},
+            {'type': 'crop', 'id': listing.id, 'quantity': 3},
+        ], {})
+
+    assert _stock(listing.id) == 5
+    assert Order.query.count() == 0
+
+
+def test_concurrent_checkouts_never_oversell(app, make_buyer, make_listing):
+    buyer = make_buyer()
+    listing = make_listing(quantity=3)
+    results = []
+
+    def buy():
+        with app.app_context():
+            try:
+                checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+                results.append(True)
+            except CheckoutError:
+                results.append(False)
+            finally:
+                db.session.remove()
+
+    threads = [threading.Thread(target=buy) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 3
+    assert _stock(listing.id) == 0
+    assert Order.query.count() == 3
+
+
+def test_checkout_cannot_take_held_stock(make_buyer, make_listing):
+    holder = make_buyer('holder@example.com')
+    buyer = make_buyer()
+    listing = make_listing(quantity=5)
+    place_holds(holder.id, [{'type': 'crop', 'id': listing.id, 'quantity': 4}])
+
+    with pytest.raises(CheckoutError):
+        checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 2}], {})
+
+    checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+    assert _stock(listing.id) == 4
@@ -0,0 +1,56 @@
+"""Cost summary aggregation and its version-keyed cache."""
+
+import pytest
+
+import services.cost_summary as cost_summary
+from models.database import db, CostRecord
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    # Farmer ids repeat across the per-test databases
+    cost_summary._cache.clear()
+    yield
+    cost_summary._cache.clear()
+
+
+def _record(farmer, crop='rice', year=2024, seed=0.0, revenue=0.0):
+    record = CostRecord(
+        farmer_id=farmer.id, crop_name=crop, season='Kharif', year=year,
+        seed_cost=seed, total_cost=seed, revenue=revenue, profit_loss=revenue - seed,
+    )
+    db.session.add(record)
+    db.session.commit()
+    return record
+
+
+def test_summary_totals_and_per_crop_rows(make_farmer):
+    farmer = make_farmer()
+    farmer.farm_size = 2.0
+    _record(farmer, 'rice', 2023, seed=100.0, revenue=300.0)
+    _record(farmer, 'wheat', 2024, seed=50.0, revenue=20.0)
+
+    summary = cost_summary.get_summary(farmer)
+
+    assert summary['totals']['total_cost'] == 150.0
+    assert summary['totals']['profit_loss'] == 170.0
+    assert summary['totals']['margin_per_acre'] == 85.0
+    assert [crop['crop_name'] for crop in summary['by_crop']] == ['rice', 'wheat']
+    assert all('margin_per_acre' not in crop for crop in summary['by_crop'])
+    assert summary['by_year'][1]['yoy']['profit_loss']['delta'] == -230.0
+
+
+def test_cost_record_writes_invalidate_the_cache(make_farmer):
+    farmer = make_farmer()
+    record = _record(farmer, seed=10.0)
+    assert cost_summary.get_summary(farmer)['totals']['total_cost'] == 10.0
+    version = farmer.cost_version
+
+    record.total_cost = 25.0
+    db.session.commit()
+    assert farmer.cost_version == version + 1
+    assert cost_summary.get_summary(farmer)['totals']['total_cost'] == 25.0
+
+    db.session.delete(record)
+    db.session.commit()
+    assert cost_summary.get_summary(farmer)['totals']['records'] == 0
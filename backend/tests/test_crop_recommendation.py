@@ -0,0 +1,35 @@
+from config.settings import Config
+import services.ml_models as ml_models
+from services.history_writer import history_writer
+
+
+class RecordingModel:
+    def __init__(self):
+        self.features = None
+
+    def predict(self, features):
+        self.features = features
+        return {'crop': 'rice', 'confidence': 0.9}
+
+
+def test_null_climate_fields_are_filled_from_weather(client, auth_headers, make_farmer, monkeypatch):
+    model = RecordingModel()
+    monkeypatch.setattr(ml_models, 'load_models', lambda: None)
+    monkeypatch.setattr(ml_models, 'crop_model', model)
+    monkeypatch.setattr(Config, 'WEATHER_API_KEY', '')
+    monkeypatch.setattr(history_writer, 'enqueue', lambda **kwargs: None)
+    farmer = make_farmer()
+
+    response = client.post(
+        '/api/farmer/crop-recommendation',
+        json={'N': 90, 'P': 40, 'K': 40, 'pH': 6.5, 'temperature': None,
+              'humidity': 80, 'location': 'Dhaka'},
+        headers=auth_headers(farmer.user),
+    )
+
+    assert response.status_code == 200
+    inputs = response.get_json()['inputs']
+    assert inputs['temperature'] == 25.0
+    assert inputs['humidity'] == 80
+    assert inputs['rainfall'] == Config.DEFAULT_RAINFALL_MM
+    assert model.features[3] == 25.0
@@ -0,0 +1,59 @@
+"""Marketplace search: geo and price filters, input validation."""
+
+import pytest
+
+from models.database import db
+
+
+def _place(profile, lat, lon):
+    profile.latitude, profile.longitude = lat, lon
+    db.session.commit()
+
+
+@pytest.fixture
+def search(client, auth_headers, make_farmer):
+    searcher = make_farmer()
+
+    def run(**params):
+        return client.get(
+            '/api/farmer/equipment/marketplace',
+            query_string=params,
+            headers=auth_headers(searcher.user),
+        )
+    run.profile = searcher
+    return run
+
+
+def test_radius_and_price_filters(search, make_equipment):
+    near = make_equipment(price=80.0)
+    _place(near.owner, 23.80, 90.40)
+    _place(search.profile, 23.81, 90.41)
+
+    found = search(radius_km=5, max_price=100).get_json()['equipment']
+    assert [item['id'] for item in found] == [near.id]
+    assert found[0]['distance_km'] < 5
+
+    assert search(radius_km=5, max_price=50).get_json()['equipment'] == []
+    assert search(lat=24.5, lon=90.4, radius_km=5).get_json()['equipment'] == []
+
+
+def test_radius_search_crosses_the_antimeridian(search, make_equipment):
+    equipment = make_equipment()
+    _place(equipment.owner, -16.5, 179.95)
+
+    found = search(lat=-16.5, lon=-179.95, radius_km=50).get_json()['equipment']
+    assert [item['id'] for item in found] == [equipment.id]
+
+
+@pytest.mark.parametrize('params', [
+    {'lat': 'inf', 'lon': 1},
+    {'lat': 'nan', 'lon': 1},
+    {'lat': 91, 'lon': 1},
+    {'lat': 1, 'lon': -181},
+    {'lat': 1, 'lon': 1, 'radius_km': 0},
+    {'lat': 1, 'lon': 1, 'radius_km': 'nan'},
+    {'max_price': 'inf'},
+])
+def test_invalid_parameters_are_rejected(search, params):
+    response = search(**params)
+    assert response.status_code == 400, response.get_json()
@@ -0,0 +1,66 @@
+"""Bookings of one machine never overlap."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from models.database import db
+from services.equipment_rentals import RentalError, book, update_status
+
+
+def _day(offset):
+    return date.today() + timedelta(days=offset)
+
+
+def test_overlapping_booking_is_refused(make_equipment, make_farmer):
+    equipment = make_equipment(price=50.0)
+    renter = make_farmer()
+
+    rental = book(equipment.id, renter.id, _day(10), _day(12))
+    assert (rental.total_days, rental.total_cost) == (3, 150.0)
+
+    for start, end in [(_day(12), _day(14)), (_day(8), _day(10)), (_day(9), _day(13))]:
+        with pytest.raises(RentalError) as error:
+            book(equipment.id, renter.id, start, end)
+        assert error.value.status_code == 409
+
+
+def test_adjacent_and_cancelled_bookings_do_not_block(make_equipment, make_farmer):
+    equipment = make_equipment()
+    renter = make_farmer()
+
+    rental = book(equipment.id, renter.id, _day(10), _day(12))
+    book(equipment.id, renter.id, _day(13), _day(14))
+
+    rental.status = 'cancelled'
+    db.session.commit()
+    book(equipment.id, renter.id, _day(10), _day(12))
+
+
+def test_invalid_bookings(make_equipment, make_farmer):
+    equipment = make_equipment()
+    renter = make_farmer()
+
+    with pytest.raises(RentalError):
+        book(equipment.id, renter.id, _day(-1), _day(1))
+    with pytest.raises(RentalError):
+        book(equipment.id, equipment.owner_id, _day(1), _day(2))
+    with pytest.raises(RentalError) as error:
+        book(equipment.id + 100, renter.id, _day(1), _day(2))
+    assert error.value.status_code == 404
+
+
+def test_rentals_only_move_forward(make_equipment, make_farmer):
+    equipment = make_equipment()
+    renter = make_farmer()
+    rental = book(equipment.id, renter.id, _day(10), _day(12))
+
+    update_status(rental.id, equipment.owner_id, 'active')
+    with pytest.raises(RentalError) as error:
+        update_status(rental.id, equipment.owner_id, 'pending')
+    assert error.value.status_code == 409
+
+    update_status(rental.id, equipment.owner_id, 'completed')
+    with pytest.raises(RentalError) as error:
+        update_status(rental.id, equipment.owner_id, 'cancelled')
+    assert error.value.status_code == 409
@@ -0,0 +1,41 @@
+"""Exports stream from the read replica and escape spreadsheet formulas."""
+
+import pytest
+from sqlalchemy import event
+
+from models.database import db, User, UserRole
+from models.session import REPLICA_BIND
+from services.checkout import checkout
+from services.export import _cell
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    # The replica is the same file, so it sees every committed row
+    return {'DATABASE_REPLICA_URL': f"sqlite:///{tmp_path / 'test.db'}"}
+
+
+def test_order_export_reads_from_the_replica(client, auth_headers, make_buyer, make_listing):
+    listing = make_listing()
+    checkout(make_buyer().id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+    admin = User.query.filter_by(role=UserRole.ADMIN).first()
+
+    replica_statements = []
+    event.listen(
+        db.engines[REPLICA_BIND], 'before_cursor_execute',
+        lambda conn, cursor, statement, *args: replica_statements.append(statement),
+    )
+
+    response = client.get('/api/admin/orders/export', headers=auth_headers(admin))
+    lines = response.get_data(as_text=True).splitlines()
+
+    assert response.status_code == 200
+    assert len(lines) == 2
+    assert any('FROM orders' in statement for statement in replica_statements)
+
+
+def test_formula_text_is_escaped():
+    assert _cell('=HYPERLINK("x")') == '\'=HYPERLINK("x")'
+    assert _cell('-3') == "'-3"
+    assert _cell(-3) == -3
+    assert _cell('rice') == 'rice'
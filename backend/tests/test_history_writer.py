@@ -0,0 +1,39 @@
+"""Recommendation history is written behind the request and survives bad rows."""
+
+import pytest
+
+from models.database import RecommendationHistory
+from services.history_writer import HistoryWriter
+
+
+@pytest.fixture
+def writer(app, monkeypatch):
+    app.config['HISTORY_FLUSH_INTERVAL'] = 3600
+    writer = HistoryWriter(app)
+    # Flushes happen when the test calls flush(), not on a background thread
+    monkeypatch.setattr(writer, '_ensure_thread', lambda: None)
+    return writer
+
+
+def test_rows_are_buffered_until_flushed(writer, make_farmer):
+    farmer = make_farmer()
+    for crop in ('rice', 'maize'):
+        writer.enqueue(farmer.id, 'crop', {'N': 90, 'pH': 6.5}, {'crop': crop, 'confidence': 0.8})
+
+    assert RecommendationHistory.query.count() == 0
+    assert [row['top_result'] for row in writer.pending_rows(farmer.id)] == ['rice', 'maize']
+
+    assert writer.flush() == 2
+    assert writer.pending_rows(farmer.id) == []
+    assert RecommendationHistory.query.count() == 2
+
+
+def test_a_rejected_row_does_not_block_the_batch(writer, make_farmer):
+    farmer = make_farmer()
+    writer.enqueue(farmer.id, 'crop', {}, {'crop': 'rice'})
+    writer.enqueue(None, 'crop', {}, {'crop': 'jute'})  # farmer_id is NOT NULL
+    writer.enqueue(farmer.id, 'crop', {}, {'crop': 'wheat'})
+
+    assert writer.flush() == 2
+    assert writer.discarded == 1
+    assert sorted(r.top_result for r in RecommendationHistory.query) == ['rice', 'wheat']
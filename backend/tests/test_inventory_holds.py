@@ -0,0 +1,58 @@
+"""Holds reserve stock until they expire."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.database import db, InventoryHold
+from services import inventory_holds
+from services.checkout import CheckoutError, checkout, confirm_holds, place_holds
+
+
+def _expire(hold):
+    hold.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.session.commit()
+
+
+def test_expired_hold_stops_counting_and_is_swept(make_buyer, make_listing):
+    holder = make_buyer('holder@example.com')
+    buyer = make_buyer()
+    listing = make_listing(quantity=5)
+    hold, = place_holds(holder.id, [{'type': 'crop', 'id': listing.id, 'quantity': 5}])
+
+    with pytest.raises(CheckoutError):
+        checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+
+    _expire(hold)
+    # Counts as free as soon as it expires, before any sweep.
+    checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+
+    assert inventory_holds.expire_holds() == 1
+    assert db.session.get(InventoryHold, hold.id).status == inventory_holds.EXPIRED
+    assert inventory_holds.expire_holds() == 0
+
+
+def test_expired_hold_cannot_be_confirmed(make_buyer, make_listing):
+    buyer = make_buyer()
+    listing = make_listing(quantity=5)
+    hold, = place_holds(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 2}])
+    _expire(hold)
+
+    with pytest.raises(CheckoutError) as error:
+        confirm_holds(buyer.id, [hold.id], {})
+    assert error.value.status_code == 409
+
+
+def test_confirmed_hold_becomes_an_order(make_buyer, make_listing):
+    buyer = make_buyer()
+    listing = make_listing(quantity=5)
+    hold, = place_holds(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 2}])
+
+    order_id, = confirm_holds(buyer.id, [hold.id], {})
+
+    db.session.expire_all()
+    hold = db.session.get(InventoryHold, hold.id)
+    assert (hold.status, hold.order_id) == (inventory_holds.CONFIRMED, order_id)
+    assert listing.quantity == 3
+    with pytest.raises(CheckoutError):
+        confirm_holds(buyer.id, [hold.id], {})
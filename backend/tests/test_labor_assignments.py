@@ -0,0 +1,84 @@
+"""Labor postings are never filled past laborers_needed."""
+
+import pytest
+
+from models.database import db, LaborHiring, LaborAssignment
+from services.labor_assignments import AssignmentError, claim_slot, set_laborers_needed
+
+
+def _filled(posting_id):
+    db.session.expire_all()
+    return db.session.get(LaborHiring, posting_id).laborers_filled
+
+
+def test_claims_stop_at_laborers_needed(make_posting, make_laborer):
+    posting = make_posting(laborers_needed=2)
+    workers = [make_laborer(f'worker{i}@example.com') for i in range(3)]
+
+    claim_slot(posting.id, workers[0].id)
+    claim_slot(posting.id, workers[1].id)
+    with pytest.raises(AssignmentError) as error:
+        claim_slot(posting.id, workers[2].id)
+
+    assert error.value.status_code == 409
+    assert _filled(posting.id) == 2
+    assert LaborAssignment.query.filter_by(posting_id=posting.id).count() == 2
+
+
+def test_worker_cannot_take_two_slots(make_posting, make_laborer):
+    posting = make_posting(laborers_needed=3)
+    worker = make_laborer()
+
+    claim_slot(posting.id, worker.id)
+    with pytest.raises(AssignmentError) as error:
+        claim_slot(posting.id, worker.id)
+
+    assert error.value.status_code == 409
+    assert _filled(posting.id) == 1
+
+
+def test_closed_or_missing_posting_cannot_be_claimed(make_posting, make_laborer):
+    posting = make_posting(status='cancelled')
+    worker = make_laborer()
+
+    with pytest.raises(AssignmentError) as error:
+        claim_slot(posting.id, worker.id)
+    assert error.value.status_code == 409
+
+    with pytest.raises(AssignmentError) as error:
+        claim_slot(posting.id + 100, worker.id)
+    assert error.value.status_code == 404
+
+
+def test_laborers_needed_cannot_drop_below_filled(make_posting, make_laborer):
+    posting = make_posting(laborers_needed=3)
+    for i in range(2):
+        claim_slot(posting.id, make_laborer(f'worker{i}@example.com').id)
+
+    with pytest.raises(AssignmentError) as error:
+        set_laborers_needed(posting.id, 1)
+    assert error.value.status_code == 409
+
+    set_laborers_needed(posting.id, 2)
+    db.session.commit()
+    db.session.expire_all()
+    assert db.session.get(LaborHiring, posting.id).laborers_needed == 2
+
+
+def test_update_route_returns_409_when_lowering_below_filled(
+        client, auth_headers, make_posting, make_laborer):
+    posting = make_posting(laborers_needed=2)
+    claim_slot(posting.id, make_laborer('a@example.com').id)
+    claim_slot(posting.id, make_laborer('b@example.com').id)
+    owner = posting.farmer.user
+
+    response = client.put(
+        f'/api/farmer/labor-postings/{posting.id}',
+        json={'laborers_needed': 1, 'job_title': 'Renamed'},
+        headers=auth_headers(owner),
+    )
+
+    assert response.status_code == 409
+    db.session.expire_all()
+    stored = db.session.get(LaborHiring, posting.id)
+    assert (stored.laborers_needed, stored.job_title) == (2, 'Harvest')
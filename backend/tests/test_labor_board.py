@@ -0,0 +1,62 @@
+"""Labor job lists page by keyset cursor; earnings are summed in SQL."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import inspect
+
+from models.database import db, LaborHiring
+from services.labor_assignments import claim_slot
+from services.labor_board import labor_earnings, labor_jobs, open_postings
+
+
+def _postings(make_posting, make_farmer, count):
+    farmer = make_farmer()
+    postings = [make_posting(laborers_needed=1, farmer=farmer) for _ in range(count)]
+    # Two postings share a timestamp so the id tie-break is exercised.
+    base = datetime(2030, 1, 1)
+    for i, posting in enumerate(postings):
+        posting.created_at = base + timedelta(minutes=i // 2)
+    db.session.commit()
+    return postings
+
+
+def test_pages_cover_every_open_posting_once(make_posting, make_farmer):
+    postings = _postings(make_posting, make_farmer, 7)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        args = {'limit': '3', **({'cursor': cursor} if cursor else {})}
+        page, cursor = open_postings(args)
+        seen += [posting['id'] for posting in page]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    expected = sorted(postings, key=lambda p: (p.created_at, p.id), reverse=True)
+    assert seen == [posting.id for posting in expected]
+
+
+def test_my_jobs_and_earnings_come_from_assignments(make_posting, make_farmer, make_laborer):
+    postings = _postings(make_posting, make_farmer, 3)
+    worker = make_laborer()
+    for posting in postings:
+        posting.daily_wage, posting.total_days = 100.0, 2
+        claim_slot(posting.id, worker.id)
+    postings[0].status = 'completed'
+    postings[1].status = 'completed'
+    postings[1].total_wage = 500.0
+    postings[0].created_at = datetime(2020, 1, 1)
+    postings[1].created_at = datetime.utcnow()
+    db.session.commit()
+
+    jobs, cursor = labor_jobs(worker.id, {'limit': '2'})
+    assert len(jobs) == 2 and cursor is not None
+
+    assert labor_earnings(worker.id) == {'total': 700.0, 'this_month': 500.0, 'completed': 2}
+
+
+def test_labor_id_index_on_postings_is_gone(app):
+    indexes = {index['name'] for index in inspect(db.engine).get_indexes(LaborHiring.__tablename__)}
+    assert 'ix_labor_hiring_labor_created' not in indexes
+    assert 'ix_labor_hiring_farmer_created' in indexes
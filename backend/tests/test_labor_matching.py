@@ -0,0 +1,56 @@
+"""Labor matching ranks on shared skill tags from the tag index."""
+
+import services.labor_matching as labor_matching
+from models.database import db
+from services.labor_assignments import claim_slot
+from services.labor_matching import posting_candidates, recommended_jobs
+
+
+def _skilled(make_laborer, email, skills):
+    worker = make_laborer(email)
+    worker.skills = skills
+    db.session.commit()
+    return worker
+
+
+def _posting(make_posting, work_type, laborers_needed=2, farmer=None):
+    posting = make_posting(laborers_needed=laborers_needed, farmer=farmer)
+    posting.work_type = work_type
+    db.session.commit()
+    return posting
+
+
+def test_candidates_are_ranked_and_exclude_assigned_workers(make_posting, make_laborer):
+    posting = _posting(make_posting, 'Harvesting, Weeding', laborers_needed=3)
+    both = _skilled(make_laborer, 'both@example.com', 'harvest, weeding')
+    one = _skilled(make_laborer, 'one@example.com', 'weed control')
+    _skilled(make_laborer, 'none@example.com', 'plowing')
+    assigned = _skilled(make_laborer, 'assigned@example.com', 'harvesting')
+    claim_slot(posting.id, assigned.id)
+
+    candidates = posting_candidates(posting)
+
+    assert [c['labor_id'] for c in candidates] == [both.id, one.id]
+    assert candidates[0]['match']['matched_skills'] == ['harvesting', 'weeding']
+
+
+def test_candidate_cutoff_keeps_the_best_overlap(make_posting, make_laborer, monkeypatch):
+    monkeypatch.setattr(labor_matching, 'MAX_CANDIDATES', 1)
+    posting = _posting(make_posting, 'Harvesting, Weeding')
+    _skilled(make_laborer, 'one@example.com', 'harvesting')
+    both = _skilled(make_laborer, 'both@example.com', 'harvesting, weeding')
+
+    assert [c['labor_id'] for c in posting_candidates(posting)] == [both.id]
+
+
+def test_recommended_jobs_skip_jobs_already_taken(make_posting, make_laborer):
+    worker = _skilled(make_laborer, 'worker@example.com', 'spraying')
+    taken = _posting(make_posting, 'Spraying')
+    claim_slot(taken.id, worker.id)
+    db.session.refresh(worker)
+
+    open_job = _posting(make_posting, 'Pest control', farmer=taken.farmer)
+
+    jobs = recommended_jobs(worker.user)
+    assert [job['id'] for job in jobs] == [open_job.id]
+    assert jobs[0]['match']['matched_skills'] == ['spraying']
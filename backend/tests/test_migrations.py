@@ -0,0 +1,88 @@
+"""The migration history builds the same schema from scratch and from the
+committed SQLite database."""
+
+import os
+import shutil
+
+from sqlalchemy import create_engine, inspect
+
+from migrations import current_version, discover, upgrade
+
+
+BASELINE_DB = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'smart_farming.db')
+
+
+def _schema(engine):
+    """``{table: ({column: nullable}, {index names})}`` without ``schema_version``."""
+    inspector = inspect(engine)
+    return {
+        table: (
+            {column['name']: column['nullable'] for column in inspector.get_columns(table)},
+            {index['name'] for index in inspector.get_indexes(table)},
+        )
+        for table in inspector.get_table_names()
+        if table != 'schema_version'
+    }
+
+
+def _upgrade(path, tmp_path):
+    engine = create_engine(f'sqlite:///{path}')
+    applied = upgrade(engine, str(tmp_path / 'migrate.lock'))
+    return engine, applied
+
+
+def test_fresh_database_gets_every_migration(tmp_path):
+    engine, applied = _upgrade(tmp_path / 'fresh.db', tmp_path)
+
+    latest = discover()[-1].version
+    assert [migration.version for migration in applied] == [m.version for m in discover()]
+    with engine.connect() as connection:
+        assert current_version(connection) == latest
+    # A current database has nothing left to do.
+    assert upgrade(engine, str(tmp_path / 'migrate.lock')) == []
+    engine.dispose()
+
+
+def test_baseline_database_upgrades_to_the_fresh_schema(tmp_path):
+    baseline = tmp_path / 'baseline.db'
+    shutil.copy(BASELINE_DB, baseline)
+
+    upgraded, applied = _upgrade(baseline, tmp_path)
+    fresh, _ = _upgrade(tmp_path / 'fresh.db', tmp_path)
+
+    assert applied
+    expected, actual = _schema(fresh), _schema(upgraded)
+    # SQLite cannot add NOT NULL to an existing column (see migration 0015).
+    expected['labor_hiring'][0]['created_at'] = True
+    actual['labor_hiring'][0]['created_at'] = True
+    assert actual == expected
+    upgraded.dispose()
+    fresh.dispose()
+
+
+def test_history_rows_survive_the_upgrade(tmp_path):
+    baseline = tmp_path / 'baseline.db'
+    shutil.copy(BASELINE_DB, baseline)
+    with create_engine(f'sqlite:///{baseline}').connect() as connection:
+        before = connection.exec_driver_sql('SELECT count(*) FROM recommendation_history').scalar()
+
+    engine, _ = _upgrade(baseline, tmp_path)
+    with engine.connect() as connection:
+        after = connection.exec_driver_sql(
+            'SELECT count(*), count(payload) FROM recommendation_history'
+        ).one()
+    assert tuple(after) == (before, before)
+    engine.dispose()
+
+
+def test_labor_tags_are_filled_from_existing_rows(tmp_path):
+    baseline = tmp_path / 'baseline.db'
+    shutil.copy(BASELINE_DB, baseline)
+
+    engine, _ = _upgrade(baseline, tmp_path)
+    with engine.connect() as connection:
+        skills = connection.exec_driver_sql('SELECT tag FROM labor_skill_tags ORDER BY tag').scalars()
+        postings = connection.exec_driver_sql('SELECT tag FROM labor_posting_tags').scalars()
+        assert list(skills) == ['harvesting', 'planting']
+        assert list(postings) == ['harvesting']
+    engine.dispose()
@@ -0,0 +1,69 @@
+"""Order status events reach the buyer over the SSE stream."""
+
+import pytest
+
+from models.database import db, Order
+from services.checkout import checkout
+from services.order_events import order_events
+
+
+@pytest.fixture
+def app_config():
+    return {'ORDER_EVENTS_BACKEND': 'database', 'ORDER_EVENTS_STREAM_SECONDS': 1}
+
+
+def _order(make_buyer, make_listing):
+    listing = make_listing()
+    buyer = make_buyer()
+    order_ids = checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+    return db.session.get(Order, order_ids[0]), buyer, listing.farmer.user
+
+
+def test_status_change_is_published_to_buyer_and_seller(
+        client, auth_headers, make_buyer, make_listing):
+    order, buyer, seller = _order(make_buyer, make_listing)
+
+    response = client.put(
+        f'/api/farmer/orders/{order.id}/status',
+        json={'status': 'confirmed'},
+        headers=auth_headers(seller),
+    )
+    assert response.status_code == 200
+
+    for user in (buyer, seller):
+        events = order_events.read(user.id, 0, timeout=0)
+        assert [event['status'] for _, event in events] == ['confirmed']
+
+
+def test_stream_token_replays_events_after_last_event_id(
+        client, auth_headers, make_buyer, make_listing):
+    order, buyer, seller = _order(make_buyer, make_listing)
+    client.put(
+        f'/api/farmer/orders/{order.id}/status',
+        json={'status': 'confirmed'},
+        headers=auth_headers(seller),
+    )
+
+    token = client.post('/api/orders/events/token', headers=auth_headers(buyer)).get_json()
+    response = client.get(f"/api/orders/events?stream_token={token['stream_token']}&last_event_id=0")
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    assert 'event: order_status' in body
+    assert f'"order_id": {order.id}' in body
+
+
+def test_stream_token_is_not_a_bearer_token(client, auth_headers, make_buyer):
+    buyer = make_buyer()
+    token = client.post('/api/orders/events/token', headers=auth_headers(buyer)).get_json()
+
+    response = client.get(
+        '/api/buyer/orders',
+        headers={'Authorization': f"Bearer {token['stream_token']}"},
+    )
+    assert response.status_code == 401
+
+    # ...and a session token is not accepted as a stream token
+    session_token = auth_headers(buyer)['Authorization'].split()[1]
+    assert client.get(f'/api/orders/events?stream_token={session_token}').status_code == 401
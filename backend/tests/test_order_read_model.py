@@ -0,0 +1,47 @@
+"""Orders carry product, seller and buyer names written at insert time."""
+
+from models.database import db, Order
+from services.checkout import checkout
+
+
+def test_checkout_fills_the_name_columns(make_buyer, make_listing):
+    listing = make_listing()
+    buyer = make_buyer()
+
+    order_ids = checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+    order = db.session.get(Order, order_ids[0])
+
+    assert order.product_name == 'rice'
+    assert order.seller_id == listing.farmer.user_id
+    assert order.seller_name == listing.farmer.user.full_name
+    assert (order.buyer_name, order.buyer_email) == (buyer.full_name, buyer.email)
+
+
+def test_orm_insert_fills_seller_and_vendor(make_buyer, make_vendor_product):
+    product = make_vendor_product()
+    order = Order(
+        buyer_id=make_buyer().id, order_type='vendor_product', vendor_product_id=product.id,
+        quantity=1, unit_price=5.0, total_price=5.0,
+    )
+    db.session.add(order)
+    db.session.commit()
+
+    assert order.product_name == 'urea'
+    assert order.vendor_id == product.vendor_id
+    assert order.seller_id == product.vendor.user_id
+    assert order.buyer_name == 'buyer'
+
+
+def test_renames_are_copied_onto_existing_orders(client, auth_headers, make_buyer, make_listing):
+    listing = make_listing()
+    buyer = make_buyer()
+    checkout(buyer.id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+
+    buyer.full_name = 'Renamed Buyer'
+    listing.farmer.user.full_name = 'Renamed Farmer'
+    db.session.commit()
+
+    orders = client.get('/api/buyer/orders', headers=auth_headers(buyer)).get_json()['orders']
+    assert orders[0]['seller_name'] == 'Renamed Farmer'
+    db.session.expire_all()
+    assert Order.query.one().buyer_name == 'Renamed Buyer'
@@ -0,0 +1,35 @@
+"""Order owners can only move orders forward through their lifecycle."""
+
+from models.database import db, Order, OrderStatus
+from services.checkout import checkout
+
+
+def _order(make_buyer, make_listing):
+    listing = make_listing()
+    order_ids = checkout(make_buyer().id, [{'type': 'crop', 'id': listing.id, 'quantity': 1}], {})
+    return db.session.get(Order, order_ids[0]), listing.farmer.user
+
+
+def test_forward_transitions_are_allowed(client, auth_headers, make_buyer, make_listing):
+    order, seller = _order(make_buyer, make_listing)
+
+    for status in ('confirmed', 'in_progress', 'completed'):
+        response = client.put(
+            f'/api/farmer/orders/{order.id}/status',
+            json={'status': status},
+            headers=auth_headers(seller),
+        )
+        assert response.status_code == 200, response.get_json()
+
+
+def test_backward_and_final_transitions_are_refused(client, auth_headers, make_buyer, make_listing):
+    order, seller = _order(make_buyer, make_listing)
+    url = f'/api/farmer/orders/{order.id}/status'
+
+    assert client.put(url, json={'status': 'cancelled'}, headers=auth_headers(seller)).status_code == 200
+    for status in ('confirmed', 'pending', 'completed'):
+        response = client.put(url, json={'status': status}, headers=auth_headers(seller))
+        assert response.status_code == 409
+
+    db.session.expire_all()
+    assert db.session.get(Order, order.id).status == OrderStatus.CANCELLED
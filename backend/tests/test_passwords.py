@@ -0,0 +1,87 @@
+"""Password hashing pool: rehash on login, fail fast when saturated."""
+
+import threading
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+import utils.passwords as passwords
+from models.database import db, User
+from utils.passwords import PasswordHasher, PasswordHasherBusy, password_hasher
+
+
+@pytest.fixture
+def app_config():
+    return {'PASSWORD_HASH_METHOD': 'pbkdf2:sha256:2000'}
+
+
+@pytest.fixture
+def blocked_hash(monkeypatch):
+    """Make hashing wait for ``release``; ``started`` is set once one is running."""
+    started, release = threading.Event(), threading.Event()
+
+    def slow_hash(password, method, salt_length):
+        started.set()
+        release.wait(5)
+        return 'hash'
+
+    monkeypatch.setattr(passwords, 'generate_password_hash', slow_hash)
+    yield started, release
+    release.set()
+
+
+def _login(client, email='buyer@example.com', password='secret'):
+    return client.post('/api/auth/login', json={'email': email, 'password': password})
+
+
+def test_login_rehashes_passwords_made_with_old_parameters(client, make_buyer):
+    user = make_buyer()
+    user.password_hash = generate_password_hash('secret', 'pbkdf2:sha256:1000', 16)
+    db.session.commit()
+    assert user.password_needs_rehash()
+
+    assert _login(client).status_code == 200
+
+    db.session.expire_all()
+    user = db.session.get(User, user.id)
+    assert user.password_hash.startswith('pbkdf2:sha256:2000$')
+    assert not user.password_needs_rehash()
+    assert user.check_password('secret')
+
+
+def test_short_salt_needs_rehash(app):
+    assert password_hasher.needs_rehash(generate_password_hash('x', 'pbkdf2:sha256:2000', 8))
+    assert not password_hasher.needs_rehash(generate_password_hash('x', 'pbkdf2:sha256:2000', 16))
+
+
+def test_slow_hash_times_out(blocked_hash):
+    hasher = PasswordHasher()
+    hasher.timeout = 0.05
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash('secret')
+
+
+def test_saturated_pool_rejects_new_work(blocked_hash):
+    hasher = PasswordHasher()
+    hasher.workers, hasher.max_pending = 1, 0
+    first = threading.Thread(target=hasher.hash, args=('secret',))
+    started, release = blocked_hash
+    first.start()
+    assert started.wait(5)
+
+    with pytest.raises(PasswordHasherBusy):
+        hasher.hash('other')
+    release.set()
+    first.join()
+
+
+def test_login_returns_503_when_busy(client, make_buyer, monkeypatch):
+    make_buyer()
+
+    def busy(password_hash, password):
+        raise PasswordHasherBusy('busy')
+
+    monkeypatch.setattr(password_hasher, 'verify', busy)
+    response = _login(client)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,36 @@
+"""Dashboard counters follow inserts, deletes and role changes."""
+
+from models.database import db, UserRole
+from services.platform_counters import count_platform, read_counters, user_counter
+
+
+def _assert_in_step():
+    counters = read_counters()
+    for name, value in count_platform().items():
+        assert counters.get(name, 0) == value, name
+
+
+def test_counters_follow_inserts_and_deletes(make_buyer, make_listing):
+    before = read_counters()
+    listing = make_listing()
+    make_buyer()
+
+    counters = read_counters()
+    assert counters['crop_listings'] == before.get('crop_listings', 0) + 1
+    assert counters[user_counter(UserRole.BUYER)] == before.get(user_counter(UserRole.BUYER), 0) + 1
+
+    db.session.delete(listing)
+    db.session.commit()
+    _assert_in_step()
+
+
+def test_role_change_moves_the_user_between_counters(make_buyer):
+    user = make_buyer()
+    # The role is changed in a later transaction, after the row was expired
+    user.role = UserRole.VENDOR
+    db.session.commit()
+
+    counters = read_counters()
+    assert counters.get(user_counter(UserRole.BUYER), 0) == 0
+    assert counters[user_counter(UserRole.VENDOR)] == 1
+    _assert_in_step()
@@ -0,0 +1,72 @@
+"""read_only views read from the replica and fall back to the primary."""
+
+import pytest
+from flask import g
+from sqlalchemy import event
+
+import models.session as session_module
+from models.database import db, User
+from models.session import REPLICA_BIND, read_only
+
+
+@pytest.fixture
+def app_config(tmp_path, request):
+    # By default the replica is the test database itself
+    replica = getattr(request, 'param', 'test.db')
+    return {
+        'DATABASE_REPLICA_URL': f"sqlite:///{tmp_path / replica}",
+        'REPLICA_RETRY_SECONDS': 30,
+    }
+
+
+@pytest.fixture(autouse=True)
+def replica_up(monkeypatch):
+    monkeypatch.setattr(session_module, '_replica_down_until', 0.0)
+
+
+def _statements(engine):
+    statements = []
+    event.listen(
+        engine, 'before_cursor_execute',
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+def test_reads_go_to_the_replica_and_writes_to_the_primary(app, make_buyer):
+    make_buyer()
+    replica = _statements(db.engines[REPLICA_BIND])
+    primary = _statements(db.engine)
+
+    @read_only
+    def view():
+        return User.query.count()
+
+    with app.test_request_context():
+        assert view() == 2  # the admin and the buyer
+        User.query.first().phone = '123'
+        db.session.commit()  # outside read_only: primary
+
+    assert any('FROM users' in s for s in replica)
+    assert not any(s.startswith('UPDATE') for s in replica)
+    assert any(s.startswith('UPDATE users') for s in primary)
+
+
+@pytest.mark.parametrize('app_config', ['empty.db'], indirect=True)
+def test_replica_errors_rerun_the_view_on_the_primary(app, make_buyer):
+    # The empty replica has no tables, so every read on it fails
+    make_buyer()
+    calls = []
+
+    @read_only
+    def view():
+        calls.append(g.get('db_read_only'))
+        return User.query.count()
+
+    with app.test_request_context():
+        assert view() == 2
+        assert calls == [True, False]
+        # The replica is skipped until REPLICA_RETRY_SECONDS have passed
+        assert not session_module.replica_available()
+        assert view() == 2
+        assert not calls[2]
@@ -0,0 +1,51 @@
+"""History rows round-trip through typed columns; rollups average per column."""
+
+from datetime import datetime, timedelta
+
+from models.database import db, RecommendationHistory, RecommendationDailyRollup
+from services.recommendation_history import (
+    build_history_row,
+    rollup_history,
+    serialize_history,
+    serialize_rollup,
+)
+
+
+def _store(farmer_id, recommendation_type, inputs, result, created_at=None):
+    row = build_history_row(farmer_id, recommendation_type, inputs, result)
+    row['created_at'] = created_at or datetime.utcnow()
+    db.session.bulk_insert_mappings(RecommendationHistory, [row])
+    db.session.commit()
+
+
+def test_history_round_trips_to_the_original_request(make_farmer):
+    farmer = make_farmer()
+    inputs = {'N': 90, 'P': 40, 'K': 40, 'pH': 6.5, 'temperature': 25.0,
+              'humidity': 80, 'rainfall': '200', 'location': 'Dhaka'}
+    result = {'crop': 'rice', 'confidence': 0.91, 'alternatives': ['jute']}
+    _store(farmer.id, 'crop', inputs, result)
+
+    record = RecommendationHistory.query.one()
+    assert record.rainfall is None  # a string is kept in the payload as sent
+    full = serialize_history(record)
+    assert (full['input'], full['result']) == (inputs, result)
+
+    compact = serialize_history(record, compact=True)
+    assert 'location' not in compact['input']
+    assert compact['result'] == {'crop': 'rice', 'confidence': 0.91}
+
+
+def test_rollup_averages_only_rows_with_a_value(make_farmer):
+    farmer = make_farmer()
+    old = datetime.utcnow() - timedelta(days=200)
+    _store(farmer.id, 'fertilizer', {'N': 10}, {'fertilizer': 'Urea', 'confidence': 0.5}, old)
+    _store(farmer.id, 'fertilizer', {'N': 30, 'temperature': 20}, {'fertilizer': 'Urea'}, old)
+    _store(farmer.id, 'fertilizer', {'N': 50}, {'fertilizer': 'Urea'})
+
+    assert rollup_history(retention_days=90) == 2
+    assert RecommendationHistory.query.count() == 1
+
+    summary = serialize_rollup(RecommendationDailyRollup.query.one())
+    assert summary['count'] == 2
+    assert summary['avg_confidence'] == 0.5
+    assert summary['avg_input'] == {'N': 20.0, 'temperature': 20.0}
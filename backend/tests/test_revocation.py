@@ -0,0 +1,56 @@
+"""Revoked tokens are rejected, including revocations made by other workers."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.database import db, RevokedToken
+from utils.auth import generate_token
+from utils.revocation import BloomFilter, revocation_list
+
+
+@pytest.fixture
+def app_config():
+    return {'REVOCATION_REFRESH_SECONDS': 0}
+
+
+def _revoked_elsewhere(jti, row_id=None):
+    """Insert a revocation as another worker would, bypassing this filter."""
+    db.session.add(RevokedToken(
+        id=row_id, jti=jti, user_id=1, expires_at=datetime.utcnow() + timedelta(hours=1)
+    ))
+    db.session.commit()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    values = [f'jti-{n}' for n in range(1000)]
+    for value in values:
+        bloom.add(value)
+
+    assert all(value in bloom for value in values)
+    false_positives = sum(f'other-{n}' in bloom for n in range(10000))
+    assert false_positives < 500
+
+
+def test_logout_revokes_the_token(client, make_buyer):
+    buyer = make_buyer()
+    headers = {'Authorization': f'Bearer {generate_token(buyer.id, buyer.role)}'}
+
+    assert client.post('/api/auth/logout', headers=headers).status_code == 200
+    assert client.get('/api/buyer/orders', headers=headers).status_code == 401
+
+
+def test_revocations_from_other_workers_are_picked_up(app):
+    assert not revocation_list.is_revoked('remote')
+    _revoked_elsewhere('remote')
+    assert revocation_list.is_revoked('remote')
+
+
+def test_ids_committed_out_of_order_are_rescanned(app):
+    _revoked_elsewhere('later', row_id=5)
+    assert revocation_list.is_revoked('later')
+
+    # A lower id that became visible after the filter moved past it
+    _revoked_elsewhere('earlier', row_id=3)
+    assert revocation_list.is_revoked('earlier')
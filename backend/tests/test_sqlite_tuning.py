@@ -0,0 +1,28 @@
+"""SQLite connections get the production pragmas; pools are sized per backend."""
+
+from models.database import db, _engine_options
+
+
+def _pragma(connection, name):
+    return connection.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+
+def test_every_connection_gets_the_pragmas(app):
+    with db.engine.connect() as connection:
+        assert _pragma(connection, 'journal_mode') == 'wal'
+        assert _pragma(connection, 'synchronous') == 1  # NORMAL
+        assert _pragma(connection, 'busy_timeout') == app.config['SQLITE_BUSY_TIMEOUT_MS']
+        assert _pragma(connection, 'temp_store') == 2  # MEMORY
+
+
+def test_pool_options_follow_the_backend(app):
+    sqlite = _engine_options(app, 'sqlite:///farm.db')
+    assert sqlite['pool_size'] == app.config['SQLITE_POOL_SIZE']
+    assert sqlite['connect_args'] == {'check_same_thread': False}
+    assert 'pool_pre_ping' not in sqlite
+
+    postgres = _engine_options(app, 'postgresql://db/farm', {'pool_size': 3})
+    assert postgres['pool_size'] == 3  # explicit engine options win
+    assert postgres['max_overflow'] == app.config['DB_MAX_OVERFLOW']
+    assert postgres['pool_pre_ping'] == app.config['DB_POOL_PRE_PING']
+    assert postgres['pool_recycle'] == app.config['DB_POOL_RECYCLE']
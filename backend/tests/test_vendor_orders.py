@@ -0,0 +1,32 @@
+"""Vendors see and update only the orders recorded against their vendor id."""
+
+from models.database import db, Order
+from services.checkout import checkout
+
+
+def _vendor_order(make_buyer, product):
+    order_ids = checkout(
+        make_buyer().id, [{'type': 'vendor_product', 'id': product.id, 'quantity': 1}], {}
+    )
+    return db.session.get(Order, order_ids[0])
+
+
+def test_checkout_records_the_vendor_id(make_buyer, make_vendor_product):
+    product = make_vendor_product()
+    assert _vendor_order(make_buyer, product).vendor_id == product.vendor_id
+
+
+def test_vendor_order_list_and_update_are_scoped(
+        client, auth_headers, make_buyer, make_vendor_product):
+    product = make_vendor_product()
+    other = make_vendor_product(email='other@example.com')
+    order = _vendor_order(make_buyer, product)
+    owner, stranger = product.vendor.user, other.vendor.user
+
+    orders = client.get('/api/vendor/orders', headers=auth_headers(owner)).get_json()['orders']
+    assert [row['id'] for row in orders] == [order.id]
+    assert client.get('/api/vendor/orders', headers=auth_headers(stranger)).get_json()['orders'] == []
+
+    url = f'/api/vendor/orders/{order.id}'
+    assert client.put(url, json={'status': 'confirmed'}, headers=auth_headers(stranger)).status_code == 403
+    assert client.put(url, json={'status': 'confirmed'}, headers=auth_headers(owner)).status_code == 200
@@ -4,10 +4,16 @@ Handles JWT token generation, validation, and role-based access control
 """
 
 import jwt
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify
+from sqlalchemy.orm import joinedload
 from models.database import User, UserRole
+from utils.revocation import revocation_list
 import os
 
 
@@ -16,6 +22,24 @@ SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'your-secret-key-change-in-product
 JWT_ALGORITHM = 'HS256'
 JWT_EXPIRATION_HOURS = 24
 
+# Audience of the short-lived tokens accepted only by the order event stream.
+# Regular tokens carry no audience, and PyJWT rejects tokens with one unless
+# it is asked for, so stream tokens cannot be used against the rest of the API.
+STREAM_TOKEN_AUDIENCE = 'order-events'
+
+# Verified tokens are remembered until they expire so repeat requests skip
+# the HMAC check. Bounded LRU; least recently used tokens are evicted first.
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 4096))
+_verified_tokens = OrderedDict()
+_verified_lock = threading.Lock()
+
+# Role profile loaded together with the user for the request principal
+PROFILE_BY_ROLE = {
+    UserRole.FARMER.value: User.farmer_profile,
+    UserRole.VENDOR.value: User.vendor_profile,
+    UserRole.LABOR.value: User.labor_profile,
+}
+
 
 def generate_token(user_id, role):
     """Generate JWT token for authenticated user"""
@@ -23,22 +47,85 @@ def generate_token(user_id, role):
         'user_id': user_id,
         'role': role.value if isinstance(role, UserRole) else role,
         'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS),
-        'iat': datetime.utcnow()
+        'iat': datetime.utcnow(),
+        'jti': uuid.uuid4().hex
     }
     token = jwt.encode(payload, SECRET_KEY, algorithm=JWT_ALGORITHM)
     return token
 
 
+def _verify_token(token):
+    """Verify the token signature and expiry, using the LRU of verified tokens"""
+    now = time.time()
+    with _verified_lock:
+        payload = _verified_tokens.get(token)
+        if payload is not None:
+            if payload['exp'] > now:
+                _verified_tokens.move_to_end(token)
+                return dict(payload)
+            del _verified_tokens[token]
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    if 'exp' in payload:
+        with _verified_lock:
+            _verified_tokens[token] = payload
+            while len(_verified_tokens) > TOKEN_CACHE_SIZE:
+                _verified_tokens.popitem(last=False)
+    return dict(payload)
+
+
 def decode_token(token):
     """Decode and validate JWT token"""
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
+        payload = _verify_token(token)
+    except jwt.ExpiredSignatureError:
+        return {'error': 'Token has expired'}
+    except jwt.InvalidTokenError:
+        return {'error': 'Invalid token'}
+
+    # Tokens issued before revocation support have no jti and cannot be revoked
+    if payload.get('jti') and revocation_list.is_revoked(payload['jti']):
+        return {'error': 'Token has been revoked'}
+    return payload
+
+
+def generate_stream_token(payload, ttl_seconds):
+    """Generate a short-lived token for the order event stream from a decoded token"""
+    now = datetime.utcnow()
+    stream_payload = {
+        'user_id': payload['user_id'],
+        'aud': STREAM_TOKEN_AUDIENCE,
+        'sid': payload.get('jti'),  # session token; logging out revokes the stream token too
+        'exp': now + timedelta(seconds=ttl_seconds),
+        'iat': now,
+    }
+    return jwt.encode(stream_payload, SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
+def decode_stream_token(token):
+    """Decode and validate an order event stream token"""
+    try:
+        payload = jwt.decode(
+            token, SECRET_KEY, algorithms=[JWT_ALGORITHM], audience=STREAM_TOKEN_AUDIENCE
+        )
     except jwt.ExpiredSignatureError:
         return {'error': 'Token has expired'}
     except jwt.InvalidTokenError:
         return {'error': 'Invalid token'}
 
+    if payload.get('sid') and revocation_list.is_revoked(payload['sid']):
+        return {'error': 'Token has been revoked'}
+    return payload
+
+
+def revoke_token(payload):
+    """Revoke a decoded token (logout) until it expires"""
+    revocation_list.revoke(
+        payload['jti'],
+        payload['user_id'],
+        datetime.utcfromtimestamp(payload['exp'])
+    )
+
 
 def get_token_from_header():
     """Extract token from Authorization header"""
@@ -87,6 +174,10 @@ def login_required(f):
 
 def role_required(*allowed_roles):
     """Decorator to require specific role(s) for endpoints"""
+    # Convert roles to their string values once, at decoration time
+    required_roles = [role.value if isinstance(role, UserRole) else role for role in allowed_roles]
+    allowed_role_values = frozenset(required_roles)
+
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
@@ -102,13 +193,10 @@ def role_required(*allowed_roles):
             
             user_role = payload.get('role')
             
-            # Convert string roles to list for comparison
-            allowed_role_values = [role.value if isinstance(role, UserRole) else role for role in allowed_roles]
-            
             if user_role not in allowed_role_values:
                 return jsonify({
                     'error': 'Access denied. Insufficient permissions.',
-                    'required_roles': allowed_role_values,
+                    'required_roles': required_roles,
                     'user_role': user_role
                 }), 403
             
@@ -129,6 +217,20 @@ def get_current_user():
     return getattr(request, 'current_user', None)
 
 
+def get_current_principal():
+    """Get the authenticated ``User`` with its role profile, loaded once per request"""
+    if not hasattr(request, 'principal'):
+        current_user = get_current_user()
+        if current_user is None:
+            return None
+        query = User.query
+        profile = PROFILE_BY_ROLE.get(current_user['role'])
+        if profile is not None:
+            query = query.options(joinedload(profile))
+        request.principal = query.filter(User.id == current_user['user_id']).first()
+    return request.principal
+
+
 def create_admin_user(db, email, password, full_name):
     """Utility function to create admin user"""
     from models.database import User, UserRole
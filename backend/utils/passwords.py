@@ -0,0 +1,103 @@
+"""
+Password hashing on a bounded worker pool
+
+Hashing and verification run on a small dedicated thread pool (werkzeug's
+scrypt/PBKDF2 release the GIL inside hashlib), so a burst of logins can use
+at most PASSWORD_HASH_WORKERS cores while the rest of the API keeps serving.
+When more than PASSWORD_HASH_QUEUE calls are already waiting, new ones fail
+fast with PasswordHasherBusy instead of piling up, and so do calls that
+wait longer than PASSWORD_HASH_TIMEOUT. A forked worker builds its own pool
+on first use, since the parent's threads do not survive the fork.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when the hashing pool is saturated; retry later."""
+
+
+class PasswordHasher:
+    """Bounded executor for password hashing and verification"""
+
+    def __init__(self, app=None):
+        self.method = 'scrypt'
+        self.salt_length = 16
+        self.workers = 2
+        self.max_pending = 32
+        self.timeout = 30
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._prefix = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read hash parameters and pool limits from ``app.config``"""
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.salt_length = app.config.get('PASSWORD_SALT_LENGTH', self.salt_length)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', self.workers)
+        self.max_pending = app.config.get('PASSWORD_HASH_QUEUE', self.max_pending)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=False)
+            self._executor = None
+            self._prefix = None
+
+    def _submit(self, fn, *args):
+        with self._lock:
+            pid = os.getpid()
+            if self._executor is None or self._pid != pid:
+                # An executor inherited across fork has no live threads.
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='password-hasher'
+                )
+                self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+                self._pid = pid
+            executor, slots = self._executor, self._slots
+
+        if not slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Too many concurrent sign-ins, please retry shortly')
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHasherBusy('Password check timed out, please retry shortly')
+
+    def hash(self, password):
+        """Hash ``password`` with the configured method"""
+        return self._submit(
+            generate_password_hash, password, self.method, self.salt_length
+        )
+
+    def verify(self, password_hash, password):
+        """Check ``password`` against a stored hash"""
+        return self._submit(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if ``password_hash`` was made with different parameters"""
+        if self._prefix is None:
+            # werkzeug expands defaults (e.g. 'pbkdf2' -> 'pbkdf2:sha256:600000'),
+            # so learn the canonical parameter string from a real hash once.
+            sample = generate_password_hash('', self.method, 1)
+            self._prefix = sample.split('$', 1)[0]
+        parts = password_hash.split('$')
+        if len(parts) != 3:
+            return True
+        params, salt, _ = parts
+        return params != self._prefix or len(salt) != self.salt_length
+
+
+password_hasher = PasswordHasher()
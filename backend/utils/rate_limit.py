@@ -0,0 +1,191 @@
+"""
+Token-bucket rate limiting for expensive or abusable endpoints
+
+Each route class (login, search, recommendation) has a rate such as
+"10/minute"; the bucket holds that many tokens and refills continuously.
+Buckets are keyed by route class plus the caller: the user id when a valid
+token is sent, otherwise the client IP. Limited requests get a 429 with
+Retry-After before the view (and any database work) runs.
+
+The default memory backend keeps one small list per active bucket in
+least-recently-used order, drops idle buckets from the old end as it goes,
+and never holds more than RATE_LIMIT_MAX_KEYS. With several workers set RATE_LIMIT_BACKEND to
+"database" so all workers draw from the same buckets.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import jsonify, request
+from sqlalchemy import case, insert, select
+
+from models.database import db, RateLimitBucket
+from utils.auth import get_token_from_header, decode_token
+
+
+UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_rate(rate):
+    """Parse "N/unit" into ``(tokens per second, burst)``"""
+    count, _, unit = rate.partition('/')
+    count = int(count)
+    return count / UNITS[unit.strip().rstrip('s')], count
+
+
+class MemoryBuckets:
+    """Per-process LRU of buckets: ``key -> [tokens, last refill time, full refill seconds]``"""
+
+    def __init__(self, app):
+        self.max_keys = app.config.get('RATE_LIMIT_MAX_KEYS', 100000)
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(burst), now, burst / rate]
+                self._evict(now)
+            else:
+                self._buckets.move_to_end(key)
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= 1:
+                bucket[0] = tokens - 1
+                return 0
+            bucket[0] = tokens
+            return (1 - tokens) / rate
+
+    def _evict(self, now):
+        # A bucket idle long enough to refill completely is the same as no bucket.
+        while self._buckets:
+            bucket = next(iter(self._buckets.values()))
+            if now - bucket[1] < bucket[2]:
+                break
+            self._buckets.popitem(last=False)
+        # Past the cap, forget the least recently used buckets even if not full.
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+
+class DatabaseBuckets:
+    """Buckets in ``rate_limit_buckets``, shared by every worker"""
+
+    def __init__(self, app):
+        pass
+
+    def take(self, key, rate, burst):
+        now = time.time()
+        table = RateLimitBucket.__table__
+        refilled = table.c.tokens + (now - table.c.updated_at) * rate
+        refilled = case((refilled > burst, burst), else_=refilled)
+
+        # Own short transaction, independent of the request's session.
+        with db.engine.begin() as connection:
+            taken = connection.execute(
+                table.update()
+                .where(table.c.key == key, refilled >= 1)
+                .values(tokens=refilled - 1, updated_at=now)
+            ).rowcount
+            if taken:
+                return 0
+
+            tokens = connection.execute(
+                select(refilled).where(table.c.key == key)
+            ).scalar()
+            if tokens is None:
+                connection.execute(
+                    insert(table).values(key=key, tokens=burst - 1, updated_at=now)
+                )
+                return 0
+
+            connection.execute(
+                table.update().where(table.c.key == key).values(tokens=tokens, updated_at=now)
+            )
+            return (1 - tokens) / rate
+
+
+BACKENDS = {
+    'memory': MemoryBuckets,
+    'database': DatabaseBuckets,
+}
+
+
+class RateLimiter:
+    """Holds the configured limits and bucket backend"""
+
+    def __init__(self, app=None):
+        self.enabled = False
+        self.limits = {}
+        self.buckets = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.enabled = app.config.get('RATE_LIMIT_ENABLED', True)
+        self.trust_proxy = app.config.get('RATE_LIMIT_TRUST_PROXY', False)
+        self.limits = {
+            route_class: parse_rate(rate)
+            for route_class, rate in app.config.get('RATE_LIMITS', {}).items()
+        }
+        backend = app.config.get('RATE_LIMIT_BACKEND', 'memory')
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown RATE_LIMIT_BACKEND {backend!r}; use one of {sorted(BACKENDS)}")
+        self.buckets = BACKENDS[backend](app)
+
+    def client_key(self, by_user=True):
+        """User id for a valid bearer token, otherwise the client IP"""
+        if by_user:
+            token = get_token_from_header()
+            if token:
+                payload = decode_token(token)
+                if 'user_id' in payload:
+                    return f"user:{payload['user_id']}"
+        if self.trust_proxy and request.access_route:
+            return f"ip:{request.access_route[0]}"
+        return f"ip:{request.remote_addr}"
+
+    def check(self, route_class, by_user=True):
+        """Take a token; return seconds to wait, or 0 if allowed"""
+        if not self.enabled or route_class not in self.limits:
+            return 0
+        rate, burst = self.limits[route_class]
+        key = f"{route_class}:{self.client_key(by_user)}"
+        return self.buckets.take(key, rate, burst)
+
+
+rate_limiter = RateLimiter()
+
+
+def rate_limit(route_class, by_user=True):
+    """Decorator to throttle an endpoint with the ``route_class`` bucket
+
+    Place it above the auth decorators so limited requests are rejected first.
+    ``by_user=False`` always keys by IP (e.g. for login).
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                wait = rate_limiter.check(route_class, by_user)
+            except Exception as e:
+                # Never fail a request because the limiter's store is unavailable.
+                print(f"Rate limiter unavailable: {e}")
+                wait = 0
+
+            if wait:
+                retry_after = max(1, math.ceil(wait))
+                return jsonify({
+                    'error': 'Too many requests. Please slow down.',
+                    'retry_after': retry_after,
+                }), 429, {'Retry-After': str(retry_after)}
+
+            return f(*args, **kwargs)
+
+        return decorated_function
+    return decorator
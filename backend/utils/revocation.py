@@ -0,0 +1,156 @@
+"""
+Revoked JWT ids with an in-memory Bloom filter in front of the database
+
+Every token carries a ``jti``. Revoking a token stores its jti in
+``revoked_tokens`` until the token would have expired anyway. Each worker
+keeps a Bloom filter of revoked jtis and adds rows newer than the last one
+it has seen every REVOCATION_REFRESH_SECONDS, so checking a token that was
+never revoked costs one hash and no query. Only Bloom hits, which are real
+revocations or rare false positives, are confirmed against the table.
+
+Ids can become visible out of order (a lower id committing after a higher
+one), so each refresh re-reads the last REVOCATION_RESCAN_ROWS ids below
+the newest one seen. If the database is unreachable, the refresh is skipped
+and the filter keeps serving the last snapshot.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from models.database import db, RevokedToken
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(self.bits[p >> 3] & (1 << (p & 7)) for p in self._positions(value))
+
+
+class RevocationList:
+    """Per-process view of ``revoked_tokens``"""
+
+    def __init__(self, app=None):
+        self.refresh_seconds = 5
+        self.capacity = 10000
+        self.error_rate = 0.001
+        self.rescan_rows = 1000
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        self._last_id = 0
+        self._last_refresh = 0.0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.get('REVOCATION_REFRESH_SECONDS', 5)
+        self.capacity = app.config.get('REVOCATION_BLOOM_CAPACITY', 10000)
+        self.error_rate = app.config.get('REVOCATION_BLOOM_ERROR_RATE', 0.001)
+        self.rescan_rows = app.config.get('REVOCATION_RESCAN_ROWS', 1000)
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        self._last_id = 0
+        self._last_refresh = 0.0
+
+    def _refresh(self):
+        """Add revocations recorded (by any worker) since the last refresh"""
+        if time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return
+        if not self._lock.acquire(blocking=False):
+            return  # another thread is refreshing; use the current filter
+        try:
+            self._load()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Revocation refresh failed, keeping the last snapshot: {e}")
+        finally:
+            # Retry after the usual interval rather than on every request.
+            self._last_refresh = time.monotonic()
+            self._lock.release()
+
+    def _load(self):
+        rows = (
+            db.session.query(RevokedToken.id, RevokedToken.jti)
+            .filter(
+                RevokedToken.id > self._last_id - self.rescan_rows,
+                RevokedToken.expires_at > datetime.utcnow(),
+            )
+            .order_by(RevokedToken.id)
+            .all()
+        )
+        last_id = max([self._last_id] + [row_id for row_id, _ in rows])
+        # Rescanned jtis are already in the filter; a false positive for a
+        # new one is harmless because hits are confirmed in the table anyway.
+        rows = [(row_id, jti) for row_id, jti in rows if jti not in self._bloom]
+        if self._bloom.count + len(rows) > self._bloom.capacity:
+            # Full filter: rebuild from the unexpired rows with room to grow.
+            self._prune()
+            rows = (
+                db.session.query(RevokedToken.id, RevokedToken.jti)
+                .filter(RevokedToken.expires_at > datetime.utcnow())
+                .order_by(RevokedToken.id)
+                .all()
+            )
+            last_id = max([0] + [row_id for row_id, _ in rows])
+            self.capacity = max(self.capacity, 2 * len(rows))
+            self._bloom = BloomFilter(self.capacity, self.error_rate)
+        for _, jti in rows:
+            self._bloom.add(jti)
+        self._last_id = last_id
+
+    def _prune(self):
+        try:
+            RevokedToken.query.filter(
+                RevokedToken.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+
+    def is_revoked(self, jti):
+        """True if ``jti`` has been revoked"""
+        self._refresh()
+        if jti not in self._bloom:
+            return False
+        return db.session.query(
+            RevokedToken.query.filter_by(jti=jti).exists()
+        ).scalar()
+
+    def revoke(self, jti, user_id, expires_at):
+        """Revoke ``jti`` until ``expires_at``"""
+        try:
+            db.session.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # already revoked
+        with self._lock:
+            self._bloom.add(jti)
+
+
+revocation_list = RevocationList()
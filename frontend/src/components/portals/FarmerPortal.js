@@ -3,6 +3,7 @@ import { Link } from 'react-router-dom';
 import CropRecommendation from '../CropRecommendation';
 import FertilizerRecommendation from '../FertilizerRecommendation';
 import ProfileEditor from '../shared/ProfileEditor';
+import { fetchPage, LoadMoreButton } from '../shared/pagination';
 import axios from 'axios';
 import '../../styles/portals/farmer.css';
 
@@ -15,6 +16,7 @@ function FarmerPortal({ user, onLogout }) {
   const [history, setHistory] = useState([]);
   const [costs, setCosts] = useState([]);
   const [laborPostings, setLaborPostings] = useState([]);
+  const [laborPostingsCursor, setLaborPostingsCursor] = useState(null);
   const [weather, setWeather] = useState(null);
   const [stats, setStats] = useState({ listings: 0, costs: 0, labor: 0, totalRevenue: 0 });
   
@@ -58,14 +60,15 @@ function FarmerPortal({ user, onLogout }) {
       const [listingsRes, costsRes, laborRes] = await Promise.all([
         axios.get(`${API_URL}/api/farmer/crop-listings`, { headers: { Authorization: `Bearer ${token}` } }),
         axios.get(`${API_URL}/api/farmer/costs`, { headers: { Authorization: `Bearer ${token}` } }),
-        axios.get(`${API_URL}/api/farmer/labor-postings`, { headers: { Authorization: `Bearer ${token}` } })
+        fetchPage(`${API_URL}/api/farmer/labor-postings`, 'postings', token)
       ]);
       
       const totalRevenue = costsRes.data.records.reduce((sum, r) => sum + (r.revenue || 0), 0);
       setStats({
         listings: listingsRes.data.listings.length,
         costs: costsRes.data.records.length,
-        labor: laborRes.data.postings.length,
+        // One page is enough for the stat; show "50+" when there are more.
+        labor: `${laborRes.items.length}${laborRes.nextCursor ? '+' : ''}`,
         totalRevenue
       });
     } catch (error) {
@@ -127,13 +130,13 @@ function FarmerPortal({ user, onLogout }) {
     }
   };
 
-  const fetchLaborPostings = async () => {
+  // Without a cursor the list restarts from its first page.
+  const fetchLaborPostings = async (cursor = null) => {
     try {
       const token = localStorage.getItem('token');
-      const response = await axios.get(`${API_URL}/api/farmer/labor-postings`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setLaborPostings(response.data.postings);
+      const { items, nextCursor } = await fetchPage(`${API_URL}/api/farmer/labor-postings`, 'postings', token, cursor);
+      setLaborPostings(previous => (cursor ? [...previous, ...items] : items));
+      setLaborPostingsCursor(nextCursor);
     } catch (error) {
       console.error('Error fetching labor postings:', error);
     }
@@ -883,6 +886,7 @@ function FarmerPortal({ user, onLogout }) {
                   ))}
                 </div>
               )}
+              <LoadMoreButton cursor={laborPostingsCursor} onLoadMore={fetchLaborPostings} />
             </div>
           </div>
         )}
@@ -928,7 +932,6 @@ function FarmerPortal({ user, onLogout }) {
                       </div>
                       <div style={{ marginTop: '1rem', display: 'flex', gap: '0.5rem', flexWrap: 'wrap', alignItems: 'center' }}>
                         <span style={{ fontSize: '0.9rem', color: '#64748b' }}>Update Status:</span>
-                        <button onClick={() => updateOrderStatus(order.id, 'pending')} className="btn btn-secondary">Pending</button>
                         <button onClick={() => updateOrderStatus(order.id, 'confirmed')} className="btn btn-secondary">Confirmed</button>
                         <button onClick={() => updateOrderStatus(order.id, 'in_progress')} className="btn btn-secondary">In Progress</button>
                         <button onClick={() => updateOrderStatus(order.id, 'completed')} className="btn btn-primary">Delivered</button>
@@ -1,6 +1,7 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
 import ProfileEditor from '../shared/ProfileEditor';
+import { fetchPage, LoadMoreButton } from '../shared/pagination';
 import axios from 'axios';
 import '../../styles/portals/labor.css';
 
@@ -9,55 +10,53 @@ const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:5001';
 function LaborPortal({ user, onLogout }) {
   const [activeTab, setActiveTab] = useState('jobs');
   const [jobPostings, setJobPostings] = useState([]);
+  const [jobPostingsCursor, setJobPostingsCursor] = useState(null);
   const [myJobs, setMyJobs] = useState([]);
+  const [myJobsCursor, setMyJobsCursor] = useState(null);
   const [earnings, setEarnings] = useState({ total: 0, thisMonth: 0, completed: 0 });
 
-  const calculateEarnings = useCallback(() => {
-    const completedJobs = myJobs.filter(j => j.status === 'completed');
-    const totalEarnings = completedJobs.reduce((sum, j) => sum + (j.total_wage || j.daily_wage * j.total_days || 0), 0);
-    
-    const currentMonth = new Date().getMonth();
-    const thisMonthEarnings = completedJobs
-      .filter(j => new Date(j.created_at).getMonth() === currentMonth)
-      .reduce((sum, j) => sum + (j.total_wage || j.daily_wage * j.total_days || 0), 0);
-
-    setEarnings({
-      total: totalEarnings,
-      thisMonth: thisMonthEarnings,
-      completed: completedJobs.length
-    });
-  }, [myJobs]);
-
   useEffect(() => {
     if (activeTab === 'jobs') fetchJobPostings();
     if (activeTab === 'myjobs') fetchMyJobs();
     if (activeTab === 'earnings') {
       fetchMyJobs();
-      calculateEarnings();
+      fetchEarnings();
     }
-  }, [activeTab, calculateEarnings]);
+  }, [activeTab]);
 
-  const fetchJobPostings = async () => {
+  // Without a cursor the list restarts from its first page.
+  const fetchJobPostings = async (cursor = null) => {
     try {
       const token = localStorage.getItem('token');
-      const response = await axios.get(`${API_URL}/api/labor/job-postings`, {
-        headers: { Authorization: `Bearer ${token}` }
-      });
-      setJobPostings(response.data.postings || []);
+      const { items, nextCursor } = await fetchPage(`${API_URL}/api/labor/job-postings`, 'postings', token, cursor);
+      setJobPostings(previous => (cursor ? [...previous, ...items] : items));
+      setJobPostingsCursor(nextCursor);
     } catch (error) {
       console.error('Error fetching job postings:', error);
     }
   };
 
-  const fetchMyJobs = async () => {
+  const fetchMyJobs = async (cursor = null) => {
+    try {
+      const token = localStorage.getItem('token');
+      const { items, nextCursor } = await fetchPage(`${API_URL}/api/labor/my-jobs`, 'jobs', token, cursor);
+      setMyJobs(previous => (cursor ? [...previous, ...items] : items));
+      setMyJobsCursor(nextCursor);
+    } catch (error) {
+      console.error('Error fetching my jobs:', error);
+    }
+  };
+
+  const fetchEarnings = async () => {
     try {
       const token = localStorage.getItem('token');
-      const response = await axios.get(`${API_URL}/api/labor/my-jobs`, {
+      const response = await axios.get(`${API_URL}/api/labor/earnings`, {
         headers: { Authorization: `Bearer ${token}` }
       });
-      setMyJobs(response.data.jobs || []);
+      const { total, this_month: thisMonth, completed } = response.data.earnings;
+      setEarnings({ total, thisMonth, completed });
     } catch (error) {
-      console.error('Error fetching my jobs:', error);
+      console.error('Error fetching earnings:', error);
     }
   };
 
@@ -172,6 +171,7 @@ function LaborPortal({ user, onLogout }) {
                   ))}
                 </div>
               )}
+              <LoadMoreButton cursor={jobPostingsCursor} onLoadMore={fetchJobPostings} />
             </div>
           </div>
         )}
@@ -225,6 +225,7 @@ function LaborPortal({ user, onLogout }) {
                 </tbody>
               </table>
             )}
+            <LoadMoreButton cursor={myJobsCursor} onLoadMore={fetchMyJobs} />
           </div>
         )}
 
@@ -316,6 +317,7 @@ function LaborPortal({ user, onLogout }) {
                   </tbody>
                 </table>
               )}
+              <LoadMoreButton cursor={myJobsCursor} onLoadMore={fetchMyJobs} />
             </div>
 
             <div className="card" style={{ background: '#fffbeb', border: '1px solid #fbbf24' }}>
@@ -0,0 +1,24 @@
+import React from 'react';
+import axios from 'axios';
+
+export const PAGE_SIZE = 50;
+
+// Keyset-paginated endpoints return one page plus `next_cursor`. Lists load
+// the first page and fetch the next one only when the user asks for more.
+export const fetchPage = async (url, key, token, cursor = null, pageSize = PAGE_SIZE) => {
+  const response = await axios.get(url, {
+    headers: { Authorization: `Bearer ${token}` },
+    params: cursor ? { limit: pageSize, cursor } : { limit: pageSize }
+  });
+  return { items: response.data[key] || [], nextCursor: response.data.next_cursor || null };
+};
+
+export const LoadMoreButton = ({ cursor, onLoadMore }) => (
+  cursor ? (
+    <div style={{ textAlign: 'center', marginTop: '1rem' }}>
+      <button onClick={() => onLoadMore(cursor)} className="btn btn-secondary">
+        Load more
+      </button>
+    </div>
+  ) : null
+);
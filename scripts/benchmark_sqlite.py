@@ -0,0 +1,125 @@
+"""
+SQLite Concurrency Benchmark
+
+Compares concurrent read/write throughput of the default SQLite setup with
+the production tuning applied by ``init_db`` (WAL journaling and
+per-connection pragmas). Each run uses a fresh temporary database, a pool of
+reader threads listing crops and writer threads inserting listings, similar
+to several gunicorn threads serving the marketplace.
+
+Usage:
+    python scripts/benchmark_sqlite.py [--seconds 5] [--readers 8] [--writers 2]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add backend directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from flask import Flask
+from sqlalchemy.exc import OperationalError
+
+from config.settings import Config
+from models.database import db, init_db, User, UserRole, FarmerProfile, CropListing
+
+
+def build_app(db_path, tuned):
+    """Create a minimal app bound to ``db_path`` with tuning on or off."""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    app.config['SQLITE_TUNING'] = tuned
+    init_db(app)
+
+    with app.app_context():
+        user = User(email='bench@example.com', full_name='Bench', role=UserRole.FARMER)
+        user.password_hash = '-'
+        db.session.add(user)
+        db.session.flush()
+        farmer = FarmerProfile(user_id=user.id, farm_name='Bench Farm')
+        db.session.add(farmer)
+        db.session.flush()
+        for i in range(500):
+            db.session.add(CropListing(
+                farmer_id=farmer.id, crop_name=f'crop-{i}', category='grains',
+                quantity=100.0, price_per_unit=10.0
+            ))
+        db.session.commit()
+        farmer_id = farmer.id
+
+    return app, farmer_id
+
+
+def run(app, farmer_id, seconds, readers, writers):
+    """Hammer the database from reader and writer threads for ``seconds``."""
+    counts = {'reads': 0, 'writes': 0, 'errors': 0}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def reader():
+        with app.app_context():
+            while time.monotonic() < deadline:
+                try:
+                    CropListing.query.filter_by(is_available=True).limit(50).all()
+                    db.session.rollback()
+                    key = 'reads'
+                except OperationalError:
+                    db.session.rollback()
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+
+    def writer():
+        with app.app_context():
+            while time.monotonic() < deadline:
+                try:
+                    db.session.add(CropListing(
+                        farmer_id=farmer_id, crop_name='bench', category='grains',
+                        quantity=1.0, price_per_unit=1.0
+                    ))
+                    db.session.commit()
+                    key = 'writes'
+                except OperationalError:
+                    db.session.rollback()
+                    key = 'errors'
+                with lock:
+                    counts[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    return {key: value / seconds for key, value in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--writers', type=int, default=2)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print(f"SQLite benchmark: {args.readers} readers, {args.writers} writers, {args.seconds}s")
+    print("=" * 60)
+
+    for label, tuned in [('default', False), ('tuned', True)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            app, farmer_id = build_app(os.path.join(tmp, 'bench.db'), tuned)
+            result = run(app, farmer_id, args.seconds, args.readers, args.writers)
+            with app.app_context():
+                db.engine.dispose()
+        print(f"{label:>8}: {result['reads']:8.0f} reads/s  "
+              f"{result['writes']:6.0f} writes/s  {result['errors']:5.0f} errors/s")
+
+
+if __name__ == '__main__':
+    main()